@@ -0,0 +1,13 @@
+"""Конфигурация бизнес-приложения."""
+
+from django.apps import AppConfig
+
+
+class BusinessConfig(AppConfig):
+    """Конфигурация приложения бизнес-объектов."""
+
+    name = "business"
+
+    def ready(self):
+        """Подключает обработчики сигналов моделей."""
+        from . import signals  # noqa: F401
@@ -0,0 +1,184 @@
+"""Асинхронные (ASGI) представления бизнес-логики (ASYNC_VIEWS=True).
+
+Как и синхронные представления DRF, выбирают рендерер по заголовку Accept
+(JSON, orjson, MessagePack – см. custom_auth/renderers.py) и кэшируют
+страницы списков с ETag (custom_auth/response_cache.py).
+"""
+
+import json
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from rest_framework import status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from custom_auth.access_matrix import aget_matrix
+from custom_auth.async_views import AsyncAPIView
+from custom_auth.filters import scope_queryset
+from custom_auth.pagination import (
+    STREAM_CHUNK_SIZE,
+    KeysetPagination,
+    astream_json,
+    streaming_json_response,
+    wants_stream,
+)
+from custom_auth.models import User
+from custom_auth.response_cache import acached_list
+
+from .models import Order, Product
+from .serializers import OrderSerializer, ProductSerializer
+
+
+class AsyncScopedListView(AsyncAPIView):
+    """Список объектов, доступных пользователю, через асинхронный ORM.
+
+    Как и AccessRuleFilterBackend, при праве «только свои» добавляет
+    условие по владельцу в SQL. Как и синхронные представления, отдает
+    страницу по курсору или весь список потоком (?stream=true, aiterator).
+    Проверяемое действие определяется по HTTP-методу.
+    """
+    queryset = None
+    fields = ()
+    owner_field = "owner"
+
+    async def get(self, request):
+        """Возвращает страницу или поток доступных объектов."""
+        matrix = await aget_matrix()
+        queryset = scope_queryset(
+            self.queryset,
+            request.user,
+            matrix,
+            self.element_id,
+            "read",
+            self.owner_field,
+        ).values(*self.fields)
+
+        if wants_stream(request):
+            return streaming_json_response(
+                astream_json(queryset.aiterator(chunk_size=STREAM_CHUNK_SIZE))
+            )
+
+        drf_request = Request(request)
+        renderer, media_type = self.negotiate(drf_request)
+
+        async def get_page():
+            # Курсорная пагинация DRF синхронная: страница выбирается в потоке
+            paginator = KeysetPagination()
+            page = await sync_to_async(paginator.paginate_queryset)(
+                queryset, drf_request
+            )
+            data = paginator.get_paginated_response(page).data
+            # Как DecimalField сериализаторов: Decimal отдается строкой
+            data["results"] = [
+                {
+                    key: str(value) if isinstance(value, Decimal) else value
+                    for key, value in row.items()
+                }
+                for row in data["results"]
+            ]
+            return data
+
+        role_id = getattr(request.user, "role_id", None)
+        scope = matrix.scope(role_id, self.element_id, "read") if role_id else None
+        if settings.RESPONSE_CACHE_ENABLED and scope is not None:
+            return await acached_list(
+                request, self.queryset.model, scope, renderer, media_type, get_page
+            )
+        return self.render(await get_page(), renderer, media_type)
+
+    def negotiate(self, request):
+        """Выбирает рендерер по заголовку Accept, как APIView.
+
+        Browsable API не поддерживается: он требует синхронного представления DRF.
+
+        Args:
+            request: Запрос DRF
+
+        Returns:
+            tuple: (рендерер, выбранный тип ответа)
+
+        Raises:
+            NotAcceptable: если ни один рендерер не подходит
+        """
+        renderers = [
+            renderer_class() for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+            if renderer_class.format != "api"
+        ]
+        return DefaultContentNegotiation().select_renderer(request, renderers)
+
+    def render(self, data, renderer, media_type, status_code=status.HTTP_200_OK):
+        """Возвращает ответ с данными в выбранном формате."""
+        content_type = media_type
+        if renderer.charset:
+            content_type = f"{media_type}; charset={renderer.charset}"
+        return HttpResponse(
+            renderer.render(data, media_type), content_type=content_type, status=status_code
+        )
+
+
+class AsyncScopedListCreateView(AsyncScopedListView):
+    """Список доступных объектов и создание объекта.
+
+    Как и AccessRuleMixin.perform_create, владельцем нового объекта
+    становится текущий пользователь; право create проверяет
+    AsyncAccessPermission.
+    """
+    serializer_class = None
+
+    async def post(self, request):
+        """Создает объект из JSON-тела запроса.
+
+        Returns:
+            HttpResponse: Созданный объект
+
+        Status Codes:
+            201: Объект создан
+            400: Некорректные данные
+            403: Нет права create
+        """
+        try:
+            body = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse(
+                {"detail": "Malformed JSON."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        renderer, media_type = self.negotiate(Request(request))
+        # Проверка связанных объектов и сохранение – синхронный ORM, в потоке
+        serializer = self.serializer_class(data=body)
+        if not await sync_to_async(serializer.is_valid)():
+            return self.render(
+                serializer.errors, renderer, media_type, status.HTTP_400_BAD_REQUEST
+            )
+        await sync_to_async(serializer.save)(owner_id=request.user.pk)
+        return self.render(
+            serializer.data, renderer, media_type, status.HTTP_201_CREATED
+        )
+
+
+class AsyncProductListView(AsyncScopedListCreateView):
+    """Список доступных продуктов и создание продукта."""
+    element_id = 2  # id BusinessElement для «products» (согласовано с фикстурами)
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    fields = ("id", "owner_id", "name", "price", "created_at")
+
+
+class AsyncOrderListView(AsyncScopedListCreateView):
+    """Список заказов пользователя и создание заказа."""
+    element_id = 3  # id BusinessElement для «orders» (согласовано с фикстурами)
+    queryset = Order.objects.all()
+    serializer_class = OrderSerializer
+    fields = ("id", "owner_id", "product_id", "quantity", "created_at")
+
+
+class AsyncUserListView(AsyncScopedListView):
+    """Список пользователей системы."""
+    element_id = 1  # id BusinessElement для «users» (согласовано с фикстурами)
+    queryset = User.objects.filter(is_active=True)
+    fields = ("id", "email", "first_name", "last_name")
+    owner_field = "pk"
@@ -0,0 +1,65 @@
+"""Модели бизнес-приложения."""
+
+from django.conf import settings
+from django.db import models
+
+
+class Product(models.Model):
+    """Продукт, принадлежащий пользователю.
+
+    Составной индекс (owner, id) используется и для фильтра «только свои»,
+    и для сортировки по id, поэтому выборка своих строк остается index scan
+    на любом объеме таблицы.
+    """
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="products",
+        # Поиск по owner_id покрывает составной индекс (owner, id)
+        db_index=False,
+    )
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Product"
+        verbose_name_plural = "Products"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["owner", "id"], name="product_owner_id_idx"),
+        ]
+
+    def __str__(self):
+        """Возвращает название продукта."""
+        return self.name
+
+
+class Order(models.Model):
+    """Заказ пользователя."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="orders",
+        # Поиск по owner_id покрывает составной индекс (owner, id)
+        db_index=False,
+    )
+    product = models.ForeignKey(
+        Product, on_delete=models.PROTECT, related_name="orders"
+    )
+    quantity = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Order"
+        verbose_name_plural = "Orders"
+        ordering = ["id"]
+        indexes = [
+            models.Index(fields=["owner", "id"], name="order_owner_id_idx"),
+        ]
+
+    def __str__(self):
+        """Возвращает описание заказа."""
+        return f"Order #{self.pk}"
@@ -0,0 +1,38 @@
+"""Сериализаторы бизнес-приложения."""
+
+from rest_framework import serializers
+
+from custom_auth.models import User
+
+from .models import Order, Product
+
+
+class ProductSerializer(serializers.ModelSerializer):
+    """Сериализатор продукта; владелец – текущий пользователь."""
+
+    owner_id = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Product
+        fields = ["id", "owner_id", "name", "price", "created_at"]
+
+
+class OrderSerializer(serializers.ModelSerializer):
+    """Сериализатор заказа; владелец – текущий пользователь."""
+
+    owner_id = serializers.IntegerField(read_only=True)
+    product_id = serializers.PrimaryKeyRelatedField(
+        queryset=Product.objects.all(), source="product"
+    )
+
+    class Meta:
+        model = Order
+        fields = ["id", "owner_id", "product_id", "quantity", "created_at"]
+
+
+class UserListSerializer(serializers.ModelSerializer):
+    """Краткие данные пользователя для списка."""
+
+    class Meta:
+        model = User
+        fields = ["id", "email", "first_name", "last_name"]
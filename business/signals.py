@@ -0,0 +1,18 @@
+"""Обработчики сигналов бизнес-приложения."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from custom_auth.response_cache import bump_data_version
+
+from .models import Order, Product
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+@receiver(post_save, sender=Order)
+@receiver(post_delete, sender=Order)
+def invalidate_cached_responses(sender, **kwargs):
+    """Сбрасывает закэшированные списки модели после коммита изменений."""
+    transaction.on_commit(lambda: bump_data_version(sender))
@@ -0,0 +1,83 @@
+"""Списки и создание объектов через асинхронные представления (ASYNC_VIEWS=True)."""
+
+import json
+
+from django.test import AsyncRequestFactory
+
+from custom_auth.tests.factories import AuthTestCase
+from custom_auth.tokens import issue_access_token
+
+from business.async_views import AsyncOrderListView, AsyncProductListView, AsyncUserListView
+from business.models import Product
+
+
+class AsyncCreateTests(AuthTestCase):
+    """POST к спискам создает объект с владельцем после проверки права create."""
+
+    factory = AsyncRequestFactory()
+
+    async def post(self, view_class, user, data):
+        request = self.factory.post(
+            "/", data, content_type="application/json",
+            headers={"Authorization": f"Bearer {issue_access_token(user)}"},
+        )
+        return await view_class.as_view()(request)
+
+    async def test_create_product_sets_owner(self):
+        response = await self.post(
+            AsyncProductListView, self.admin, {"name": "Tea", "price": "9.90"}
+        )
+        self.assertEqual(response.status_code, 201)
+        product = await Product.objects.aget(name="Tea")
+        self.assertEqual(product.owner_id, self.admin.pk)
+
+    async def test_create_order_validates_product(self):
+        response = await self.post(
+            AsyncOrderListView, self.admin, {"product_id": 999, "quantity": 1}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_create_requires_create_permission(self):
+        response = await self.post(
+            AsyncProductListView, self.user, {"name": "Tea", "price": "9.90"}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(await Product.objects.filter(name="Tea").aexists())
+
+    async def test_user_list_does_not_accept_post(self):
+        response = await self.post(AsyncUserListView, self.admin, {})
+        self.assertEqual(response.status_code, 405)
+
+
+class AsyncListTests(AuthTestCase):
+    """GET к спискам выбирает рендерер по Accept и отдает 304 по ETag."""
+
+    factory = AsyncRequestFactory()
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        Product.objects.create(owner=cls.admin, name="Tea", price="9.90")
+
+    async def get(self, **headers):
+        request = self.factory.get(
+            "/business/products/",
+            headers={"Authorization": f"Bearer {issue_access_token(self.admin)}", **headers},
+        )
+        return await AsyncProductListView.as_view()(request)
+
+    async def test_not_modified_by_etag(self):
+        response = await self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)["results"][0]["price"], "9.90")
+        response = await self.get(**{"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    async def test_renderer_is_negotiated(self):
+        response = await self.get(Accept="application/json; indent=4")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b"\n    ", response.content)
+        self.assertNotEqual(response["ETag"], (await self.get())["ETag"])
+
+        response = await self.get(Accept="text/html")
+        self.assertEqual(response.status_code, 406)
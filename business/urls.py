@@ -1,10 +1,23 @@
 """URL-маршруты для бизнес-логики."""
 
+from django.conf import settings
 from django.urls import path
-from .views import ProductListView, OrderListView, UserListView
+
+from .views import OrderDetailView, ProductDetailView
+
+if settings.ASYNC_VIEWS:
+    from .async_views import (
+        AsyncOrderListView as OrderListView,
+        AsyncProductListView as ProductListView,
+        AsyncUserListView as UserListView,
+    )
+else:
+    from .views import ProductListView, OrderListView, UserListView
 
 urlpatterns = [
     path('products/', ProductListView.as_view(), name='product-list'),
+    path('products/<int:pk>/', ProductDetailView.as_view(), name='product-detail'),
     path('orders/', OrderListView.as_view(), name='order-list'),
+    path('orders/<int:pk>/', OrderDetailView.as_view(), name='order-detail'),
     path('users/', UserListView.as_view(), name='user-list'),
 ]
@@ -1,39 +1,73 @@
-"""Представления бизнес-логики проекта."""
+"""Представления бизнес-логики проекта.
 
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from custom_auth.permissions import AccessPermission
+Доступ проверяется по правилам AccessRule: AccessPermission решает, есть ли
+у роли право на действие, а AccessRuleFilterBackend ограничивает выборку
+своими объектами, если у роли нет права `*_all_permission`. Действие
+определяется по HTTP-методу. Списки отдаются постранично по курсору или
+потоком (?stream=true) и кэшируются с ETag (ResponseCacheMixin).
+"""
+
+from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
+from custom_auth.filters import AccessRuleFilterBackend
+from custom_auth.models import User
+from custom_auth.pagination import StreamingListMixin
+from custom_auth.permissions import AccessPermission
+from custom_auth.response_cache import ResponseCacheMixin
+
+from .models import Order, Product
+from .serializers import OrderSerializer, ProductSerializer, UserListSerializer
+
+
+class AccessRuleMixin:
+    """Общие настройки представлений бизнес-элементов."""
 
-class ProductListView(APIView):
-    """Список доступных продуктов."""
     permission_classes = [IsAuthenticated, AccessPermission]
-    required_permission = 'read'
+    filter_backends = [AccessRuleFilterBackend]
+
+    def perform_create(self, serializer):
+        """Сохраняет объект с текущим пользователем в качестве владельца."""
+        serializer.save(owner_id=self.request.user.pk)
+
+
+class ProductListView(
+    AccessRuleMixin, ResponseCacheMixin, StreamingListMixin, generics.ListCreateAPIView
+):
+    """Список доступных продуктов и создание продукта."""
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
     element_id = 2  # id BusinessElement для «products» (согласовано с фикстурами)
 
-    def get(self, request):
-        """Возвращает список продуктов."""
-        return Response({'products': ['Product A', 'Product B']})
 
+class ProductDetailView(AccessRuleMixin, generics.RetrieveUpdateDestroyAPIView):
+    """Просмотр, изменение и удаление продукта."""
+    queryset = Product.objects.all()
+    serializer_class = ProductSerializer
+    element_id = 2
 
-class OrderListView(APIView):
-    """Список заказов пользователя."""
-    permission_classes = [IsAuthenticated, AccessPermission]
-    required_permission = 'read'
+
+class OrderListView(
+    AccessRuleMixin, ResponseCacheMixin, StreamingListMixin, generics.ListCreateAPIView
+):
+    """Список заказов пользователя и создание заказа."""
+    queryset = Order.objects.all()
+    serializer_class = OrderSerializer
     element_id = 3  # id BusinessElement для «orders» (согласовано с фикстурами)
 
-    def get(self, request):
-        """Возвращает список заказов."""
-        return Response({'orders': ['Order X', 'Order Y']})
 
+class OrderDetailView(AccessRuleMixin, generics.RetrieveUpdateDestroyAPIView):
+    """Просмотр, изменение и удаление заказа."""
+    queryset = Order.objects.all()
+    serializer_class = OrderSerializer
+    element_id = 3
 
-class UserListView(APIView):
+
+class UserListView(
+    AccessRuleMixin, ResponseCacheMixin, StreamingListMixin, generics.ListAPIView
+):
     """Список пользователей системы."""
-    permission_classes = [IsAuthenticated, AccessPermission]
-    required_permission = 'read'
+    queryset = User.objects.filter(is_active=True)
+    serializer_class = UserListSerializer
     element_id = 1  # id BusinessElement для «users» (согласовано с фикстурами)
-
-    def get(self, request):
-        """Возвращает список пользователей."""
-        return Response({'users': ['User1', 'User2']})
+    owner_field = "pk"  # «свой» пользователь – сам пользователь
@@ -0,0 +1,290 @@
+"""Скомпилированная в память матрица прав доступа (роль × элемент × действие).
+
+Таблица AccessRule меняется редко, а читается на каждом запросе к
+бизнес-объектам. Поэтому вся таблица один раз загружается в память процесса
+и дальше проверки прав выполняются без обращений к БД.
+
+Согласование между воркерами (gunicorn и т.п.) выполняется через счетчик
+версии в общем кэше Django (settings.CACHES): при изменении правил версия
+меняется, а каждый воркер не чаще раза в PERMISSION_MATRIX_CHECK_INTERVAL
+секунд сверяет свою версию с общей и при расхождении пересобирает матрицу.
+"""
+
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+# Действия, которые может запрашивать представление (required_permission)
+ACTIONS = ("read", "create", "update", "delete")
+
+# Поля AccessRule, из которых собирается набор прав
+PERMISSION_FIELDS = (
+    "read_permission",
+    "read_all_permission",
+    "create_permission",
+    "update_permission",
+    "update_all_permission",
+    "delete_permission",
+    "delete_all_permission",
+)
+
+# Действие по HTTP-методу для представлений без явного required_permission
+METHOD_ACTIONS = {
+    "GET": "read",
+    "HEAD": "read",
+    "OPTIONS": "read",
+    "POST": "create",
+    "PUT": "update",
+    "PATCH": "update",
+    "DELETE": "delete",
+}
+
+# Область действия права: все объекты элемента или только свои
+SCOPE_ALL = "all"
+SCOPE_OWN = "own"
+
+ADMIN_ROLE_NAME = "Admin"
+
+VERSION_CACHE_KEY = "custom_auth:access_matrix:version"
+
+
+class AccessMatrix:
+    """Неизменяемый снимок правил доступа.
+
+    Права хранятся как словарь (role_id, element_id) -> frozenset с
+    названиями выданных прав без суффикса `_permission`
+    (например {"read", "update_all"}).
+    """
+
+    def __init__(self, rules, role_names, element_names, version):
+        self.rules = rules
+        self.role_names = role_names
+        self.element_names = element_names
+        self.element_ids = {name.lower(): pk for pk, name in element_names.items()}
+        self.version = version
+        self._role_permissions = {}
+
+    @classmethod
+    def build(cls, version):
+        """Загружает все правила, роли и элементы из БД.
+
+        Args:
+            version: Версия общего счетчика, соответствующая снимку
+
+        Returns:
+            AccessMatrix: Новый снимок матрицы
+        """
+        from custom_auth.models import AccessRule, BusinessElement, Role
+
+        rules = {}
+        for row in AccessRule.objects.values_list(
+            "role_id", "element_id", *PERMISSION_FIELDS
+        ):
+            granted = frozenset(
+                field[: -len("_permission")]
+                for field, value in zip(PERMISSION_FIELDS, row[2:])
+                if value
+            )
+            rules[(row[0], row[1])] = granted
+
+        role_names = dict(Role.objects.values_list("id", "name"))
+        element_names = dict(BusinessElement.objects.values_list("id", "name"))
+        return cls(rules, role_names, element_names, version)
+
+    def is_admin(self, role_id):
+        """Проверяет, является ли роль администраторской.
+
+        Args:
+            role_id: id роли пользователя
+
+        Returns:
+            bool: True для роли Admin
+        """
+        return self.role_names.get(role_id) == ADMIN_ROLE_NAME
+
+    def role_id(self, name):
+        """Возвращает id роли по имени.
+
+        Args:
+            name: Имя роли
+
+        Returns:
+            int | None: id роли или None, если роли нет
+        """
+        for pk, role_name in self.role_names.items():
+            if role_name == name:
+                return pk
+        return None
+
+    def element_id(self, element):
+        """Возвращает id бизнес-элемента по имени (без учета регистра) или id.
+
+        Args:
+            element: Имя BusinessElement или его id строкой
+
+        Returns:
+            int | None: id элемента или None, если элемента нет
+        """
+        if element.isdigit():
+            pk = int(element)
+            return pk if pk in self.element_names else None
+        return self.element_ids.get(element.lower())
+
+    def allows(self, role_id, element_id, action):
+        """Проверяет право роли на действие над элементом.
+
+        Права «только свои» и «все» (`*_all_permission`) считаются
+        равнозначными, как и в исходной проверке AccessPermission.
+
+        Args:
+            role_id: id роли
+            element_id: id бизнес-элемента
+            action: 'read' | 'create' | 'update' | 'delete'
+
+        Returns:
+            bool: True, если действие разрешено
+        """
+        granted = self.rules.get((role_id, element_id))
+        if not granted:
+            return False
+        return action in granted or f"{action}_all" in granted
+
+    def scope(self, role_id, element_id, action):
+        """Возвращает область действия права роли.
+
+        Args:
+            role_id: id роли
+            element_id: id бизнес-элемента
+            action: 'read' | 'create' | 'update' | 'delete'
+
+        Returns:
+            str | None: SCOPE_ALL для администратора и прав `*_all_permission`,
+                SCOPE_OWN для права только на свои объекты, None без права
+        """
+        if self.is_admin(role_id):
+            return SCOPE_ALL
+        granted = self.rules.get((role_id, element_id)) or ()
+        if f"{action}_all" in granted:
+            return SCOPE_ALL
+        if action in granted:
+            # У create нет варианта _all: созданный объект всегда свой
+            return SCOPE_ALL if action == "create" else SCOPE_OWN
+        return None
+
+    def role_permissions(self, role_id):
+        """Возвращает эффективные права роли и их дайджест.
+
+        Результат вычисляется один раз на снимок матрицы. Дайджест зависит
+        только от прав роли, поэтому изменение правил других ролей его не
+        меняет.
+
+        Args:
+            role_id: id роли
+
+        Returns:
+            tuple: (permissions, digest), где permissions – словарь
+                имя элемента -> {действие: bool}, digest – hex sha256
+        """
+        cached = self._role_permissions.get(role_id)
+        if cached is not None:
+            return cached
+
+        is_admin = self.is_admin(role_id)
+        permissions = {
+            name: {
+                action: is_admin or self.allows(role_id, element_id, action)
+                for action in ACTIONS
+            }
+            for element_id, name in sorted(self.element_names.items())
+        }
+        digest = hashlib.sha256(
+            json.dumps(
+                [self.role_names.get(role_id), permissions], sort_keys=True
+            ).encode()
+        ).hexdigest()
+        self._role_permissions[role_id] = (permissions, digest)
+        return permissions, digest
+
+
+_lock = threading.Lock()
+_matrix = None
+_checked_at = 0.0
+
+
+def _shared_version():
+    """Возвращает текущую версию правил из общего кэша."""
+    return cache.get(VERSION_CACHE_KEY)
+
+
+def get_matrix():
+    """Возвращает актуальную матрицу прав текущего процесса.
+
+    Общая версия читается из кэша не чаще, чем раз в
+    PERMISSION_MATRIX_CHECK_INTERVAL секунд; при ее изменении матрица
+    пересобирается одним набором запросов.
+
+    Returns:
+        AccessMatrix: Снимок правил доступа
+    """
+    global _matrix, _checked_at
+
+    matrix = _matrix
+    now = time.monotonic()
+    interval = settings.PERMISSION_MATRIX_CHECK_INTERVAL
+    if matrix is not None and now - _checked_at < interval:
+        return matrix
+
+    with _lock:
+        # Другой поток мог уже обновить матрицу, пока мы ждали блокировку
+        if _matrix is not None and now - _checked_at < interval:
+            return _matrix
+
+        version = _shared_version()
+        if _matrix is None or version is None or _matrix.version != version:
+            if version is None:
+                version = _bump_version()
+            _matrix = AccessMatrix.build(version)
+        _checked_at = now
+        return _matrix
+
+
+async def aget_matrix():
+    """Асинхронный вариант get_matrix.
+
+    Пока локальная копия свежая, возвращает ее без переключения потока;
+    сверка версии и пересборка выполняются в пуле потоков.
+
+    Returns:
+        AccessMatrix: Снимок правил доступа
+    """
+    matrix = _matrix
+    interval = settings.PERMISSION_MATRIX_CHECK_INTERVAL
+    if matrix is not None and time.monotonic() - _checked_at < interval:
+        return matrix
+    return await sync_to_async(get_matrix)()
+
+
+def _bump_version():
+    """Записывает в общий кэш новую уникальную версию правил."""
+    version = uuid.uuid4().hex
+    cache.set(VERSION_CACHE_KEY, version, None)
+    return version
+
+
+def invalidate():
+    """Сбрасывает матрицу во всех воркерах.
+
+    Меняет общую версию (остальные воркеры заметят это при следующей
+    сверке) и сразу сбрасывает локальную копию текущего процесса.
+    """
+    global _matrix
+
+    _bump_version()
+    with _lock:
+        _matrix = None
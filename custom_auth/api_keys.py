@@ -0,0 +1,205 @@
+"""Ключи API сервисных аккаунтов: выпуск, проверка и кэш проверенных ключей.
+
+Ключ имеет вид ak_<prefix>_<secret>. По префиксу ключ находится одним
+запросом по уникальному индексу, а секрет сравнивается с HMAC-SHA256,
+вычисленным с API_KEY_SECRET, – это микросекунды вместо KDF пароля.
+
+Найденные ключи хранятся в памяти процесса API_KEY_CACHE_TTL секунд, так
+что в установившемся режиме запрос с ключом не обращается к БД. Отзыв
+ключа вступает в силу не позже чем через API_KEY_CACHE_TTL секунд, а
+деактивация или смена роли пользователя – сразу, через версию
+безопасности в общем кэше (см. security_versions).
+"""
+
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from custom_auth import security_versions
+
+KEY_PREFIX = "ak"
+
+# Длина публичного префикса ключа в hex-символах
+PREFIX_LENGTH = 12
+
+# Области ключа для эндпоинтов вне матрицы прав (у них нет element_id):
+# правила доступа, профиль владельца и карта прав. Ключ с ограничениями
+# получает к ним доступ только при явном "rules:*", "profile:read" и т.п.
+VIEW_SCOPES = ("rules", "profile", "permissions")
+
+
+class InvalidAPIKey(Exception):
+    """Ключ API не найден, отозван, истек или не совпадает секрет."""
+
+
+class APIKeyCredential:
+    """Проверенный ключ API: request.auth для запросов с ключом.
+
+    Attributes:
+        prefix: Публичный префикс ключа
+        user_id: id владельца ключа
+        role_id: id роли владельца
+        scopes: frozenset разрешенных "элемент:действие" (пустой – без ограничений)
+    """
+
+    def __init__(self, prefix, secret_hash, user_id, role_id, scopes, expires_at, version):
+        self.prefix = prefix
+        self.secret_hash = secret_hash
+        self.user_id = user_id
+        self.role_id = role_id
+        self.scopes = frozenset(scope.lower() for scope in scopes)
+        self.expires_at = expires_at
+        self.version = version
+
+    def allows(self, element_name, action):
+        """Проверяет, входит ли действие над элементом в scopes ключа.
+
+        Args:
+            element_name: Имя бизнес-элемента
+            action: 'read' | 'create' | 'update' | 'delete'
+
+        Returns:
+            bool: True, если ключ не ограничен или действие разрешено
+        """
+        if not self.scopes:
+            return True
+        element = (element_name or "").lower()
+        return f"{element}:{action}" in self.scopes or f"{element}:*" in self.scopes
+
+
+def hash_secret(secret):
+    """Возвращает HMAC-SHA256 секрета ключа (hex).
+
+    Args:
+        secret: Секретная часть ключа
+
+    Returns:
+        str: Хеш для APIKey.secret_hash
+    """
+    return hmac.new(
+        settings.API_KEY_SECRET.encode(), secret.encode(), hashlib.sha256
+    ).hexdigest()
+
+
+def generate_key():
+    """Создает новый ключ.
+
+    Returns:
+        tuple: (raw_key, prefix, secret_hash); raw_key показывается один раз
+    """
+    prefix = secrets.token_hex(PREFIX_LENGTH // 2)
+    secret = secrets.token_urlsafe(32)
+    return f"{KEY_PREFIX}_{prefix}_{secret}", prefix, hash_secret(secret)
+
+
+def parse_key(raw_key):
+    """Разбирает ключ на префикс и секрет.
+
+    Args:
+        raw_key: Ключ ak_<prefix>_<secret>
+
+    Returns:
+        tuple: (prefix, secret)
+
+    Raises:
+        InvalidAPIKey: если формат ключа неверный
+    """
+    parts = raw_key.split("_", 2)
+    if len(parts) != 3 or parts[0] != KEY_PREFIX or len(parts[1]) != PREFIX_LENGTH:
+        raise InvalidAPIKey("Неверный формат ключа API.")
+    return parts[1], parts[2]
+
+
+class APIKeyCache:
+    """Кэш проверенных ключей в памяти процесса с ограниченным сроком жизни."""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, prefix):
+        """Возвращает закэшированный ключ или None."""
+        entry = self._entries.get(prefix)
+        if entry is None or time.monotonic() - entry[1] >= self.ttl:
+            return None
+        return entry[0]
+
+    def set(self, prefix, credential):
+        """Сохраняет ключ в кэш."""
+        with self._lock:
+            now = time.monotonic()
+            # Удаляем устаревшие записи, чтобы кэш не рос бесконечно
+            expired = [key for key, (_, at) in self._entries.items() if now - at >= self.ttl]
+            for key in expired:
+                del self._entries[key]
+            self._entries[prefix] = (credential, now)
+
+    def discard(self, prefix):
+        """Удаляет ключ из кэша."""
+        with self._lock:
+            self._entries.pop(prefix, None)
+
+
+api_key_cache = APIKeyCache(settings.API_KEY_CACHE_TTL)
+
+
+def _load(prefix):
+    """Загружает действующий ключ из БД одним запросом."""
+    from custom_auth.models import APIKey
+
+    row = (
+        APIKey.objects.filter(prefix=prefix, revoked_at__isnull=True)
+        .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now()))
+        .values_list(
+            "secret_hash", "user_id", "user__role_id", "scopes", "expires_at",
+            "user__security_version",
+        )
+        .first()
+    )
+    if row is None:
+        return None
+    return APIKeyCredential(prefix, *row)
+
+
+def verify_key(raw_key):
+    """Проверяет ключ и возвращает его данные.
+
+    Args:
+        raw_key: Ключ из заголовка Authorization: Api-Key <key>
+
+    Returns:
+        APIKeyCredential: Проверенный ключ
+
+    Raises:
+        InvalidAPIKey: если ключ недействителен или владелец неактивен
+    """
+    prefix, secret = parse_key(raw_key)
+    credential = api_key_cache.get(prefix)
+    state = None
+    if credential is not None:
+        state = security_versions.get_state(credential.user_id)
+        if state is None or state[0] != credential.version:
+            # Роль или статус владельца изменились: перечитываем ключ
+            credential = None
+    if credential is None:
+        credential = _load(prefix)
+        if credential is None:
+            raise InvalidAPIKey("Ключ API не найден, отозван или истек.")
+        api_key_cache.set(prefix, credential)
+        state = security_versions.get_state(credential.user_id)
+
+    if not hmac.compare_digest(credential.secret_hash, hash_secret(secret)):
+        raise InvalidAPIKey("Ключ API не найден, отозван или истек.")
+    if credential.expires_at is not None and credential.expires_at <= timezone.now():
+        api_key_cache.discard(prefix)
+        raise InvalidAPIKey("Ключ API не найден, отозван или истек.")
+    if state is None or not state[1]:
+        raise InvalidAPIKey("Пользователь не найден или неактивен.")
+    return credential
@@ -0,0 +1,13 @@
+"""Конфигурация приложения custom_auth."""
+
+from django.apps import AppConfig
+
+
+class CustomAuthConfig(AppConfig):
+    """Конфигурация приложения аутентификации и авторизации."""
+
+    name = "custom_auth"
+
+    def ready(self):
+        """Подключает обработчики сигналов моделей."""
+        from . import signals  # noqa: F401
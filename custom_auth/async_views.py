@@ -0,0 +1,180 @@
+"""Асинхронные (ASGI) представления приложения custom_auth.
+
+Используются вместо DRF-представлений при ASYNC_VIEWS=True и запуске под
+ASGI-сервером (uvicorn): запросы к БД выполняются через асинхронный ORM,
+а хеширование паролей ожидается без блокировки event loop, поэтому один
+воркер обслуживает много одновременных медленных клиентов.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import (
+    APIException,
+    AuthenticationFailed,
+    NotAuthenticated,
+    PermissionDenied,
+    Throttled,
+)
+
+from .authentication import APIKeyAuthentication, AsyncJWTAuthentication
+from .exceptions import to_api_exception
+from .hashing import (
+    PasswordHashingUnavailable,
+    amake_password,
+    averify_password,
+    needs_rehash,
+)
+from .login_throttle import client_ip, login_throttle
+from .models import User
+from .permissions import AsyncAccessPermission
+from .serializers import LoginSerializer
+from .tokens import issue_access_token, issue_refresh_token
+
+
+class AsyncAPIView(View):
+    """Базовое асинхронное представление с JWT-аутентификацией и AccessPermission.
+
+    Повторяет поведение APIView с permission_classes
+    [IsAuthenticated, AccessPermission], включая коды ответов.
+    """
+
+    authentication = AsyncJWTAuthentication()
+    api_key_authentication = APIKeyAuthentication()
+    permission = AsyncAccessPermission()
+    require_authentication = True
+    required_permission = None
+    element_id = None
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """Как и APIView, отключает CSRF: аутентификация только по токену."""
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Аутентифицирует запрос, проверяет права и вызывает обработчик."""
+        try:
+            if self.require_authentication:
+                await self.check_access(request)
+            return await super().dispatch(request, *args, **kwargs)
+        except (APIException, PasswordHashingUnavailable) as exc:
+            return self.handle_exception(to_api_exception(exc))
+
+    async def check_access(self, request):
+        """Выполняет аутентификацию и проверку прав.
+
+        Raises:
+            NotAuthenticated: если токен не передан
+            AuthenticationFailed: если токен недействителен
+            PermissionDenied: если у роли нет нужного права
+        """
+        result = await self.authentication.aauthenticate(request)
+        if result is None:
+            result = await self.api_key_authentication.aauthenticate(request)
+        if result is None:
+            raise NotAuthenticated()
+        request.user, request.auth = result
+        if not await self.permission.ahas_permission(request, self):
+            raise PermissionDenied()
+
+    def handle_exception(self, exc):
+        """Преобразует исключение DRF в JSON-ответ.
+
+        Как и в DRF без заголовка WWW-Authenticate, ошибки аутентификации
+        возвращаются с кодом 403.
+        """
+        status_code = exc.status_code
+        if isinstance(exc, (NotAuthenticated, AuthenticationFailed)):
+            status_code = status.HTTP_403_FORBIDDEN
+        response = JsonResponse({"detail": exc.detail}, status=status_code)
+        if getattr(exc, "wait", None):
+            response["Retry-After"] = str(exc.wait)
+        return response
+
+
+class AsyncLoginView(AsyncAPIView):
+    """Асинхронный вариант LoginView."""
+
+    require_authentication = False
+
+    async def post(self, request):
+        """Аутентифицирует пользователя и возвращает JWT токен.
+
+        Args:
+            request: HTTP-запрос с данными email и password
+
+        Returns:
+            JsonResponse: Токен в случае успеха
+
+        Status Codes:
+            200: Успешная аутентификация
+            400: Некорректные данные
+            401: Неправильные учетные данные
+            429: Слишком много неудачных попыток (заголовок Retry-After)
+            503: Пул хеширования паролей перегружен
+        """
+        try:
+            body = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse(
+                {"detail": "Malformed JSON."}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        serializer = LoginSerializer(data=body)
+        if not serializer.is_valid():
+            return JsonResponse(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        data = serializer.validated_data
+        ip = client_ip(request)
+        if settings.LOGIN_THROTTLE_ENABLED:
+            # Счетчики в общем кэше читаются синхронно, поэтому в потоке
+            retry_after = await sync_to_async(login_throttle.check)(data["email"], ip)
+            if retry_after is not None:
+                raise Throttled(wait=retry_after)
+
+        try:
+            user = await User.objects.for_email(data["email"]).aget()
+        except User.DoesNotExist:
+            await self.record_failure(data["email"], ip)
+            return JsonResponse(
+                {"detail": "User not found."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+        if not user.is_active:
+            return JsonResponse(
+                {"detail": "Account is inactive."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        if not await averify_password(data["password"], user.password):
+            await self.record_failure(data["email"], ip)
+            return JsonResponse(
+                {"detail": "Incorrect password."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        if needs_rehash(user.password):
+            await self.upgrade_password_hash(user, data["password"])
+
+        refresh = await sync_to_async(issue_refresh_token)(user)
+        return JsonResponse({"token": issue_access_token(user), "refresh": refresh})
+
+    async def record_failure(self, email, ip):
+        """Учитывает неудачную попытку входа в лимите LOGIN_THROTTLE_*."""
+        if settings.LOGIN_THROTTLE_ENABLED:
+            await sync_to_async(login_throttle.record_failure)(email, ip)
+
+    async def upgrade_password_hash(self, user, raw_password):
+        """Пересчитывает хеш пароля по текущему профилю одним UPDATE."""
+        try:
+            user.password = await amake_password(raw_password)
+        except PasswordHashingUnavailable:
+            return
+        await User.objects.filter(pk=user.pk).aupdate(password=user.password)
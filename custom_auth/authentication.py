@@ -1,11 +1,66 @@
 """Модуль аутентификации с использованием JWT."""
 
 import jwt
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from django.utils import timezone
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
+from custom_auth import metrics, security_versions
+from custom_auth.api_keys import InvalidAPIKey, verify_key
+from custom_auth.revocation import denylist
+from custom_auth.tokens import decode_access_token
+
+
+class TokenUser:
+    """Облегченный пользователь, собранный из claims токена.
+
+    Содержит только id и role_id, которых достаточно для IsAuthenticated и
+    AccessPermission. Обращение к любому другому атрибуту один раз загружает
+    полноценную модель User из БД.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+    is_active = True
+
+    def __init__(self, user_id, role_id):
+        self.id = self.pk = user_id
+        self.role_id = role_id
+        self._instance = None
+
+    def get_instance(self):
+        """Возвращает полноценный объект User (загружается при первом вызове)."""
+        if self._instance is None:
+            from custom_auth.models import User
+
+            self._instance = User.objects.get(pk=self.pk)
+        return self._instance
+
+    def __getattr__(self, name):
+        """Проксирует остальные атрибуты к модели User."""
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.get_instance(), name)
+
+    def __str__(self):
+        """Возвращает строковое представление пользователя."""
+        return f"TokenUser({self.pk})"
+
+
+def get_user_instance(user):
+    """Возвращает модель User для request.user любого вида.
+
+    Args:
+        user: User или TokenUser
+
+    Returns:
+        User: Объект модели пользователя
+    """
+    if isinstance(user, TokenUser):
+        return user.get_instance()
+    return user
+
 
 class JWTAuthentication(BaseAuthentication):
     """
@@ -14,15 +69,21 @@ class JWTAuthentication(BaseAuthentication):
     Проверяет заголовок Authorization: Bearer <jwt_token>.
     Декодирует токен и ищет пользователя в БД.
 
+    При JWT_STATELESS_AUTH=True пользователь собирается из claims токена
+    (TokenUser) без запроса к БД; актуальность токена проверяется по версии
+    безопасности пользователя в общем кэше.
+
     Важно: Исключает проверку для эндпоинтов /register/ и /login/,
     так как они используются для получения токена.
     """
 
+    @metrics.instrument("auth")
     def authenticate(self, request):
         """
         Аутентифицирует запрос, используя JWT.
 
-        Возвращает кортеж (user, None) при успешной аутентификации.
+        Возвращает кортеж (user, payload) при успешной аутентификации;
+        payload токена доступен в представлениях как request.auth.
         Возвращает None для открытых эндпоинтов.
         Вызывает AuthenticationFailed при ошибках валидации.
 
@@ -30,9 +91,44 @@ class JWTAuthentication(BaseAuthentication):
             request: HTTP-запрос
 
         Returns:
-            Tuple[User, None]: аутентифицированный пользователь и None
+            Tuple[User, dict]: аутентифицированный пользователь и payload токена
             None: если запрос к открытому эндпоинту
 
+        Raises:
+            AuthenticationFailed: если токен недействителен или устарел
+        """
+        payload = self.get_payload(request)
+        if payload is None:
+            return None
+
+        if settings.JWT_STATELESS_AUTH and "sv" in payload:
+            return (self.authenticate_stateless(payload), payload)
+
+        try:
+            from custom_auth.models import User
+
+            user = User.objects.get(id=payload["user_id"], is_active=True)
+        except User.DoesNotExist as e:
+            raise AuthenticationFailed(
+                "Пользователь не найден или неактивен."
+            ) from e
+
+        self.check_version(user, payload)
+        return (user, payload)
+
+    def get_payload(self, request):
+        """Извлекает и проверяет токен из заголовка Authorization.
+
+        Не обращается к БД, поэтому используется и синхронной, и
+        асинхронной аутентификацией.
+
+        Args:
+            request: HTTP-запрос
+
+        Returns:
+            dict: Проверенная полезная нагрузка токена
+            None: если токена нет или запрос к открытому эндпоинту
+
         Raises:
             AuthenticationFailed: если токен недействителен или устарел
         """
@@ -46,9 +142,7 @@ class JWTAuthentication(BaseAuthentication):
 
         token = auth_header.split(" ")[1]
         try:
-            payload = jwt.decode(
-                token, settings.JWT_SECRET, algorithms=["HS256"], options={"verify_exp": True}
-            )
+            payload = decode_access_token(token)
         except jwt.ExpiredSignatureError as e:
             raise AuthenticationFailed("Срок действия токена истек.") from e
         except jwt.InvalidTokenError as e:
@@ -58,14 +152,152 @@ class JWTAuthentication(BaseAuthentication):
         if not user_id:
             raise AuthenticationFailed("Отсутствует идентификатор пользователя.")
 
-        try:
-            from custom_auth.models import User
+        jti = payload.get("jti")
+        if jti and denylist.is_revoked(jti):
+            raise AuthenticationFailed("Токен отозван. Выполните вход повторно.")
+
+        return payload
+
+    def authenticate_stateless(self, payload):
+        """Собирает пользователя из claims токена без запроса к БД.
+
+        Args:
+            payload: Проверенная полезная нагрузка токена
+
+        Returns:
+            TokenUser: облегченный пользователь
+
+        Raises:
+            AuthenticationFailed: если пользователь деактивирован, сменил роль
+                или удален после выпуска токена
+        """
+        return self.check_security_state(
+            payload, security_versions.get_state(payload["user_id"])
+        )
+
+    def check_version(self, user, payload):
+        """Сверяет версию безопасности из токена с загруженным пользователем.
+
+        Args:
+            user: Пользователь из БД
+            payload: Проверенная полезная нагрузка токена
 
-            user = User.objects.get(id=user_id, is_active=True)
+        Raises:
+            AuthenticationFailed: если токен выпущен до смены версии
+        """
+        if "sv" in payload and payload["sv"] != user.security_version:
+            raise AuthenticationFailed("Токен отозван. Выполните вход повторно.")
+
+    def check_security_state(self, payload, state):
+        """Сверяет claims токена с актуальным состоянием пользователя.
+
+        Args:
+            payload: Проверенная полезная нагрузка токена
+            state: (version, is_active) из security_versions.get_state
+
+        Returns:
+            TokenUser: облегченный пользователь
+
+        Raises:
+            AuthenticationFailed: если токен больше не действителен
+        """
+        if state is None:
+            raise AuthenticationFailed("Пользователь не найден или неактивен.")
+
+        version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed("Пользователь не найден или неактивен.")
+        if version != payload["sv"]:
+            raise AuthenticationFailed("Токен отозван. Выполните вход повторно.")
+
+        return TokenUser(payload["user_id"], payload.get("role_id"))
+
+
+class AsyncJWTAuthentication(JWTAuthentication):
+    """Асинхронный вариант JWTAuthentication для ASGI-представлений.
+
+    Проверка токена выполняется так же, а пользователь загружается через
+    асинхронный ORM (aget) без переключения в поток.
+    """
+
+    @metrics.instrument("auth")
+    async def aauthenticate(self, request):
+        """Аутентифицирует запрос, используя JWT.
+
+        Args:
+            request: HTTP-запрос Django
+
+        Returns:
+            Tuple[User, dict]: аутентифицированный пользователь и payload токена
+            None: если токена нет или запрос к открытому эндпоинту
+
+        Raises:
+            AuthenticationFailed: если токен недействителен или устарел
+        """
+        payload = self.get_payload(request)
+        if payload is None:
+            return None
+
+        if settings.JWT_STATELESS_AUTH and "sv" in payload:
+            state = await sync_to_async(security_versions.get_state)(
+                payload["user_id"]
+            )
+            return (self.check_security_state(payload, state), payload)
+
+        from custom_auth.models import User
+
+        try:
+            user = await User.objects.aget(id=payload["user_id"], is_active=True)
         except User.DoesNotExist as e:
             raise AuthenticationFailed(
                 "Пользователь не найден или неактивен."
             ) from e
 
-        return (user, None)
+        self.check_version(user, payload)
+        return (user, payload)
+
+
+class APIKeyAuthentication(BaseAuthentication):
+    """Аутентификация сервисных аккаунтов по ключу API.
+
+    Проверяет заголовок Authorization: Api-Key <key>. Пользователь
+    собирается без запроса к БД (TokenUser), а request.auth содержит
+    APIKeyCredential со scopes ключа, которые учитывает AccessPermission.
+    """
+
+    keyword = "Api-Key "
+
+    @metrics.instrument("auth")
+    def authenticate(self, request):
+        """Аутентифицирует запрос по ключу API.
+
+        Args:
+            request: HTTP-запрос
 
+        Returns:
+            Tuple[TokenUser, APIKeyCredential]: владелец ключа и данные ключа
+            None: если заголовка с ключом нет
+
+        Raises:
+            AuthenticationFailed: если ключ недействителен
+        """
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith(self.keyword):
+            return None
+
+        try:
+            credential = verify_key(auth_header[len(self.keyword):].strip())
+        except InvalidAPIKey as e:
+            raise AuthenticationFailed(str(e)) from e
+        return (TokenUser(credential.user_id, credential.role_id), credential)
+
+    async def aauthenticate(self, request):
+        """Асинхронный вариант authenticate для ASGI-представлений.
+
+        Проверка выполняется в потоке, так как при промахе кэша ключ
+        загружается из БД.
+        """
+        auth_header = request.headers.get("Authorization")
+        if not auth_header or not auth_header.startswith(self.keyword):
+            return None
+        return await sync_to_async(self.authenticate)(request)
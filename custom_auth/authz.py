@@ -0,0 +1,180 @@
+"""Облегченный эндпоинт решений авторизации для auth_request nginx/envoy.
+
+Прокси отправляет подзапрос с заголовком Authorization исходного запроса и
+получает пустой ответ:
+
+    200 – доступ разрешен (заголовки X-Auth-User-Id и X-Auth-Role-Id)
+    401 – токена нет, он недействителен или отозван
+    403 – правило AccessRule не разрешает действие
+    400 – не указан бизнес-элемент или действие
+
+Элемент и действие берутся из пути (/authz/<element>/<action>/) или из
+заголовков X-Auth-Element и X-Auth-Action; вместо X-Auth-Action можно
+передать метод исходного запроса в X-Original-Method (GET -> read и т.д.).
+Элемент задается именем BusinessElement без учета регистра или его id.
+
+Эндпоинт обслуживается оберткой вокруг WSGI/ASGI-приложения до Django:
+без middleware, URL-резолвера и DRF. Токен проверяется так же, как в
+JWTAuthentication (подпись, denylist, версия безопасности из общего кэша),
+а право – по матрице прав в памяти, поэтому в установившемся режиме
+запросов к БД нет.
+"""
+
+import jwt
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from custom_auth import security_versions
+from custom_auth.access_matrix import ACTIONS, METHOD_ACTIONS, get_matrix
+from custom_auth.revocation import denylist
+from custom_auth.tokens import decode_access_token
+
+STATUS_LINES = {
+    200: "200 OK",
+    400: "400 Bad Request",
+    401: "401 Unauthorized",
+    403: "403 Forbidden",
+}
+
+UNAUTHORIZED_HEADERS = [("WWW-Authenticate", "Bearer")]
+
+
+def resolve_target(path, element, action, original_method):
+    """Определяет бизнес-элемент и действие подзапроса.
+
+    Args:
+        path: Часть пути после префикса AUTHZ_PATH
+        element: Значение X-Auth-Element или None
+        action: Значение X-Auth-Action или None
+        original_method: Значение X-Original-Method или None
+
+    Returns:
+        tuple: (element, action); элементы могут быть None
+    """
+    parts = [part for part in path.split("/") if part]
+    if parts:
+        element = parts[0]
+    if len(parts) > 1:
+        action = parts[1]
+    if not action and original_method:
+        action = METHOD_ACTIONS.get(original_method.upper())
+    return element, action
+
+
+def decide(authorization, element, action):
+    """Принимает решение о доступе.
+
+    Args:
+        authorization: Значение заголовка Authorization
+        element: Имя или id бизнес-элемента
+        action: 'read' | 'create' | 'update' | 'delete'
+
+    Returns:
+        tuple: (status, headers) – HTTP-статус и список заголовков ответа
+    """
+    if not element or action not in ACTIONS:
+        return 400, []
+    if not authorization or not authorization.startswith("Bearer "):
+        return 401, UNAUTHORIZED_HEADERS
+
+    try:
+        payload = decode_access_token(authorization[7:])
+    except jwt.InvalidTokenError:
+        return 401, UNAUTHORIZED_HEADERS
+
+    user_id = payload.get("user_id")
+    jti = payload.get("jti")
+    if not user_id or "sv" not in payload or (jti and denylist.is_revoked(jti)):
+        return 401, UNAUTHORIZED_HEADERS
+
+    state = security_versions.get_state(user_id)
+    if state is None or not state[1] or state[0] != payload["sv"]:
+        return 401, UNAUTHORIZED_HEADERS
+
+    role_id = payload.get("role_id")
+    if not role_id:
+        return 403, []
+
+    matrix = get_matrix()
+    element_id = matrix.element_id(element)
+    if element_id is None:
+        return 403, []
+    if not matrix.is_admin(role_id) and not matrix.allows(role_id, element_id, action):
+        return 403, []
+
+    return 200, [("X-Auth-User-Id", str(user_id)), ("X-Auth-Role-Id", str(role_id))]
+
+
+def decide_environ(environ, path):
+    """Принимает решение по WSGI environ (или эквивалентному словарю).
+
+    Args:
+        environ: Словарь с заголовками в виде HTTP_*
+        path: Часть пути после префикса AUTHZ_PATH
+
+    Returns:
+        tuple: (status, headers)
+    """
+    element, action = resolve_target(
+        path,
+        environ.get("HTTP_X_AUTH_ELEMENT"),
+        environ.get("HTTP_X_AUTH_ACTION"),
+        environ.get("HTTP_X_ORIGINAL_METHOD"),
+    )
+    try:
+        return decide(environ.get("HTTP_AUTHORIZATION"), element, action)
+    finally:
+        # Django закрывает устаревшие соединения по сигналам начала и
+        # конца запроса, которые этот путь не отправляет
+        close_old_connections()
+
+
+class AuthzWSGIMiddleware:
+    """WSGI-обертка, обслуживающая AUTHZ_PATH без участия Django."""
+
+    def __init__(self, application, prefix=None):
+        self.application = application
+        self.prefix = settings.AUTHZ_PATH if prefix is None else prefix
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        if not self.prefix or not path.startswith(self.prefix):
+            return self.application(environ, start_response)
+
+        status, headers = decide_environ(environ, path[len(self.prefix):])
+        start_response(STATUS_LINES[status], headers + [("Content-Length", "0")])
+        return [b""]
+
+
+class AuthzASGIMiddleware:
+    """ASGI-обертка, обслуживающая AUTHZ_PATH без участия Django.
+
+    Решение принимается в потоке (sync_to_async), так как при промахе
+    кэша проверка может обратиться к БД.
+    """
+
+    def __init__(self, application, prefix=None):
+        self.application = application
+        self.prefix = settings.AUTHZ_PATH if prefix is None else prefix
+        self._decide = sync_to_async(decide_environ)
+
+    async def __call__(self, scope, receive, send):
+        path = scope.get("path", "") if scope["type"] == "http" else ""
+        if not self.prefix or not path.startswith(self.prefix):
+            return await self.application(scope, receive, send)
+
+        environ = {
+            "HTTP_" + name.decode("latin1").upper().replace("-", "_"): value.decode("latin1")
+            for name, value in scope["headers"]
+        }
+        status, headers = await self._decide(environ, path[len(self.prefix):])
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (name.encode("latin1"), value.encode("latin1"))
+                for name, value in headers + [("Content-Length", "0")]
+            ],
+        })
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,38 @@
+"""Ограничения моделей, зависящие от возможностей СУБД."""
+
+import copy
+
+from django.db import models
+
+
+class CoveringUniqueConstraint(models.UniqueConstraint):
+    """UniqueConstraint с INCLUDE там, где СУБД поддерживает покрывающие индексы.
+
+    PostgreSQL создает один уникальный индекс с неключевыми столбцами, и
+    он же обслуживает чтение index-only scan. На СУБД без INCLUDE (SQLite)
+    стандартный UniqueConstraint не создается совсем, а этот класс создает
+    обычное ограничение уникальности по ключевым столбцам.
+    """
+
+    def _for_backend(self, schema_editor):
+        """Возвращает ограничение без INCLUDE, если СУБД его не поддерживает."""
+        if self.include and not schema_editor.connection.features.supports_covering_indexes:
+            constraint = copy.copy(self)
+            constraint.include = ()
+            return constraint
+        return self
+
+    def constraint_sql(self, model, schema_editor):
+        return super(CoveringUniqueConstraint, self._for_backend(schema_editor)).constraint_sql(
+            model, schema_editor
+        )
+
+    def create_sql(self, model, schema_editor):
+        return super(CoveringUniqueConstraint, self._for_backend(schema_editor)).create_sql(
+            model, schema_editor
+        )
+
+    def remove_sql(self, model, schema_editor):
+        return super(CoveringUniqueConstraint, self._for_backend(schema_editor)).remove_sql(
+            model, schema_editor
+        )
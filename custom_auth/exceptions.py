@@ -0,0 +1,39 @@
+"""Преобразование доменных ошибок custom_auth в ответы API."""
+
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.views import exception_handler as drf_exception_handler
+
+from .hashing import PasswordHashingUnavailable
+
+
+class ServiceOverloaded(APIException):
+    """Ответ 503 при перегрузке пула хеширования паролей."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Сервис временно перегружен, повторите попытку позже."
+    default_code = "password_hashing_unavailable"
+
+    def __init__(self, wait, detail=None, code=None):
+        super().__init__(detail, code)
+        # DRF выставляет заголовок Retry-After по атрибуту wait
+        self.wait = wait
+
+
+def to_api_exception(exc):
+    """Возвращает APIException для доменной ошибки или саму ошибку.
+
+    Args:
+        exc: Исключение из представления
+
+    Returns:
+        Exception: ServiceOverloaded для PasswordHashingUnavailable, иначе exc
+    """
+    if isinstance(exc, PasswordHashingUnavailable):
+        return ServiceOverloaded(exc.retry_after)
+    return exc
+
+
+def exception_handler(exc, context):
+    """EXCEPTION_HANDLER для DRF: доменные ошибки отдаются с нужным кодом."""
+    return drf_exception_handler(to_api_exception(exc), context)
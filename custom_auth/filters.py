@@ -0,0 +1,65 @@
+"""Фильтрация querysets по правилам доступа (`*_permission` / `*_all_permission`).
+
+Право «только свои объекты» превращается в условие WHERE по полю владельца,
+поэтому строки чужих пользователей не загружаются из БД. Для update/delete
+детальные представления получают объект через get_object(), который
+применяет тот же фильтр: проверка владельца выполняется тем же запросом, а
+чужой объект дает 404.
+"""
+
+from rest_framework.filters import BaseFilterBackend
+
+from custom_auth.access_matrix import SCOPE_ALL, SCOPE_OWN, get_matrix
+from custom_auth.permissions import required_action
+
+
+def scope_queryset(queryset, user, matrix, element_id, action, owner_field="owner"):
+    """Ограничивает queryset объектами, доступными пользователю.
+
+    Args:
+        queryset: Исходный queryset
+        user: Аутентифицированный пользователь (User или TokenUser)
+        matrix: Снимок матрицы прав (AccessMatrix)
+        element_id: id бизнес-элемента
+        action: 'read' | 'create' | 'update' | 'delete'
+        owner_field: Поле модели, по которому определяется владелец
+
+    Returns:
+        QuerySet: Все объекты, только объекты пользователя или пустой queryset
+    """
+    role_id = getattr(user, "role_id", None)
+    scope = matrix.scope(role_id, element_id, action) if role_id else None
+    if scope == SCOPE_ALL:
+        return queryset
+    if scope == SCOPE_OWN:
+        return queryset.filter(**{owner_field: user.pk})
+    return queryset.none()
+
+
+class AccessRuleFilterBackend(BaseFilterBackend):
+    """Фильтр DRF по правилу роли пользователя для бизнес-элемента представления.
+
+    Представление задает element_id, а также может задать owner_field
+    (по умолчанию "owner") и required_permission (по умолчанию действие
+    определяется по HTTP-методу).
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """Добавляет условие по владельцу, если у роли нет права `*_all`.
+
+        Args:
+            request: HTTP-запрос
+            queryset: Исходный queryset
+            view: Представление с element_id
+
+        Returns:
+            QuerySet: Отфильтрованный queryset
+        """
+        return scope_queryset(
+            queryset,
+            request.user,
+            get_matrix(),
+            view.element_id,
+            required_action(view, request.method),
+            getattr(view, "owner_field", "owner"),
+        )
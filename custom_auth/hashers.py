@@ -0,0 +1,45 @@
+"""Хешеры паролей с параметрами из профиля PASSWORD_HASH_PROFILE."""
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    BCryptSHA256PasswordHasher,
+    PBKDF2PasswordHasher,
+)
+
+
+class ProfilePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 с числом итераций из PASSWORD_HASH_PROFILE."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_PROFILE["ITERATIONS"]
+
+
+class ProfileBCryptSHA256PasswordHasher(BCryptSHA256PasswordHasher):
+    """bcrypt(SHA256) с числом раундов из PASSWORD_HASH_PROFILE."""
+
+    @property
+    def rounds(self):
+        return settings.PASSWORD_HASH_PROFILE["BCRYPT_ROUNDS"]
+
+
+def describe(encoded):
+    """Возвращает профиль, которым создан хеш.
+
+    Args:
+        encoded: Значение User.password
+
+    Returns:
+        str: Например 'pbkdf2_sha256:600000', 'bcrypt_sha256:12' или 'unusable'
+    """
+    if not encoded or encoded.startswith("!"):
+        return "unusable"
+
+    algorithm, _, rest = encoded.partition("$")
+    if algorithm.startswith("pbkdf2"):
+        return f"{algorithm}:{rest.split('$', 1)[0]}"
+    if algorithm.startswith("bcrypt"):
+        # Формат: bcrypt_sha256$$2b$12$<salt+hash>
+        parts = encoded.split("$")
+        return f"{algorithm}:{parts[3]}" if len(parts) > 3 else algorithm
+    return algorithm
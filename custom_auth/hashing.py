@@ -0,0 +1,217 @@
+"""Хеширование паролей в ограниченном пуле потоков.
+
+Проверка и создание хеша пароля (PBKDF2, bcrypt) намеренно медленные.
+Если выполнять их прямо в воркере запроса, всплеск логинов занимает все
+воркеры и дешевые запросы к /business/* ждут в очереди. Поэтому хеширование
+выполняется в отдельном пуле фиксированного размера (hashlib и bcrypt
+отпускают GIL, так что потоки работают параллельно), а при переполнении
+очереди запрос сразу получает 503 с заголовком Retry-After.
+
+Пул помогает, только когда процесс обслуживает несколько запросов сразу:
+gthread-воркеры gunicorn (GUNICORN_THREADS > 1) или ASGI. Sync-воркер
+ждет результат хеширования и не принимает других запросов, поэтому в пуле
+не бывает больше одной задачи, а отказ 503 недостижим. Размеры пула по
+умолчанию считаются от числа потоков воркера (см. project/settings.py).
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PasswordHashingUnavailable(Exception):
+    """Пул хеширования перегружен.
+
+    Доменная ошибка: представления отвечают на нее 503 с заголовком
+    Retry-After (см. custom_auth/exceptions.py).
+    """
+
+    # Через сколько секунд клиенту стоит повторить запрос
+    retry_after = 1
+
+
+class PasswordHashPool:
+    """Пул потоков для хеширования паролей с контролем допуска.
+
+    Одновременно в пуле может находиться не более workers + max_pending
+    задач; остальные отклоняются исключением PasswordHashingUnavailable.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.in_flight = 0
+        self.submitted = 0
+        self.rejected = 0
+        self.completed = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+
+    def run(self, func, *args):
+        """Выполняет func(*args) в пуле и возвращает результат.
+
+        Args:
+            func: Функция хеширования
+            *args: Аргументы функции
+
+        Returns:
+            Результат func
+
+        Raises:
+            PasswordHashingUnavailable: если очередь пула заполнена
+        """
+        future = self._submit(func, *args)
+        try:
+            return future.result()
+        finally:
+            self._done()
+
+    async def arun(self, func, *args):
+        """Асинхронный вариант run: ожидает результат, не блокируя event loop.
+
+        Raises:
+            PasswordHashingUnavailable: если очередь пула заполнена
+        """
+        future = self._submit(func, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            self._done()
+
+    def _submit(self, func, *args):
+        """Занимает слот очереди и отправляет задачу в пул."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHashingUnavailable()
+
+        with self._lock:
+            self.submitted += 1
+            self.in_flight += 1
+        try:
+            return self._executor.submit(
+                self._timed, time.perf_counter(), func, *args
+            )
+        except BaseException:
+            self._done()
+            raise
+
+    def _done(self):
+        """Освобождает слот очереди."""
+        with self._lock:
+            self.in_flight -= 1
+        self._slots.release()
+
+    def _timed(self, queued_at, func, *args):
+        """Выполняет задачу, учитывая время ожидания и работы."""
+        started = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self.completed += 1
+                self.wait_seconds += started - queued_at
+                self.busy_seconds += finished - started
+
+    def stats(self):
+        """Возвращает метрики пула.
+
+        Returns:
+            dict: Счетчики задач, суммарное время хеширования и ожидания,
+            средняя задержка хеширования и загрузка пула (0..1)
+        """
+        with self._lock:
+            elapsed = time.monotonic() - self._started_at
+            completed = self.completed
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+                "rejected": self.rejected,
+                "completed": completed,
+                "busy_seconds": self.busy_seconds,
+                "wait_seconds": self.wait_seconds,
+                "avg_hash_seconds": (
+                    self.busy_seconds / completed if completed else 0.0
+                ),
+                "utilisation": (
+                    self.busy_seconds / (elapsed * self.workers) if elapsed else 0.0
+                ),
+            }
+
+
+pool = PasswordHashPool(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_SIZE
+)
+
+
+def verify_password(raw_password, encoded):
+    """Проверяет пароль против хеша в пуле хеширования.
+
+    Args:
+        raw_password: Пароль в открытом виде
+        encoded: Хеш из User.password
+
+    Returns:
+        bool: True, если пароль верный
+    """
+    return pool.run(hashers.check_password, raw_password, encoded)
+
+
+async def averify_password(raw_password, encoded):
+    """Асинхронный вариант verify_password."""
+    return await pool.arun(hashers.check_password, raw_password, encoded)
+
+
+def needs_rehash(encoded):
+    """Проверяет, создан ли хеш по устаревшему профилю.
+
+    Хеш устарел, если он вычислен другим алгоритмом, чем первый в
+    PASSWORD_HASHERS, или с другим числом итераций/раундов.
+
+    Args:
+        encoded: Хеш из User.password
+
+    Returns:
+        bool: True, если хеш нужно пересчитать
+    """
+    preferred = hashers.get_hasher("default")
+    try:
+        hasher = hashers.identify_hasher(encoded)
+    except ValueError:
+        return False
+    return hasher.algorithm != preferred.algorithm or preferred.must_update(encoded)
+
+
+def make_password(raw_password):
+    """Создает хеш пароля в пуле хеширования.
+
+    Args:
+        raw_password: Пароль в открытом виде или None
+
+    Returns:
+        str: Хеш для User.password
+    """
+    if raw_password is None:
+        # Неиспользуемый пароль не требует вычисления KDF
+        return hashers.make_password(None)
+    return pool.run(hashers.make_password, raw_password)
+
+
+async def amake_password(raw_password):
+    """Асинхронный вариант make_password."""
+    if raw_password is None:
+        return hashers.make_password(None)
+    return await pool.arun(hashers.make_password, raw_password)
@@ -0,0 +1,198 @@
+"""Ограничение частоты неудачных входов по email и IP (скользящее окно).
+
+Каждая неудачная попытка входа с существующим email стоит полного KDF
+пароля, поэтому перебор паролей превращается в нагрузку на CPU всего
+приложения. Лимиты проверяются до поиска пользователя и хеширования:
+при превышении запрос сразу получает 429 с заголовком Retry-After.
+
+Счетчики – приближенное скользящее окно из двух фиксированных окон:
+оценка = предыдущее окно × доля его оставшегося перекрытия + текущее окно.
+На ключ хранятся два целых числа в общем кэше Django (settings.CACHES),
+поэтому лимит общий для всех воркеров. Если общий кэш недоступен,
+используются такие же счетчики в памяти процесса. Заблокированные ключи
+запоминаются локально до конца блокировки, и повторные попытки
+отклоняются без обращения к кэшу; истекшие блокировки удаляются не реже
+раза в окно.
+
+IP клиента берется так же, как в троттлинге DRF: за NUM_PROXIES
+доверенными прокси – из X-Forwarded-For, иначе из REMOTE_ADDR.
+"""
+
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.throttling import BaseThrottle
+
+KEY = "custom_auth:login_throttle:{}:{}:{}"
+
+
+def client_ip(request):
+    """Возвращает IP-адрес клиента для лимита на IP.
+
+    За прокси REMOTE_ADDR – адрес самого прокси, поэтому при
+    REST_FRAMEWORK["NUM_PROXIES"] > 0 адрес берется из X-Forwarded-For:
+    запись, добавленная самым дальним из доверенных прокси.
+
+    Args:
+        request: Запрос Django или DRF
+
+    Returns:
+        str | None: IP-адрес клиента
+    """
+    return BaseThrottle().get_ident(request)
+
+
+class LoginThrottle:
+    """Лимиты неудачных входов на email и на IP-адрес."""
+
+    def __init__(self, window, email_limit, ip_limit):
+        self.window = window
+        self.limits = {"email": email_limit, "ip": ip_limit}
+        self.rejected = 0
+        self._blocked = {}
+        self._blocked_pruned_at = time.time()
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def _subjects(self, email, ip):
+        """Возвращает пары (вид, ключ) для проверки.
+
+        Email хранится в кэше только в виде короткого хеша.
+        """
+        subjects = []
+        if email:
+            digest = hashlib.sha256(email.strip().lower().encode()).hexdigest()[:20]
+            subjects.append(("email", digest))
+        if ip:
+            subjects.append(("ip", ip))
+        return subjects
+
+    def check(self, email, ip):
+        """Проверяет лимиты перед поиском пользователя и проверкой пароля.
+
+        Args:
+            email: Email из запроса
+            ip: IP-адрес клиента
+
+        Returns:
+            int | None: Через сколько секунд повторить попытку или None,
+                если лимиты не превышены
+        """
+        now = time.time()
+        if now - self._blocked_pruned_at >= self.window:
+            self._prune_blocked(now)
+        subjects = self._subjects(email, ip)
+
+        for subject in subjects:
+            blocked_until = self._blocked.get(subject)
+            if blocked_until is not None:
+                if blocked_until > now:
+                    return self._reject(blocked_until - now)
+                with self._lock:
+                    self._blocked.pop(subject, None)
+
+        window_index, elapsed = divmod(now, self.window)
+        keys = {
+            subject: (
+                KEY.format(*subject, int(window_index) - 1),
+                KEY.format(*subject, int(window_index)),
+            )
+            for subject in subjects
+        }
+        counts = self._get_many([key for pair in keys.values() for key in pair])
+        overlap = 1 - elapsed / self.window
+        for subject, (previous, current) in keys.items():
+            estimate = counts.get(previous, 0) * overlap + counts.get(current, 0)
+            if estimate >= self.limits[subject[0]]:
+                blocked_until = now + (self.window - elapsed)
+                with self._lock:
+                    self._blocked[subject] = blocked_until
+                return self._reject(blocked_until - now)
+        return None
+
+    def record_failure(self, email, ip):
+        """Учитывает неудачную попытку входа.
+
+        Args:
+            email: Email из запроса
+            ip: IP-адрес клиента
+        """
+        window_index = int(time.time() // self.window)
+        for subject in self._subjects(email, ip):
+            self._incr(KEY.format(*subject, window_index))
+
+    def _reject(self, retry_after):
+        """Учитывает отклоненную попытку и возвращает Retry-After."""
+        with self._lock:
+            self.rejected += 1
+        return max(1, math.ceil(retry_after))
+
+    def _get_many(self, keys):
+        """Читает счетчики из общего кэша или из памяти процесса."""
+        try:
+            return cache.get_many(keys)
+        except Exception:
+            return {key: self._local[key] for key in keys if key in self._local}
+
+    def _incr(self, key):
+        """Увеличивает счетчик в общем кэше или в памяти процесса."""
+        try:
+            cache.add(key, 0, self.window * 2)
+            cache.incr(key)
+            return
+        except ValueError:
+            # Счетчик вытеснен из кэша между add и incr
+            cache.set(key, 1, self.window * 2)
+            return
+        except Exception:
+            pass
+        with self._lock:
+            self._local[key] = self._local.get(key, 0) + 1
+            if len(self._local) > settings.LOGIN_THROTTLE_LOCAL_SIZE:
+                self._prune_local()
+
+    def _prune_blocked(self, now):
+        """Удаляет истекшие блокировки ключей, которые больше не проверялись."""
+        with self._lock:
+            self._blocked_pruned_at = now
+            expired = [
+                subject for subject, blocked_until in self._blocked.items()
+                if blocked_until <= now
+            ]
+            for subject in expired:
+                del self._blocked[subject]
+
+    def _prune_local(self):
+        """Удаляет локальные счетчики окон старше предыдущего."""
+        oldest = int(time.time() // self.window) - 1
+        stale = [key for key in self._local if int(key.rsplit(":", 1)[1]) < oldest]
+        for key in stale:
+            del self._local[key]
+
+    def stats(self):
+        """Возвращает показатели для метрик.
+
+        Каждая отклоненная попытка – это поиск пользователя и проверка
+        пароля, которые не пришлось выполнять.
+
+        Returns:
+            dict: hashes_saved и оценка сэкономленного времени хеширования
+        """
+        from custom_auth.hashing import pool
+
+        avg_hash_seconds = pool.stats()["avg_hash_seconds"]
+        return {
+            "hashes_saved": self.rejected,
+            "hash_seconds_saved": self.rejected * avg_hash_seconds,
+        }
+
+
+login_throttle = LoginThrottle(
+    settings.LOGIN_THROTTLE_WINDOW,
+    settings.LOGIN_THROTTLE_EMAIL_LIMIT,
+    settings.LOGIN_THROTTLE_IP_LIMIT,
+)
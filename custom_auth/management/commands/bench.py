@@ -0,0 +1,390 @@
+"""Команда bench: бенчмарки горячих путей аутентификации и авторизации.
+
+Запускается на отдельной тестовой БД (создается и удаляется автоматически),
+заполненной фикстурами из project/fixtures. Работает и с Postgres, и с
+SQLite (DB_ENGINE=sqlite). HTTP-сценарии выполняются через django.test.Client
+в том же процессе, поэтому измеряют стек Django/DRF без сетевых задержек.
+
+Пример использования в CI:
+
+    python manage.py bench --json bench.json --baseline bench-baseline.json
+
+Команда завершается с ошибкой, если пропускная способность сценария упала
+больше чем на --tolerance относительно baseline или выросло число
+SQL-запросов на операцию.
+"""
+
+import json
+import statistics
+import time
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from business.models import Order, Product
+from custom_auth import renderers
+from custom_auth.authentication import JWTAuthentication
+from custom_auth.authz import STATUS_LINES, AuthzWSGIMiddleware
+from custom_auth.models import AccessRule, User
+from custom_auth.permissions import AccessPermission
+from custom_auth.seed import load_fixtures
+from custom_auth.serializers import AccessRuleSerializer
+from custom_auth.tokens import issue_access_token, issue_refresh_token
+
+BENCH_PASSWORD = "bench-password"
+
+# Число продуктов и заказов каждого пользователя бенчмарка
+BENCH_OBJECTS_PER_USER = 50
+
+# Роли пользователей бенчмарка (id из project/fixtures/roles.json)
+BENCH_USERS = {
+    "admin": 1,
+    "manager": 2,
+    "user": 3,
+}
+
+# Число правил доступа в ответе для сценариев render_* (как одна страница
+# /api/rules/?page_size=<API_MAX_PAGE_SIZE>)
+BENCH_RENDER_ITEMS = 1000
+
+# HTTP-сценарии: имя -> (метод, путь, роль токена, ожидаемый статус)
+HTTP_SCENARIOS = {
+    "profile": ("get", "/api/profile/", "user", 200),
+    "permissions": ("get", "/api/permissions/", "user", 200),
+    "products": ("get", "/business/products/", "user", 200),
+    "orders": ("get", "/business/orders/", "admin", 200),
+    "users": ("get", "/business/users/", "admin", 200),
+}
+
+
+class QueryCounter:
+    """Обертка выполнения SQL, считающая запросы."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    """Измеряет пропускную способность, p50/p99 и SQL-запросы на операцию."""
+
+    help = (
+        "Бенчмарки /api/login/, /api/register/, /api/token/refresh/, "
+        "/api/profile/, /business/*, /authz/ и "
+        "микробенчмарки JWTAuthentication.authenticate, "
+        "AccessPermission.has_permission и рендереров ответа "
+        "на отдельной тестовой БД."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n", "--requests", type=int, default=500,
+            help="Число итераций для быстрых сценариев.",
+        )
+        parser.add_argument(
+            "--slow-requests", type=int, default=20,
+            help="Число итераций для сценариев с хешированием пароля.",
+        )
+        parser.add_argument(
+            "--warmup", type=int, default=20,
+            help="Число прогревочных итераций (не учитываются).",
+        )
+        parser.add_argument(
+            "--only", default="",
+            help="Список сценариев через запятую (по умолчанию все).",
+        )
+        parser.add_argument(
+            "--json", dest="json_path",
+            help="Сохранить результаты в JSON-файл.",
+        )
+        parser.add_argument(
+            "--baseline",
+            help="JSON-файл с предыдущими результатами для сравнения.",
+        )
+        parser.add_argument(
+            "--tolerance", type=float, default=0.2,
+            help="Допустимое падение пропускной способности (доля, по умолчанию 0.2).",
+        )
+        parser.add_argument(
+            "--keepdb", action="store_true",
+            help="Не удалять тестовую БД после завершения.",
+        )
+
+    def handle(self, *args, **options):
+        """Создает тестовую БД, выполняет сценарии и сравнивает с baseline."""
+        self.options = options
+        selected = [name for name in options["only"].split(",") if name]
+        unknown = set(selected) - set(self.scenarios())
+        if unknown:
+            raise CommandError(f"Неизвестные сценарии: {', '.join(sorted(unknown))}")
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            self.seed()
+            results = {}
+            for name, scenario in self.scenarios().items():
+                if selected and name not in selected:
+                    continue
+                results[name] = scenario()
+                self.report(name, results[name])
+        finally:
+            connection.creation.destroy_test_db(
+                old_name, verbosity=0, keepdb=options["keepdb"]
+            )
+            teardown_test_environment()
+
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, indent=2, ensure_ascii=False)
+        if options["baseline"]:
+            self.compare(results, options["baseline"], options["tolerance"])
+
+    def scenarios(self):
+        """Возвращает словарь имя сценария -> функция без аргументов."""
+        scenarios = {
+            "login": self.bench_login,
+            "register": self.bench_register,
+            "refresh": self.bench_refresh,
+        }
+        for name in HTTP_SCENARIOS:
+            scenarios[name] = lambda name=name: self.bench_http(name)
+        scenarios["authenticate"] = self.bench_authenticate
+        scenarios["has_permission"] = self.bench_has_permission
+        scenarios["authz"] = self.bench_authz
+        scenarios["render_json"] = lambda: self.bench_render(JSONRenderer)
+        if renderers.orjson is not None:
+            scenarios["render_orjson"] = lambda: self.bench_render(renderers.ORJSONRenderer)
+        if renderers.msgpack is not None:
+            scenarios["render_msgpack"] = lambda: self.bench_render(
+                renderers.MessagePackRenderer
+            )
+        return scenarios
+
+    # ------------------------------------------------------------------
+    # Подготовка данных
+    # ------------------------------------------------------------------
+
+    def seed(self):
+        """Загружает фикстуры, создает пользователя для каждой роли и его объекты."""
+        load_fixtures()
+        self.users = {}
+        self.tokens = {}
+        for name, role_id in BENCH_USERS.items():
+            user = User.objects.create_user(
+                f"bench-{name}@example.com",
+                BENCH_PASSWORD,
+                first_name="Bench",
+                last_name=name,
+                role_id=role_id,
+            )
+            self.users[name] = user
+            self.tokens[name] = issue_access_token(user)
+        products = Product.objects.bulk_create(
+            Product(owner=user, name=f"Product {index}")
+            for user in self.users.values()
+            for index in range(BENCH_OBJECTS_PER_USER)
+        )
+        Order.objects.bulk_create(
+            Order(owner_id=product.owner_id, product=product) for product in products
+        )
+        self.client = Client()
+
+    # ------------------------------------------------------------------
+    # Сценарии
+    # ------------------------------------------------------------------
+
+    def bench_login(self):
+        """POST /api/login/ с верным паролем."""
+        body = {"email": "bench-user@example.com", "password": BENCH_PASSWORD}
+        return self.run(
+            lambda: self.client.post("/api/login/", body, content_type="application/json"),
+            self.options["slow_requests"],
+            expected_status=200,
+        )
+
+    def bench_register(self):
+        """POST /api/register/ с новым email на каждой итерации."""
+        def register():
+            body = {
+                "email": f"bench-{uuid.uuid4().hex}@example.com",
+                "password": BENCH_PASSWORD,
+                "first_name": "Bench",
+                "last_name": "Register",
+            }
+            return self.client.post("/api/register/", body, content_type="application/json")
+
+        return self.run(register, self.options["slow_requests"], expected_status=201)
+
+    def bench_refresh(self):
+        """POST /api/token/refresh/ цепочкой ротаций одного семейства."""
+        state = {"refresh": issue_refresh_token(self.users["user"])}
+
+        def refresh():
+            response = self.client.post(
+                "/api/token/refresh/",
+                {"refresh": state["refresh"]},
+                content_type="application/json",
+            )
+            # Ошибка (например 401 после переиспользования) – тело без refresh
+            if response.status_code != 200:
+                raise CommandError(
+                    f"Ожидался статус 200, получен {response.status_code}: "
+                    f"{response.content.decode(errors='replace')}"
+                )
+            state["refresh"] = response.json()["refresh"]
+            return response
+
+        return self.run(refresh, self.options["requests"], expected_status=200)
+
+    def bench_http(self, name):
+        """GET-запрос к эндпоинту из HTTP_SCENARIOS с токеном нужной роли."""
+        method, path, role, expected_status = HTTP_SCENARIOS[name]
+        request = getattr(self.client, method)
+        header = f"Bearer {self.tokens[role]}"
+        return self.run(
+            lambda: request(path, HTTP_AUTHORIZATION=header),
+            self.options["requests"],
+            expected_status=expected_status,
+        )
+
+    def bench_authenticate(self):
+        """JWTAuthentication.authenticate для запроса с готовым токеном."""
+        django_request = RequestFactory().get(
+            "/business/products/",
+            HTTP_AUTHORIZATION=f"Bearer {self.tokens['user']}",
+        )
+        authentication = JWTAuthentication()
+        request = Request(django_request)
+        return self.run(
+            lambda: authentication.authenticate(request),
+            self.options["requests"],
+        )
+
+    def bench_has_permission(self):
+        """AccessPermission.has_permission по правилу роли User для products."""
+        view = type("BenchView", (), {"required_permission": "read", "element_id": 2})()
+        request = Request(RequestFactory().get("/business/products/"))
+        request.user = self.users["user"]
+        permission = AccessPermission()
+        return self.run(
+            lambda: permission.has_permission(request, view),
+            self.options["requests"],
+        )
+
+    def bench_authz(self):
+        """Подзапрос auth_request к /authz/products/read/ через WSGI-обертку."""
+        application = AuthzWSGIMiddleware(None, "/authz/")
+        environ = {
+            "PATH_INFO": "/authz/products/read/",
+            "HTTP_AUTHORIZATION": f"Bearer {self.tokens['user']}",
+        }
+        expected = STATUS_LINES[200]
+
+        def start_response(status, headers):
+            if status != expected:
+                raise CommandError(f"Ожидался статус {expected}, получен {status}")
+
+        return self.run(
+            lambda: application(environ, start_response),
+            self.options["requests"],
+        )
+
+    def bench_render(self, renderer_class):
+        """Рендеринг страницы из BENCH_RENDER_ITEMS правил AccessRuleSerializer.
+
+        Данные сериализуются один раз заранее: сценарий измеряет только
+        рендерер, т.е. разницу между JSON (json/orjson) и MessagePack.
+        """
+        rules = list(AccessRule.objects.all())
+        data = AccessRuleSerializer(
+            [rules[index % len(rules)] for index in range(BENCH_RENDER_ITEMS)],
+            many=True,
+        ).data
+        renderer = renderer_class()
+        return self.run(
+            lambda: renderer.render(data, renderer.media_type),
+            self.options["requests"],
+        )
+
+    # ------------------------------------------------------------------
+    # Измерение и отчет
+    # ------------------------------------------------------------------
+
+    def run(self, operation, iterations, expected_status=None):
+        """Выполняет операцию и собирает статистику.
+
+        Args:
+            operation: Функция без аргументов (для HTTP возвращает ответ)
+            iterations: Число измеряемых итераций
+            expected_status: Ожидаемый HTTP-статус ответа
+
+        Returns:
+            dict: ops_per_sec, p50_ms, p99_ms, queries_per_op
+        """
+        for _ in range(min(self.options["warmup"], max(1, iterations // 10))):
+            operation()
+
+        counter = QueryCounter()
+        samples = []
+        with connection.execute_wrapper(counter):
+            for _ in range(iterations):
+                started = time.perf_counter()
+                result = operation()
+                samples.append(time.perf_counter() - started)
+                status_code = getattr(result, "status_code", None)
+                if expected_status is not None and status_code != expected_status:
+                    raise CommandError(
+                        f"Ожидался статус {expected_status}, получен {status_code}"
+                    )
+
+        samples.sort()
+        return {
+            "ops_per_sec": round(iterations / sum(samples), 1),
+            "p50_ms": round(statistics.median(samples) * 1000, 3),
+            "p99_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000, 3),
+            "queries_per_op": round(counter.count / iterations, 2),
+        }
+
+    def report(self, name, result):
+        """Печатает строку результатов сценария."""
+        self.stdout.write(
+            f"{name:<16} {result['ops_per_sec']:>10} ops/s "
+            f"p50={result['p50_ms']:.3f} мс p99={result['p99_ms']:.3f} мс "
+            f"queries/op={result['queries_per_op']}"
+        )
+
+    def compare(self, results, baseline_path, tolerance):
+        """Сравнивает результаты с baseline и завершается ошибкой при регрессии."""
+        with open(baseline_path, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+
+        regressions = []
+        for name, result in results.items():
+            previous = baseline.get(name)
+            if not previous:
+                continue
+            if result["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+                regressions.append(
+                    f"{name}: {result['ops_per_sec']} ops/s "
+                    f"(было {previous['ops_per_sec']})"
+                )
+            if result["queries_per_op"] > previous["queries_per_op"]:
+                regressions.append(
+                    f"{name}: {result['queries_per_op']} запросов/операцию "
+                    f"(было {previous['queries_per_op']})"
+                )
+
+        if regressions:
+            raise CommandError("Регрессия производительности:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Регрессий относительно baseline нет."))
@@ -0,0 +1,73 @@
+"""Команда bench_db: задержка запроса с постоянными соединениями и без них."""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connections
+
+from custom_auth.models import User
+
+
+class Command(BaseCommand):
+    """Сравнивает стоимость запроса при CONN_MAX_AGE=0 и с постоянным соединением.
+
+    Каждая итерация повторяет жизненный цикл запроса Django:
+    request_started -> запрос пользователя по id -> request_finished.
+    """
+
+    help = (
+        "Измеряет задержку типичного запроса аутентификации с открытием "
+        "нового соединения на каждый запрос и с постоянным соединением."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "-n", "--requests", type=int, default=500,
+            help="Число запросов для каждого режима.",
+        )
+        parser.add_argument(
+            "--database", default="default",
+            help="Алиас БД из settings.DATABASES.",
+        )
+
+    def handle(self, *args, **options):
+        """Выполняет замеры для обоих режимов и печатает результаты."""
+        connection = connections[options["database"]]
+        user_id = User.objects.using(options["database"]).values_list(
+            "id", flat=True
+        ).first() or 0
+        original = connection.settings_dict["CONN_MAX_AGE"]
+
+        try:
+            for label, max_age in (("без постоянных соединений", 0),
+                                   ("постоянное соединение", None)):
+                connection.close()
+                connection.settings_dict["CONN_MAX_AGE"] = max_age
+                samples = self.measure(options, user_id, options["requests"])
+                self.stdout.write(
+                    f"{label:<28} mean={statistics.mean(samples):.3f} мс "
+                    f"p50={statistics.median(samples):.3f} мс "
+                    f"p99={self.percentile(samples, 99):.3f} мс"
+                )
+        finally:
+            connection.close()
+            connection.settings_dict["CONN_MAX_AGE"] = original
+
+    def measure(self, options, user_id, count):
+        """Возвращает задержки (мс) count итераций жизненного цикла запроса."""
+        queryset = User.objects.using(options["database"])
+        samples = []
+        for _ in range(count):
+            started = time.perf_counter()
+            close_old_connections()
+            queryset.filter(id=user_id, is_active=True).first()
+            close_old_connections()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    @staticmethod
+    def percentile(samples, percent):
+        """Возвращает перцентиль по отсортированной выборке."""
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
@@ -0,0 +1,125 @@
+"""Команда bench_startup: время запуска воркера и накладные расходы запроса.
+
+Для каждой комбинации профиля (DJANGO_PROFILE=full/api) и прогрева
+(WARMUP_ENABLED) запускается несколько новых процессов Python. Каждый
+процесс измеряет:
+
+- import: загрузку project.wsgi (django.setup, приложения, прогрев);
+- first: первый запрос к WSGI-приложению после загрузки;
+- request: среднее время последующих запросов, т.е. стек middleware,
+  аутентификацию и представление на прогретом воркере.
+
+Запросы выполняются к GET /api/profile/ с токеном первого активного
+пользователя (или без токена, если пользователей нет) через настроенную БД.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from custom_auth.models import User
+from custom_auth.tokens import issue_access_token
+
+# Скрипт измерения в отдельном процессе: печатает одну строку JSON
+SCRIPT = """
+import io, json, os, sys, time
+started = time.perf_counter()
+from project.wsgi import application
+imported = time.perf_counter()
+from django.conf import settings
+host = next(
+    (h for h in settings.ALLOWED_HOSTS if h and h != "*" and not h.startswith(".")),
+    "localhost",
+)
+environ = {
+    "REQUEST_METHOD": "GET", "PATH_INFO": "/api/profile/", "QUERY_STRING": "",
+    "SERVER_NAME": host, "SERVER_PORT": "80", "HTTP_HOST": host,
+    "SERVER_PROTOCOL": "HTTP/1.1", "REMOTE_ADDR": "127.0.0.1",
+    "wsgi.url_scheme": "http", "wsgi.errors": sys.stderr,
+}
+if os.environ.get("BENCH_TOKEN"):
+    environ["HTTP_AUTHORIZATION"] = "Bearer " + os.environ["BENCH_TOKEN"]
+statuses = []
+def request():
+    response = application(dict(environ, **{"wsgi.input": io.BytesIO()}),
+                           lambda status, headers: statuses.append(status))
+    b"".join(response)
+    getattr(response, "close", lambda: None)()
+request()
+first = time.perf_counter()
+count = int(os.environ["BENCH_REQUESTS"])
+for _ in range(count):
+    request()
+finished = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "first_ms": (first - imported) * 1000,
+    "request_ms": (finished - first) * 1000 / count,
+    "status": statuses[0],
+}))
+"""
+
+
+class Command(BaseCommand):
+    """Сравнивает время запуска и запроса для профилей full и api."""
+
+    help = (
+        "Измеряет время импорта WSGI-приложения, первого запроса и среднего "
+        "запроса в новых процессах для DJANGO_PROFILE=full/api с прогревом "
+        "и без него."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--runs", type=int, default=5,
+            help="Число процессов для каждой комбинации.",
+        )
+        parser.add_argument(
+            "-n", "--requests", type=int, default=200,
+            help="Число запросов в каждом процессе после первого.",
+        )
+
+    def handle(self, *args, **options):
+        """Запускает процессы и печатает медианы по каждой комбинации."""
+        user = User.objects.filter(is_active=True).first()
+        env = dict(
+            os.environ,
+            BENCH_REQUESTS=str(options["requests"]),
+            BENCH_TOKEN=issue_access_token(user) if user else "",
+        )
+        env.setdefault("DJANGO_SETTINGS_MODULE", "project.settings")
+
+        for profile in ("full", "api"):
+            for warmup in ("False", "True"):
+                runs = [
+                    self.measure(dict(env, DJANGO_PROFILE=profile, WARMUP_ENABLED=warmup))
+                    for _ in range(options["runs"])
+                ]
+                self.stdout.write(
+                    f"profile={profile:<4} warmup={warmup:<5} "
+                    f"import={self.median(runs, 'import_ms'):.1f} мс "
+                    f"first={self.median(runs, 'first_ms'):.2f} мс "
+                    f"request={self.median(runs, 'request_ms'):.3f} мс "
+                    f"status={runs[0]['status']}"
+                )
+
+    def measure(self, env):
+        """Запускает один процесс измерения и возвращает его результаты."""
+        result = subprocess.run(
+            [sys.executable, "-c", SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+            check=False,
+        )
+        if result.returncode != 0:
+            raise CommandError(result.stderr.strip().splitlines()[-1])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    @staticmethod
+    def median(runs, key):
+        """Возвращает медиану показателя по процессам."""
+        return statistics.median(run[key] for run in runs)
@@ -0,0 +1,110 @@
+"""Команда check_query_plans: проверка планов горячих запросов через EXPLAIN.
+
+Для каждого запроса аутентификации и авторизации выполняется EXPLAIN на
+настроенной БД и проверяется, что таблица читается не полным
+сканированием, а ожидаемым индексом (для PostgreSQL – с типом узла, например
+Index Only Scan для покрывающего индекса правил). На маленьких таблицах
+PostgreSQL выбирает Seq Scan или Bitmap Heap Scan даже при наличии индекса,
+поэтому на время проверки они отключаются (SET LOCAL enable_seqscan = off,
+enable_bitmapscan = off): так проверяется, что подходящий индекс
+существует и применим к запросу.
+
+Команда завершается с ошибкой, если хотя бы один план без индекса, и
+подходит для CI после migrate.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from custom_auth.access_matrix import PERMISSION_FIELDS
+from custom_auth.models import AccessRule, User
+
+# Запросы: имя -> (функция, возвращающая QuerySet, {СУБД: ожидаемая строка плана})
+CHECKS = {
+    # LoginView: поиск по email без учета регистра
+    "login": (
+        lambda: User.objects.for_email("Someone@Example.com"),
+        {
+            "postgresql": "Index Scan using user_email_lower_uniq",
+            "sqlite": "USING INDEX user_email_lower_uniq",
+        },
+    ),
+    # JWTAuthentication: активный пользователь по id из токена
+    "authenticate": (
+        lambda: User.objects.filter(id=1, is_active=True),
+        {
+            "postgresql": "Index Scan using custom_auth_user_pkey",
+            "sqlite": "USING INTEGER PRIMARY KEY",
+        },
+    ),
+    # /business/users/: страница активных пользователей по id
+    "active_users_page": (
+        lambda: User.objects.filter(is_active=True, id__gt=0).order_by("id")[:100],
+        {
+            "postgresql": "Index Scan using custom_auth_user_pkey",
+            "sqlite": "USING INTEGER PRIMARY KEY",
+        },
+    ),
+    # Права роли на элемент: в PostgreSQL без обращения к таблице. SQLite
+    # не поддерживает INCLUDE и читает таблицу после поиска по индексу
+    "access_rule": (
+        lambda: AccessRule.objects.filter(role_id=1, element_id=1).values(*PERMISSION_FIELDS),
+        {
+            "postgresql": "Index Only Scan using accessrule_role_element_uniq",
+            "sqlite": "(role_id=? AND element_id=?)",
+        },
+    ),
+}
+
+
+def uses_index(vendor, plan):
+    """Проверяет, что план читает таблицы только по индексам.
+
+    Args:
+        vendor: connection.vendor ('postgresql' или 'sqlite')
+        plan: Текст EXPLAIN
+
+    Returns:
+        bool: True, если в плане нет полного сканирования таблицы
+    """
+    if vendor == "postgresql":
+        return "Seq Scan" not in plan
+    for line in plan.splitlines():
+        # SQLite: SEARCH – поиск по индексу, SCAN без USING – полный проход
+        if "SCAN " in line and "USING" not in line:
+            return False
+    return True
+
+
+class Command(BaseCommand):
+    """Проверяет через EXPLAIN, что горячие запросы используют индексы."""
+
+    help = (
+        "Выполняет EXPLAIN для запросов входа, аутентификации, страниц "
+        "пользователей и правил доступа и завершается с ошибкой, если план "
+        "содержит полное сканирование таблицы или не использует ожидаемый индекс."
+    )
+
+    def handle(self, *args, **options):
+        """Проверяет планы всех запросов из CHECKS."""
+        vendor = connection.vendor
+        if vendor not in ("postgresql", "sqlite"):
+            raise CommandError(f"СУБД {vendor} не поддерживается.")
+
+        failed = []
+        with transaction.atomic():
+            if vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                    cursor.execute("SET LOCAL enable_bitmapscan = off")
+            for name, (make_queryset, expected) in CHECKS.items():
+                plan = make_queryset().explain()
+                ok = uses_index(vendor, plan) and expected[vendor] in plan
+                self.stdout.write(f"{name}: {'OK' if ok else 'FAIL'}")
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+                if not ok:
+                    failed.append(name)
+
+        if failed:
+            raise CommandError(f"Запросы без ожидаемого индекса: {', '.join(failed)}")
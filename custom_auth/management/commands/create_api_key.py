@@ -0,0 +1,75 @@
+"""Команда create_api_key: выпуск и отзыв ключей API сервисных аккаунтов."""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from custom_auth.access_matrix import ACTIONS
+from custom_auth.api_keys import VIEW_SCOPES, generate_key
+from custom_auth.models import APIKey, BusinessElement, User
+
+
+class Command(BaseCommand):
+    """Выпускает ключ API для пользователя или отзывает существующий."""
+
+    help = (
+        "Выпускает ключ API для пользователя (ключ выводится один раз) "
+        "или отзывает ключ по префиксу (--revoke)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("email", nargs="?", help="Email владельца ключа.")
+        parser.add_argument("--name", default="", help="Название ключа.")
+        parser.add_argument(
+            "--scope", action="append", default=[], dest="scopes",
+            help="Ограничение ключа «элемент:действие» (например products:read, "
+                 "orders:* или rules:*); можно указать несколько раз.",
+        )
+        parser.add_argument(
+            "--expires-days", type=int,
+            help="Срок действия ключа в днях (по умолчанию бессрочный).",
+        )
+        parser.add_argument("--revoke", metavar="PREFIX", help="Отозвать ключ по префиксу.")
+
+    def handle(self, *args, **options):
+        """Выпускает или отзывает ключ."""
+        if options["revoke"]:
+            revoked = APIKey.objects.filter(
+                prefix=options["revoke"], revoked_at__isnull=True
+            ).update(revoked_at=timezone.now())
+            if not revoked:
+                raise CommandError(f"Действующий ключ {options['revoke']} не найден.")
+            self.stdout.write(f"Ключ {options['revoke']} отозван.")
+            return
+
+        if not options["email"]:
+            raise CommandError("Укажите email владельца ключа.")
+        try:
+            user = User.objects.for_email(options["email"]).get(is_active=True)
+        except User.DoesNotExist as e:
+            raise CommandError("Пользователь не найден или неактивен.") from e
+
+        scopes = [scope.lower() for scope in options["scopes"]]
+        elements = {name.lower() for name in BusinessElement.objects.values_list("name", flat=True)}
+        elements.update(VIEW_SCOPES)
+        for scope in scopes:
+            element, _, action = scope.partition(":")
+            if element not in elements or action not in (*ACTIONS, "*"):
+                raise CommandError(f"Неверное ограничение {scope}.")
+
+        raw_key, prefix, secret_hash = generate_key()
+        expires_at = None
+        if options["expires_days"]:
+            expires_at = timezone.now() + timedelta(days=options["expires_days"])
+        APIKey.objects.create(
+            user=user,
+            name=options["name"] or prefix,
+            prefix=prefix,
+            secret_hash=secret_hash,
+            scopes=scopes,
+            expires_at=expires_at,
+        )
+        self.stdout.write(
+            "Ключ создан. Сохраните его – повторно он не показывается:\n" + raw_key
+        )
@@ -0,0 +1,78 @@
+"""Команда generate_jwt_key: создание и вывод из ротации ключей подписи JWT."""
+
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from custom_auth.signing_keys import PRIVATE_SUFFIX, PUBLIC_SUFFIX
+
+
+class Command(BaseCommand):
+    """Создает новый ключ в JWT_KEYS_DIR или выводит старый из ротации."""
+
+    help = (
+        "Создает закрытый ключ <kid>.pem для JWT_ALGORITHM в JWT_KEYS_DIR "
+        "или (--retire) оставляет от ключа только открытую часть <kid>.pub.pem."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kid", help="Идентификатор ключа (kid).")
+        parser.add_argument(
+            "--retire", action="store_true",
+            help="Удалить закрытый ключ, сохранив открытый для проверки старых токенов.",
+        )
+        parser.add_argument(
+            "--algorithm", default=settings.JWT_ALGORITHM,
+            help="RS256 или EdDSA (по умолчанию JWT_ALGORITHM).",
+        )
+
+    def handle(self, *args, **options):
+        """Создает или выводит из ротации ключ."""
+        from cryptography.hazmat.primitives import serialization
+        from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+        if not settings.JWT_KEYS_DIR:
+            raise CommandError("Не задан JWT_KEYS_DIR.")
+        directory = Path(settings.JWT_KEYS_DIR)
+        directory.mkdir(parents=True, exist_ok=True)
+        kid = options["kid"]
+        private_path = directory / f"{kid}{PRIVATE_SUFFIX}"
+        public_path = directory / f"{kid}{PUBLIC_SUFFIX}"
+
+        if options["retire"]:
+            if not private_path.exists():
+                raise CommandError(f"Ключ {private_path} не найден.")
+            private_key = serialization.load_pem_private_key(
+                private_path.read_bytes(), password=None
+            )
+            public_path.write_bytes(private_key.public_key().public_bytes(
+                serialization.Encoding.PEM,
+                serialization.PublicFormat.SubjectPublicKeyInfo,
+            ))
+            private_path.unlink()
+            self.stdout.write(
+                f"Ключ {kid} выведен из ротации: удалите {public_path} после "
+                f"истечения выданных им токенов."
+            )
+            return
+
+        if private_path.exists() or public_path.exists():
+            raise CommandError(f"Ключ с kid={kid} уже существует.")
+        if options["algorithm"] == "RS256":
+            private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        elif options["algorithm"] == "EdDSA":
+            private_key = ed25519.Ed25519PrivateKey.generate()
+        else:
+            raise CommandError("Поддерживаются только RS256 и EdDSA.")
+
+        private_path.write_bytes(private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        ))
+        private_path.chmod(0o600)
+        self.stdout.write(
+            f"Создан ключ {private_path}. Он уже публикуется в JWKS; сделайте его "
+            f"активным (JWT_ACTIVE_KID={kid}) после обновления кэша JWKS у клиентов."
+        )
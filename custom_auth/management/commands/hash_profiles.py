@@ -0,0 +1,35 @@
+"""Команда hash_profiles: распределение пользователей по профилям хешей."""
+
+from collections import Counter
+
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+from custom_auth.hashers import describe
+from custom_auth.hashing import needs_rehash
+from custom_auth.models import User
+
+
+class Command(BaseCommand):
+    """Показывает, сколько пользователей хешировано по каждому профилю."""
+
+    help = (
+        "Показывает число пользователей для каждого профиля хеширования "
+        "паролей и сколько из них будут пересчитаны при следующем входе."
+    )
+
+    def handle(self, *args, **options):
+        """Подсчитывает профили хешей по всем пользователям."""
+        profiles = Counter()
+        outdated = 0
+        for encoded in User.objects.values_list("password", flat=True).iterator():
+            profiles[describe(encoded)] += 1
+            if needs_rehash(encoded):
+                outdated += 1
+
+        preferred = get_hasher("default")
+        cost = getattr(preferred, "iterations", None) or getattr(preferred, "rounds", "")
+        self.stdout.write(f"Текущий профиль: {preferred.algorithm}:{cost}")
+        for profile, count in profiles.most_common():
+            self.stdout.write(f"{profile:<32} {count}")
+        self.stdout.write(f"Требуют пересчета при входе: {outdated}")
@@ -0,0 +1,324 @@
+"""Команда import_users: массовый импорт пользователей из CSV или JSONL.
+
+Файл читается потоково, пароли хешируются параллельно в пуле процессов
+(по одному на ядро), роли загружаются один раз, а пользователи
+записываются пачками через bulk_create – по одной транзакции на пачку.
+
+Колонки (поля JSONL): email, first_name, last_name, middle_name, role
+(имя роли, по умолчанию --role), password (пароль в открытом виде) или
+password_hash (готовый хеш Django, например при переносе из другой системы).
+
+После каждой пачки номер последней обработанной строки записывается в
+файл контрольной точки; повторный запуск продолжает с нее. Строки с
+ошибками (некорректный email, неизвестная роль, email уже занят)
+пропускаются и записываются в файл ошибок в формате JSONL. Если email
+заняли между проверкой и вставкой, пачка записывается заново по одной
+строке, и в отчет попадают только конфликтующие строки.
+
+Пример:
+
+    python manage.py import_users users.csv --role User --batch-size 2000
+"""
+
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import django
+from django.contrib.auth.hashers import identify_hasher, make_password
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from custom_auth.models import Role, User
+from custom_auth.response_cache import bump_data_version
+
+# Максимальная длина полей имени (см. модель User)
+NAME_FIELDS = ("first_name", "last_name", "middle_name")
+NAME_MAX_LENGTH = 30
+
+
+def _init_worker():
+    """Настраивает Django в дочернем процессе пула (для start method spawn)."""
+    django.setup()
+
+
+def read_rows(path, file_format):
+    """Читает строки файла по одной.
+
+    Args:
+        path: Путь к файлу
+        file_format: 'csv' или 'jsonl'
+
+    Yields:
+        tuple: (номер строки данных с 1, словарь полей или текст ошибки)
+    """
+    with open(path, encoding="utf-8", newline="") as fh:
+        if file_format == "csv":
+            for number, row in enumerate(csv.DictReader(fh), start=1):
+                yield number, row
+            return
+        for number, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                yield number, f"Некорректный JSON: {e}"
+                continue
+            if not isinstance(row, dict):
+                yield number, "Ожидался JSON-объект."
+                continue
+            yield number, row
+
+
+class Command(BaseCommand):
+    """Импортирует пользователей пачками с параллельным хешированием паролей."""
+
+    help = (
+        "Импортирует пользователей из CSV или JSONL: параллельное хеширование "
+        "паролей, bulk_create пачками, контрольные точки и отчет об ошибках."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV- или JSONL-файл с пользователями.")
+        parser.add_argument(
+            "--format", choices=("csv", "jsonl"),
+            help="Формат файла (по умолчанию – по расширению).",
+        )
+        parser.add_argument(
+            "--role", default="User",
+            help="Роль для строк без колонки role (по умолчанию User).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=1000,
+            help="Число пользователей в одной пачке (транзакции).",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=os.cpu_count() or 1,
+            help="Число процессов для хеширования паролей.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="Файл контрольной точки (по умолчанию <path>.checkpoint).",
+        )
+        parser.add_argument(
+            "--errors",
+            help="Файл отчета об ошибках (по умолчанию <path>.errors.jsonl).",
+        )
+        parser.add_argument(
+            "--no-resume", action="store_true",
+            help="Игнорировать контрольную точку и начать с первой строки.",
+        )
+
+    def handle(self, *args, **options):
+        """Импортирует файл пачками."""
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Файл {path} не найден.")
+        file_format = options["format"] or (
+            "jsonl" if path.suffix in (".jsonl", ".ndjson") else "csv"
+        )
+        checkpoint = Path(options["checkpoint"] or f"{path}.checkpoint")
+        errors_path = Path(options["errors"] or f"{path}.errors.jsonl")
+
+        # Роли загружаются один раз на весь импорт
+        self.roles = dict(Role.objects.values_list("name", "id"))
+        if options["role"] not in self.roles:
+            raise CommandError(f"Роль {options['role']} не найдена.")
+        self.default_role = options["role"]
+        self.workers = options["workers"]
+
+        start_after = 0
+        if checkpoint.exists() and not options["no_resume"]:
+            start_after = int(checkpoint.read_text() or 0)
+            self.stdout.write(f"Продолжение после строки {start_after}.")
+
+        self.imported = self.failed = 0
+        self.started = time.monotonic()
+        batch = []
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker
+        ) as executor, open(errors_path, "a", encoding="utf-8") as errors:
+            self.executor = executor
+            self.errors = errors
+            last = start_after
+            for number, row in read_rows(path, file_format):
+                if number <= start_after:
+                    continue
+                last = number
+                if isinstance(row, str):
+                    self.report_error(number, None, [row])
+                    continue
+                batch.append((number, row))
+                if len(batch) >= options["batch_size"]:
+                    self.write_batch(batch)
+                    self.save_checkpoint(checkpoint, last)
+                    batch = []
+            if batch:
+                self.write_batch(batch)
+            self.save_checkpoint(checkpoint, last)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Импортировано: {self.imported}, ошибок: {self.failed}, "
+            f"{self.rate():.0f} строк/с."
+        ))
+        if self.failed:
+            self.stdout.write(f"Ошибки записаны в {errors_path}.")
+
+    def write_batch(self, batch):
+        """Проверяет, хеширует и записывает пачку строк.
+
+        Args:
+            batch: Список (номер строки, словарь полей)
+        """
+        valid = []
+        for number, row in batch:
+            user, errors = self.build_user(row)
+            if errors:
+                self.report_error(number, row.get("email"), errors)
+            else:
+                valid.append((number, user, row))
+
+        # Email, занятые в БД или повторяющиеся в пачке (без учета
+        # регистра, как в индексе user_email_lower_uniq), – одним запросом
+        taken = self.taken_emails([user.email.lower() for _, user, _ in valid])
+        numbers = []
+        users = []
+        raw_passwords = []
+        for number, user, row in valid:
+            if user.email.lower() in taken:
+                self.report_error(number, user.email, ["Email уже занят."])
+                continue
+            taken.add(user.email.lower())
+            numbers.append(number)
+            users.append(user)
+            raw_passwords.append(row.get("password") if not user.password else None)
+
+        # Хеширование паролей параллельно во всех процессах пула
+        to_hash = [index for index, raw in enumerate(raw_passwords) if raw]
+        chunksize = max(1, len(to_hash) // (self.workers * 4))
+        hashes = self.executor.map(
+            make_password, [raw_passwords[index] for index in to_hash], chunksize=chunksize
+        )
+        for index, encoded in zip(to_hash, hashes):
+            users[index].password = encoded
+        for user in users:
+            if not user.password:
+                user.password = make_password(None)
+
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create(users)
+            created = len(users)
+        except IntegrityError:
+            # Email заняли после проверки: пачка откачена целиком
+            created = self.write_one_by_one(numbers, users)
+        # bulk_create не отправляет post_save: сбрасываем кэш списков сами
+        bump_data_version(User)
+        self.imported += created
+        self.stdout.write(
+            f"строк: {batch[-1][0]}, импортировано: {self.imported}, "
+            f"ошибок: {self.failed}, {self.rate():.0f} строк/с"
+        )
+
+    def taken_emails(self, emails):
+        """Возвращает email из списка, уже занятые в БД.
+
+        Args:
+            emails: Email в нижнем регистре
+
+        Returns:
+            set: Занятые email в нижнем регистре
+        """
+        return set(
+            User.objects.annotate(email_lower=Lower("email")).filter(
+                email_lower__in=emails
+            ).values_list("email_lower", flat=True)
+        )
+
+    def write_one_by_one(self, numbers, users):
+        """Записывает пачку по одной строке, пропуская конфликтующие.
+
+        Args:
+            numbers: Номера строк файла
+            users: Несохраненные пользователи в том же порядке
+
+        Returns:
+            int: Сколько пользователей записано
+        """
+        created = 0
+        for number, user in zip(numbers, users):
+            # id, выданные откаченной вставкой, недействительны
+            user.pk = None
+            try:
+                with transaction.atomic():
+                    user.save(force_insert=True)
+            except IntegrityError:
+                self.report_error(number, user.email, ["Email уже занят."])
+                continue
+            created += 1
+        return created
+
+    def build_user(self, row):
+        """Собирает несохраненного пользователя из строки файла.
+
+        Args:
+            row: Словарь полей
+
+        Returns:
+            tuple: (User, список ошибок)
+        """
+        errors = []
+        email = User.objects.normalize_email((row.get("email") or "").strip())
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors.append("Некорректный email.")
+
+        names = {}
+        for field in NAME_FIELDS:
+            value = (row.get(field) or "").strip()
+            if field != "middle_name" and not value:
+                errors.append(f"Не заполнено поле {field}.")
+            if len(value) > NAME_MAX_LENGTH:
+                errors.append(f"Поле {field} длиннее {NAME_MAX_LENGTH} символов.")
+            names[field] = (value or None) if field == "middle_name" else value
+
+        role_name = row.get("role") or self.default_role
+        role_id = self.roles.get(role_name)
+        if role_id is None:
+            errors.append(f"Роль {role_name} не найдена.")
+
+        password_hash = row.get("password_hash") or ""
+        if password_hash:
+            try:
+                identify_hasher(password_hash)
+            except ValueError:
+                errors.append("Неизвестный формат password_hash.")
+
+        return User(email=email, role_id=role_id, password=password_hash, **names), errors
+
+    def report_error(self, number, email, errors):
+        """Записывает ошибку строки в файл отчета."""
+        self.failed += 1
+        self.errors.write(
+            json.dumps({"line": number, "email": email, "errors": errors}, ensure_ascii=False)
+            + "\n"
+        )
+
+    def save_checkpoint(self, checkpoint, number):
+        """Атомарно записывает номер последней обработанной строки."""
+        temporary = checkpoint.with_name(checkpoint.name + ".tmp")
+        temporary.write_text(str(number))
+        temporary.replace(checkpoint)
+
+    def rate(self):
+        """Возвращает скорость импорта, строк в секунду."""
+        elapsed = time.monotonic() - self.started
+        return (self.imported + self.failed) / elapsed if elapsed else 0.0
@@ -0,0 +1,68 @@
+"""Команда init_db: одноразовая инициализация БД перед запуском сервера."""
+
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.recorder import MigrationRecorder
+
+from custom_auth.seed import load_fixtures
+
+# Приложения, миграции которых появились после первых установок: раньше
+# их таблицы создавались через migrate --run-syncdb
+SYNCDB_APPS = ("custom_auth", "business")
+
+
+class Command(BaseCommand):
+    """Применяет миграции и загружает недостающие фикстуры."""
+
+    help = (
+        "Применяет миграции и загружает фикстуры из project/fixtures, "
+        "пропуская уже загруженные строки."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--skip-migrate",
+            action="store_true",
+            help="Не применять миграции, только загрузить фикстуры.",
+        )
+
+    def handle(self, *args, **options):
+        """Выполняет миграции и загрузку фикстур."""
+        if not options["skip_migrate"]:
+            self.adopt_syncdb_schema()
+            call_command(
+                "migrate",
+                interactive=False,
+                verbosity=options["verbosity"],
+            )
+
+        for filename, (total, added) in load_fixtures().items():
+            if added:
+                self.stdout.write(f"{filename}: добавлено {added} из {total}")
+            else:
+                self.stdout.write(f"{filename}: уже загружено, пропущено")
+
+    def adopt_syncdb_schema(self):
+        """Отмечает 0001_initial примененной для таблиц, созданных через run_syncdb.
+
+        В такой БД уже записаны миграции admin и auth, зависящие от
+        custom_auth.0001_initial, поэтому migrate (и --fake-initial)
+        отказывается работать. Если все таблицы приложения уже есть,
+        начальная миграция записывается как примененная, а следующие
+        миграции (индексы) применяются обычным образом.
+        """
+        recorder = MigrationRecorder(connection)
+        applied = recorder.applied_migrations() if recorder.has_table() else {}
+        tables = set(connection.introspection.table_names())
+        for app_label in SYNCDB_APPS:
+            if (app_label, "0001_initial") in applied:
+                continue
+            models = apps.get_app_config(app_label).get_models()
+            if all(model._meta.db_table in tables for model in models):
+                recorder.record_applied(app_label, "0001_initial")
+                self.stdout.write(
+                    f"{app_label}: таблицы созданы без миграций, "
+                    "0001_initial отмечена примененной"
+                )
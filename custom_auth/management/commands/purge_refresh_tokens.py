@@ -0,0 +1,21 @@
+"""Команда purge_refresh_tokens: удаление истекших refresh-токенов."""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from custom_auth.models import RefreshToken
+
+
+class Command(BaseCommand):
+    """Удаляет refresh-токены с истекшим сроком действия."""
+
+    help = (
+        "Удаляет истекшие refresh-токены. Использованные и отозванные, но еще "
+        "не истекшие токены остаются: по ним обнаруживается повторное "
+        "использование."
+    )
+
+    def handle(self, *args, **options):
+        """Удаляет токены с expires_at в прошлом."""
+        deleted, _ = RefreshToken.objects.filter(expires_at__lt=timezone.now()).delete()
+        self.stdout.write(f"Удалено refresh-токенов: {deleted}")
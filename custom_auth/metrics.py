@@ -0,0 +1,184 @@
+"""Метрики запросов: число SQL-запросов, время БД, аутентификации и проверки прав.
+
+Включается настройкой REQUEST_METRICS_ENABLED. При выключенной настройке
+middleware не подключается, а декоратор instrument возвращает исходную
+функцию, поэтому накладных расходов нет.
+
+Метрики накапливаются в памяти каждого процесса; Prometheus должен
+опрашивать каждый воркер (или использовать один воркер на контейнер).
+"""
+
+import threading
+import time
+from collections import defaultdict
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+ENABLED = settings.REQUEST_METRICS_ENABLED
+
+# Границы корзин гистограммы задержек, секунды
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+def instrument(phase):
+    """Декоратор, добавляющий время выполнения метода к фазе запроса.
+
+    Метод должен принимать request первым аргументом после self.
+    Поддерживаются и синхронные, и асинхронные (async def) методы.
+    При выключенных метриках возвращает метод без изменений.
+
+    Args:
+        phase: Имя фазы: 'auth' (JWTAuthentication), 'perm' (AccessPermission)
+    """
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        if iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(self, request, *args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await func(self, request, *args, **kwargs)
+                finally:
+                    _add_timing(request, phase, started)
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(self, request, *args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(self, request, *args, **kwargs)
+            finally:
+                _add_timing(request, phase, started)
+
+        return wrapper
+
+    return decorator
+
+
+def _add_timing(request, phase, started):
+    """Добавляет время с момента started к фазе запроса."""
+    timings = getattr(request, "timings", None)
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - started
+
+
+class EndpointStats:
+    """Накопленные показатели одного эндпоинта."""
+
+    __slots__ = ("count", "duration", "db", "queries", "phases", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.db = 0.0
+        self.queries = 0
+        self.phases = defaultdict(float)
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+
+
+class MetricsRegistry:
+    """Потокобезопасное хранилище метрик процесса."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(EndpointStats)
+
+    def observe(self, labels, duration, db, queries, phases):
+        """Учитывает один завершенный запрос.
+
+        Args:
+            labels: (endpoint, method, status)
+            duration: Полное время обработки, секунды
+            db: Время в БД, секунды
+            queries: Число SQL-запросов
+            phases: Словарь фаза -> время, секунды
+        """
+        with self._lock:
+            stats = self._endpoints[labels]
+            stats.count += 1
+            stats.duration += duration
+            stats.db += db
+            stats.queries += queries
+            for phase, seconds in phases.items():
+                stats.phases[phase] += seconds
+            for index, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    stats.buckets[index] += 1
+
+    def render(self):
+        """Возвращает метрики в текстовом формате Prometheus."""
+        families = {
+            "http_requests_total": ("counter", []),
+            "http_request_duration_seconds": ("histogram", []),
+            "http_request_db_queries_total": ("counter", []),
+            "http_request_db_seconds_total": ("counter", []),
+            "http_request_phase_seconds_total": ("counter", []),
+        }
+
+        def add(family, suffix, labels, value):
+            families[family][1].append(f"{family}{suffix}{{{labels}}} {value}")
+
+        with self._lock:
+            for (endpoint, method, status), stats in sorted(self._endpoints.items()):
+                labels = f'endpoint="{endpoint}",method="{method}",status="{status}"'
+                add("http_requests_total", "", labels, stats.count)
+                histogram = "http_request_duration_seconds"
+                for bound, count in zip(LATENCY_BUCKETS, stats.buckets):
+                    add(histogram, "_bucket", f'{labels},le="{bound}"', count)
+                add(histogram, "_bucket", f'{labels},le="+Inf"', stats.count)
+                add(histogram, "_sum", labels, stats.duration)
+                add(histogram, "_count", labels, stats.count)
+                add("http_request_db_queries_total", "", labels, stats.queries)
+                add("http_request_db_seconds_total", "", labels, stats.db)
+                for phase, seconds in sorted(stats.phases.items()):
+                    add(
+                        "http_request_phase_seconds_total", "",
+                        f'{labels},phase="{phase}"', seconds,
+                    )
+
+        lines = []
+        for family, (kind, samples) in families.items():
+            lines.append(f"# TYPE {family} {kind}")
+            lines.extend(samples)
+        lines.extend(_component_lines())
+        return "\n".join(lines) + "\n"
+
+
+def _component_lines():
+    """Возвращает метрики компонентов: пул хеширования, кэши, лимит входов."""
+    from custom_auth.hashing import pool
+    from custom_auth.login_throttle import login_throttle
+    from custom_auth.response_cache import response_cache_stats
+    from custom_auth.tokens import decoded_token_cache
+
+    lines = []
+    for name, value in pool.stats().items():
+        lines.append(f"password_hash_pool_{name} {value}")
+    for name, value in decoded_token_cache.stats().items():
+        lines.append(f"jwt_decode_cache_{name} {value}")
+    for name, value in login_throttle.stats().items():
+        lines.append(f"login_throttle_{name} {value}")
+    for name, value in response_cache_stats.stats().items():
+        lines.append(f"response_cache_{name} {value}")
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+def metrics_view(request):
+    """Отдает метрики процесса в формате Prometheus.
+
+    Доступно только с адресов из METRICS_ALLOWED_IPS.
+    """
+    if request.META.get("REMOTE_ADDR") not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponseForbidden()
+    return HttpResponse(
+        registry.render(), content_type="text/plain; version=0.0.4"
+    )
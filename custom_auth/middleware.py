@@ -0,0 +1,100 @@
+"""Middleware приложения custom_auth."""
+
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+
+from .metrics import registry
+
+
+class RequestMetricsMiddleware:
+    """Измеряет запрос: SQL-запросы, время БД, фазы и полное время.
+
+    Результаты попадают в реестр метрик (см. custom_auth.metrics) и в
+    заголовок ответа Server-Timing. Подключается первым в MIDDLEWARE
+    при REQUEST_METRICS_ENABLED=True.
+
+    Работает и под WSGI, и под ASGI: при асинхронной цепочке middleware
+    запрос обрабатывается в __acall__ без переключения в поток.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        """Обрабатывает запрос, собирая показатели."""
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        request.timings = {}
+        db = {"queries": 0, "seconds": 0.0}
+        with self.count_queries(db):
+            response = self.get_response(request)
+        return self.finish(request, response, started, db)
+
+    async def __acall__(self, request):
+        """Асинхронный вариант __call__."""
+        started = time.perf_counter()
+        request.timings = {}
+        db = {"queries": 0, "seconds": 0.0}
+        # Асинхронный ORM выполняет запросы в потоке sync_to_async со своими
+        # соединениями, поэтому счетчик подключается и снимается в том же потоке
+        stack = await sync_to_async(self.count_queries)(db)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, started, db)
+
+    @staticmethod
+    def count_queries(db):
+        """Подключает к соединениям БД счетчик запросов и их времени.
+
+        Args:
+            db: Словарь {"queries": int, "seconds": float}, который пополняется
+
+        Returns:
+            ExitStack: Контекст, на время которого действует счетчик
+        """
+        def db_wrapper(execute, sql, params, many, context):
+            query_started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                db["queries"] += 1
+                db["seconds"] += time.perf_counter() - query_started
+
+        stack = ExitStack()
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(db_wrapper))
+        return stack
+
+    def finish(self, request, response, started, db):
+        """Записывает показатели в реестр и заголовок Server-Timing."""
+        duration = time.perf_counter() - started
+        match = request.resolver_match
+        endpoint = match.route if match else "unmatched"
+        registry.observe(
+            (endpoint, request.method, response.status_code),
+            duration,
+            db["seconds"],
+            db["queries"],
+            request.timings,
+        )
+
+        parts = [f'db;dur={db["seconds"] * 1000:.2f};desc="{db["queries"]} queries"']
+        parts.extend(
+            f"{phase};dur={seconds * 1000:.2f}"
+            for phase, seconds in request.timings.items()
+        )
+        parts.append(f"total;dur={duration * 1000:.2f}")
+        response["Server-Timing"] = ", ".join(parts)
+        return response
@@ -0,0 +1,32 @@
+# Generated by Django 4.2 on 2026-10-18 07:56
+
+import custom_auth.constraints
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('custom_auth', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='accessrule',
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='email',
+            field=models.EmailField(max_length=254),
+        ),
+        migrations.AddConstraint(
+            model_name='accessrule',
+            constraint=custom_auth.constraints.CoveringUniqueConstraint(fields=('role', 'element'), include=('read_permission', 'read_all_permission', 'create_permission', 'update_permission', 'update_all_permission', 'delete_permission', 'delete_all_permission'), name='accessrule_role_element_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_lower_uniq'),
+        ),
+    ]
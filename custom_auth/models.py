@@ -3,6 +3,9 @@
 from django.contrib.auth.hashers import check_password, make_password
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
+from django.db.models.functions import Lower
+
+from .constraints import CoveringUniqueConstraint
 
 
 class UserManager(BaseUserManager):
@@ -61,6 +64,24 @@ class UserManager(BaseUserManager):
 
         return self.create_user(email, password, **extra_fields)
 
+    def for_email(self, email):
+        """Возвращает выборку пользователей по email без учета регистра.
+
+        Условие lower(email) = lower(<email>) использует функциональный
+        уникальный индекс user_email_lower_uniq.
+
+        Args:
+            email: Email в любом регистре
+
+        Returns:
+            QuerySet: Не больше одного пользователя
+        """
+        return self.alias(email_lower=Lower("email")).filter(email_lower=email.lower())
+
+    def get_by_natural_key(self, username):
+        """Находит пользователя по email без учета регистра (ModelBackend, админка)."""
+        return self.for_email(username).get()
+
 
 class Role(models.Model):
     """Модель ролей пользователей (admin, manager, user)."""
@@ -79,7 +100,8 @@ class Role(models.Model):
 class User(AbstractBaseUser):
     """Кастомная модель пользователя, заменяющая стандартную User."""
 
-    email = models.EmailField(unique=True)
+    # Уникальность без учета регистра задает ограничение user_email_lower_uniq
+    email = models.EmailField()
     first_name = models.CharField(max_length=30)
     last_name = models.CharField(max_length=30)
     middle_name = models.CharField(max_length=30, blank=True, null=True)
@@ -90,6 +112,9 @@ class User(AbstractBaseUser):
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
     is_superuser = models.BooleanField(default=False)
+    # Увеличивается при деактивации или смене роли; сверяется с claim "sv"
+    # токена, чтобы отзывать выданные токены без запроса к БД
+    security_version = models.PositiveIntegerField(default=0)
 
     objects = UserManager()
 
@@ -99,11 +124,58 @@ class User(AbstractBaseUser):
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
+        constraints = [
+            # Email уникален без учета регистра: normalize_email приводит
+            # к нижнему регистру только домен. Индекс обслуживает вход
+            # (UserManager.for_email)
+            models.UniqueConstraint(Lower("email"), name="user_email_lower_uniq"),
+        ]
+
+    # Поля, изменение которых делает выданные токены недействительными
+    SECURITY_FIELDS = ("is_active", "role_id")
 
     def __str__(self):
         """Возвращает строковое представление пользователя."""
         return f"{self.first_name} {self.last_name} ({self.email})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Запоминает значения полей безопасности на момент загрузки."""
+        instance = super().from_db(db, field_names, values)
+        instance._security_state = instance._get_security_state()
+        return instance
+
+    def _get_security_state(self):
+        """Возвращает текущие значения полей безопасности."""
+        return tuple(self.__dict__.get(field) for field in self.SECURITY_FIELDS)
+
+    def save(self, *args, **kwargs):
+        """Сохраняет пользователя, увеличивая версию безопасности.
+
+        Версия увеличивается, если с момента загрузки изменились
+        is_active или роль пользователя.
+        """
+        state = self._get_security_state()
+        loaded = getattr(self, "_security_state", None)
+        if loaded is not None and loaded != state:
+            self.security_version += 1
+            update_fields = kwargs.get("update_fields")
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "security_version"}
+        super().save(*args, **kwargs)
+        self._security_state = state
+
+    def set_password(self, raw_password):
+        """Устанавливает пароль, вычисляя хеш в пуле хеширования.
+
+        Args:
+            raw_password: Пароль в открытом виде или None
+        """
+        from custom_auth.hashing import make_password as pooled_make_password
+
+        self.password = pooled_make_password(raw_password)
+        self._password = raw_password
+
     def has_perm(self, perm, obj=None):
         """Проверяет права пользователя.
 
@@ -170,10 +242,86 @@ class AccessRule(models.Model):
     class Meta:
         verbose_name = "Access Rule"
         verbose_name_plural = "Access Rules"
-        unique_together = ("role", "element")
+        constraints = [
+            # Один уникальный индекс по (роль, элемент) с правами в INCLUDE:
+            # права читаются index-only scan без обращения к таблице. На
+            # СУБД без INCLUDE (SQLite) – уникальность только по ключу
+            CoveringUniqueConstraint(
+                fields=["role", "element"],
+                include=[
+                    "read_permission",
+                    "read_all_permission",
+                    "create_permission",
+                    "update_permission",
+                    "update_all_permission",
+                    "delete_permission",
+                    "delete_all_permission",
+                ],
+                name="accessrule_role_element_uniq",
+            ),
+        ]
 
     def __str__(self):
         """Возвращает описание правила доступа."""
         return f"{self.role} → {self.element}"
 
 
+class RefreshToken(models.Model):
+    """Одноразовый refresh-токен.
+
+    Хранится только SHA-256 хеш токена (уникальный индекс для поиска).
+    Все токены, полученные ротацией из одного логина, образуют семейство
+    (family): повторное использование уже обмененного токена отзывает
+    все семейство.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="refresh_tokens"
+    )
+    token_hash = models.CharField(max_length=64, unique=True)
+    family = models.UUIDField(db_index=True)
+    expires_at = models.DateTimeField()
+    used_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "Refresh Token"
+        verbose_name_plural = "Refresh Tokens"
+
+    def __str__(self):
+        """Возвращает описание токена."""
+        return f"{self.user_id} / {self.family}"
+
+
+class APIKey(models.Model):
+    """Долгоживущий ключ API сервисного аккаунта.
+
+    Ключ имеет вид ak_<prefix>_<secret>. Публичный префикс хранится открыто
+    под уникальным индексом и служит для поиска ключа, а секрет – только
+    как HMAC-SHA256 (см. custom_auth/api_keys.py): ключ случайный, поэтому
+    медленный KDF для него не нужен.
+
+    scopes ограничивает ключ бизнес-элементами и действиями
+    ("products:read", "orders:*"); пустой список – все права роли
+    пользователя.
+    """
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="api_keys"
+    )
+    name = models.CharField(max_length=100)
+    prefix = models.CharField(max_length=16, unique=True)
+    secret_hash = models.CharField(max_length=64)
+    scopes = models.JSONField(default=list, blank=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+    revoked_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = "API Key"
+        verbose_name_plural = "API Keys"
+
+    def __str__(self):
+        """Возвращает описание ключа."""
+        return f"{self.name} ({self.prefix})"
@@ -0,0 +1,111 @@
+"""Keyset-пагинация и потоковая отдача списков.
+
+KeysetPagination – курсорная пагинация DRF по id: следующая страница
+выбирается условием `id > <последний id>` по индексу, а не через OFFSET,
+поэтому время ответа не зависит от номера страницы, а курсоры стабильны
+при вставке и удалении строк.
+
+Потоковый режим (`?stream=true`) отдает весь результат одним JSON-массивом,
+сериализуя строки по одной из курсора БД (`.iterator()`), поэтому память
+воркера не зависит от размера выборки.
+"""
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.encoders import JSONEncoder
+
+STREAM_PARAM = "stream"
+
+# Сколько строк читать из курсора БД за один раз в потоковом режиме
+STREAM_CHUNK_SIZE = 1000
+
+
+class KeysetPagination(CursorPagination):
+    """Курсорная пагинация по первичному ключу."""
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+
+def wants_stream(request):
+    """Проверяет, запрошен ли потоковый режим (`?stream=true`).
+
+    Args:
+        request: HTTP-запрос Django или DRF
+
+    Returns:
+        bool: True для stream=1/true
+    """
+    query_params = getattr(request, "query_params", request.GET)
+    return query_params.get(STREAM_PARAM, "").lower() in ("1", "true")
+
+
+def stream_json(rows):
+    """Сериализует строки в JSON-массив по одной.
+
+    Args:
+        rows: Итератор словарей
+
+    Yields:
+        bytes: Части JSON-массива
+    """
+    encoder = JSONEncoder(ensure_ascii=False)
+    yield b"["
+    separator = b""
+    for row in rows:
+        yield separator + encoder.encode(row).encode()
+        separator = b","
+    yield b"]"
+
+
+async def astream_json(rows):
+    """Асинхронный вариант stream_json для асинхронного итератора.
+
+    Args:
+        rows: Асинхронный итератор словарей
+
+    Yields:
+        bytes: Части JSON-массива
+    """
+    encoder = JSONEncoder(ensure_ascii=False)
+    yield b"["
+    separator = b""
+    async for row in rows:
+        yield separator + encoder.encode(row).encode()
+        separator = b","
+    yield b"]"
+
+
+def streaming_json_response(content):
+    """Возвращает потоковый ответ с JSON-массивом.
+
+    Args:
+        content: Результат stream_json или astream_json
+
+    Returns:
+        StreamingHttpResponse: Ответ application/json
+    """
+    return StreamingHttpResponse(content, content_type="application/json")
+
+
+class StreamingListMixin:
+    """Добавляет к list() представления DRF потоковый режим `?stream=true`.
+
+    Без параметра список отдается постранично (DEFAULT_PAGINATION_CLASS).
+    """
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает страницу списка или весь список потоком."""
+        if not wants_stream(request):
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer_class = self.get_serializer_class()
+        context = self.get_serializer_context()
+        rows = (
+            serializer_class(instance, context=context).data
+            for instance in queryset.iterator(chunk_size=STREAM_CHUNK_SIZE)
+        )
+        return streaming_json_response(stream_json(rows))
@@ -1,13 +1,79 @@
 from rest_framework import permissions
 
+from custom_auth import metrics
+from custom_auth.access_matrix import METHOD_ACTIONS, aget_matrix, get_matrix
+
+
+def required_action(view, method):
+    """Возвращает действие, которое проверяется для запроса.
+
+    Берется из view.required_permission, а если оно не задано – из
+    HTTP-метода (GET -> read, POST -> create, PUT/PATCH -> update,
+    DELETE -> delete).
+
+    Args:
+        view: Представление
+        method: HTTP-метод запроса
+
+    Returns:
+        str | None: Действие или None для неизвестного метода
+    """
+    return getattr(view, 'required_permission', None) or METHOD_ACTIONS.get(method)
+
+
+def check_api_key_scopes(auth, view, matrix, method=None):
+    """Проверяет ограничения ключа API (scopes), если запрос с ключом.
+
+    Область представления – имя бизнес-элемента по view.element_id или
+    view.api_key_scope для эндпоинтов вне матрицы прав (см.
+    api_keys.VIEW_SCOPES). Ключ с ограничениями не получает доступ к
+    представлению без области: запрет по умолчанию.
+
+    Args:
+        auth: request.auth (payload JWT или APIKeyCredential)
+        view: Представление
+        matrix: Снимок матрицы прав (AccessMatrix)
+        method: HTTP-метод запроса
+
+    Returns:
+        bool: True, если запрос не с ключом, ключ без ограничений или
+            действие входит в его scopes
+    """
+    if not getattr(auth, 'scopes', None):
+        return True
+    element_id = getattr(view, 'element_id', None)
+    if element_id:
+        scope = matrix.element_names.get(element_id)
+    else:
+        scope = getattr(view, 'api_key_scope', None)
+    required = required_action(view, method)
+    if not scope or not required:
+        return False
+    return auth.allows(scope, required)
+
+
+class APIKeyScopePermission(permissions.BasePermission):
+    """Ограничивает запросы с ключом API его scopes на любых представлениях.
+
+    Входит в DEFAULT_PERMISSION_CLASSES; представления со своим
+    permission_classes должны подключать ее явно (AccessPermission
+    выполняет ту же проверку сама).
+    """
+
+    def has_permission(self, request, view):
+        """Проверяет scopes ключа для представления и HTTP-метода."""
+        return check_api_key_scopes(request.auth, view, get_matrix(), request.method)
+
+
 class AccessPermission(permissions.BasePermission):
     """
     Проверяет, имеет ли авторизованный пользователь нужные права на конкретный ресурс.
     View должен установить:
-        required_permission = 'read' | 'create' | ...  # действие
+        required_permission = 'read' | 'create' | ...  # действие (по умолчанию – по HTTP-методу)
         element_id = <id>  # id бизнес‑элемента
     """
 
+    @metrics.instrument("perm")
     def has_permission(self, request, view):
         """Проверяет разрешение пользователя на выполнение действия над бизнес-элементом.
 
@@ -16,7 +82,7 @@ class AccessPermission(permissions.BasePermission):
         2. Указаны ли required_permission и element_id в представлении
         3. Является ли пользователь администратором (автоматически получает все права)
         4. Наличие роли у пользователя
-        5. Проверка конкретного правила доступа из БД в зависимости от required_permission
+        5. Проверка конкретного правила доступа по матрице прав (см. access_matrix)
 
         Args:
             request: HTTP-запрос с аутентификационными данными
@@ -30,43 +96,71 @@ class AccessPermission(permissions.BasePermission):
             - При отсутствии element_id или required_permission возвращает True
             - Для неактивных пользователей всегда возвращает False
         """
-        if not request.user or not request.user.is_active:
+        matrix = get_matrix()
+        return self.check(request.user, view, matrix, request.method) and (
+            self.check_scopes(request.auth, view, matrix, request.method)
+        )
+
+    def check(self, user, view, matrix, method=None):
+        """Проверяет право пользователя по готовой матрице прав.
+
+        Не обращается к БД, поэтому используется и синхронной, и
+        асинхронной проверкой.
+
+        Args:
+            user: Аутентифицированный пользователь (User или TokenUser)
+            view: Представление с required_permission и element_id
+            matrix: Снимок матрицы прав (AccessMatrix)
+            method: HTTP-метод запроса (если view не задает required_permission)
+
+        Returns:
+            bool: True если доступ разрешен
+        """
+        if not user or not user.is_active:
             return False
 
-        required = getattr(view, 'required_permission', None)
+        required = required_action(view, method)
         element_id = getattr(view, 'element_id', None)
 
         # Без указания прав – считаем доступным (используем для демонстрации)
         if not required or not element_id:
             return True
 
+        # Роль берется по role_id без загрузки связанного объекта из БД,
+        # а права – из скомпилированной в память матрицы
+        role_id = user.role_id
+        if not role_id:
+            return False
+
         # Проверка для администратора - имеет все права
-        if request.user.role and hasattr(request.user.role, 'name') and request.user.role.name == "Admin":
+        if matrix.is_admin(role_id):
             return True
 
-        # Проверяем, есть ли у пользователя роль
-        if not request.user.role:
-            return False
+        return matrix.allows(role_id, element_id, required)
 
-        from custom_auth.models import AccessRule
-        try:
-            rule = AccessRule.objects.get(
-                role=request.user.role,
-                element_id=element_id
-            )
-        except AccessRule.DoesNotExist:
-            return False  # пользователь не имеет прав
+    def check_scopes(self, auth, view, matrix, method=None):
+        """Проверяет ограничения ключа API (scopes), если запрос с ключом.
+
+        См. check_api_key_scopes.
+        """
+        return check_api_key_scopes(auth, view, matrix, method)
 
-        # Проверяем конкретное поле
-        if required == 'read':
-            return rule.read_permission or rule.read_all_permission
-        elif required == 'create':
-            return rule.create_permission
-        elif required == 'update':
-            return rule.update_permission or rule.update_all_permission
-        elif required == 'delete':
-            return rule.delete_permission or rule.delete_all_permission
 
-        return False  # неизвестное действие -> отказ
+class AsyncAccessPermission(AccessPermission):
+    """Асинхронный вариант AccessPermission для ASGI-представлений."""
 
+    @metrics.instrument("perm")
+    async def ahas_permission(self, request, view):
+        """Проверяет право пользователя, не блокируя event loop.
 
+        Args:
+            request: HTTP-запрос с аутентифицированным пользователем
+            view: Представление с required_permission и element_id
+
+        Returns:
+            bool: True если доступ разрешен
+        """
+        matrix = await aget_matrix()
+        return self.check(request.user, view, matrix, request.method) and (
+            self.check_scopes(request.auth, view, matrix, request.method)
+        )
@@ -0,0 +1,138 @@
+"""Быстрые рендереры и парсеры DRF: JSON через orjson и MessagePack.
+
+Стандартный JSONRenderer сериализует ответ модулем json на Python с
+хуком кодировщика для каждого нестандартного значения; на больших списках
+(например /api/rules/) это заметная доля CPU запроса. ORJSONRenderer
+выдает тот же JSON через orjson (реализация на Rust), а значения, которые
+orjson не знает (Decimal, ленивые строки перевода и т.п.), передает тому
+же кодировщику DRF, поэтому ответ не меняется.
+
+MessagePackRenderer и MessagePackParser добавляют тип application/msgpack
+для внутренних сервисов: клиент выбирает его заголовком Accept (ответ) и
+Content-Type (тело запроса), остальные клиенты по-прежнему получают JSON.
+
+Пакеты orjson и msgpack необязательные и включаются настройками
+API_ORJSON_ENABLED и API_MSGPACK_ENABLED (см. project/settings.py).
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - зависит от окружения
+    msgpack = None
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Преобразование значений, которые не поддерживают orjson и msgpack
+_encode_default = JSONEncoder().default
+
+
+def _require(module, name):
+    """Проверяет, что необязательный пакет установлен."""
+    if module is None:
+        raise ImproperlyConfigured(
+            f"Не установлен необязательный пакет {name}: pip install {name}"
+        )
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Рендерер application/json на orjson."""
+
+    media_type = "application/json"
+    format = "json"
+    charset = None
+
+    def __init__(self):
+        _require(orjson, "orjson")
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Сериализует данные ответа в JSON.
+
+        Args:
+            data: Данные ответа
+            accepted_media_type: Выбранный тип, например "application/json; indent=2"
+            renderer_context: Контекст рендеринга DRF
+
+        Returns:
+            bytes: JSON в UTF-8
+        """
+        if data is None:
+            return b""
+        # Даты и время форматирует кодировщик DRF ("Z" для UTC, миллисекунды)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        # Как и JSONRenderer, поддерживаем "; indent=..." (orjson умеет только 2)
+        if accepted_media_type and "indent=" in accepted_media_type:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_encode_default, option=option)
+
+
+class ORJSONParser(BaseParser):
+    """Парсер тела application/json на orjson."""
+
+    media_type = "application/json"
+
+    def __init__(self):
+        _require(orjson, "orjson")
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбирает JSON из тела запроса.
+
+        Raises:
+            ParseError: Если тело не является корректным JSON
+        """
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as e:
+            raise ParseError(f"JSON parse error - {e}") from e
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Рендерер application/msgpack."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+
+    def __init__(self):
+        _require(msgpack, "msgpack")
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Сериализует данные ответа в MessagePack.
+
+        Returns:
+            bytes: Данные в формате MessagePack
+        """
+        if data is None:
+            return b""
+        return msgpack.packb(data, default=_encode_default, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Парсер тела application/msgpack."""
+
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def __init__(self):
+        _require(msgpack, "msgpack")
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Разбирает MessagePack из тела запроса.
+
+        Raises:
+            ParseError: Если тело не является корректным MessagePack
+        """
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise ParseError(f"MessagePack parse error - {e}") from e
@@ -0,0 +1,232 @@
+"""Кэш ответов списков с условными GET (ETag, Last-Modified, 304).
+
+Тело списка определяется тремя вещами: адресом запроса (включая курсор
+страницы), областью права читателя на элемент (все объекты или только
+свои – тогда и id пользователя) и версией данных модели. Из них строится
+ключ, а ETag – его хеш, поэтому запрос с совпадающим If-None-Match
+получает 304 без выполнения представления: нужно только прочитать версию
+данных из общего кэша. Готовые тела ответов хранятся в общем кэше Django
+(settings.CACHES) RESPONSE_CACHE_TTL секунд и отдаются без запросов к БД
+и сериализации.
+
+Версия данных модели меняется по сигналам post_save/post_delete после
+коммита транзакции (см. signals). Массовые операции без сигналов
+(bulk_create, update) должны вызывать bump_data_version сами.
+
+Асинхронные представления (ASYNC_VIEWS) используют те же ключи и
+заголовки через acached_list.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from custom_auth.access_matrix import SCOPE_ALL, get_matrix
+from custom_auth.pagination import wants_stream
+from custom_auth.permissions import required_action
+
+VERSION_KEY = "custom_auth:data_version:{}"
+BODY_KEY = "custom_auth:response:{}"
+
+
+class ResponseCacheStats:
+    """Счетчики попаданий кэша ответов в текущем процессе."""
+
+    def __init__(self):
+        self.not_modified = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def incr(self, name):
+        """Увеличивает счетчик not_modified, hits или misses."""
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def stats(self):
+        """Возвращает счетчики и долю ответов без выполнения представления."""
+        total = self.not_modified + self.hits + self.misses
+        return {
+            "not_modified": self.not_modified,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": (self.not_modified + self.hits) / total if total else 0.0,
+        }
+
+
+response_cache_stats = ResponseCacheStats()
+
+
+def bump_data_version(model):
+    """Меняет версию данных модели: закэшированные ответы устаревают.
+
+    Args:
+        model: Класс модели
+    """
+    cache.set(
+        VERSION_KEY.format(model._meta.label_lower),
+        (uuid.uuid4().hex, time.time()),
+        None,
+    )
+
+
+def get_data_version(model):
+    """Возвращает (версия, время изменения) данных модели.
+
+    Если кэш недоступен и версию не удалось сохранить, возвращается новая
+    версия: ETag не совпадет, и ответ будет построен заново.
+
+    Args:
+        model: Класс модели
+
+    Returns:
+        tuple: (строка версии, unix time изменения)
+    """
+    key = VERSION_KEY.format(model._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        # Версия вытеснена или еще не создана: начинаем новую. add, чтобы
+        # параллельные запросы не затирали версию друг друга
+        version = (uuid.uuid4().hex, time.time())
+        if not cache.add(key, version, None):
+            version = cache.get(key) or version
+    return version
+
+
+def _cache_entry(request, media_type, scope, version, modified):
+    """Возвращает ключ тела ответа и заголовки условного GET.
+
+    Args:
+        request: Запрос Django или DRF
+        media_type: Выбранный тип ответа
+        scope: Область права читателя (SCOPE_ALL или SCOPE_OWN)
+        version: Версия данных модели
+        modified: Время изменения данных (unix time)
+
+    Returns:
+        tuple: (ключ тела в кэше, словарь заголовков)
+    """
+    reader = scope if scope == SCOPE_ALL else f"{scope}:{request.user.pk}"
+    # Хост входит в ключ: ссылки пагинации в теле абсолютные
+    digest = hashlib.sha256("|".join((
+        request.get_host(), request.get_full_path(),
+        media_type, reader, version,
+    )).encode()).hexdigest()
+    return BODY_KEY.format(digest), {
+        "ETag": f'"{digest}"',
+        "Last-Modified": http_date(modified),
+        "Cache-Control": "private, no-cache",
+    }
+
+
+def _content_type(renderer, media_type):
+    """Возвращает Content-Type ответа рендерера."""
+    if renderer.charset:
+        return f"{media_type}; charset={renderer.charset}"
+    return media_type
+
+
+async def acached_list(request, model, scope, renderer, media_type, get_data):
+    """Асинхронный вариант ResponseCacheMixin.list.
+
+    Args:
+        request: Запрос Django
+        model: Модель списка
+        scope: Область права читателя (SCOPE_ALL или SCOPE_OWN)
+        renderer: Рендерер, выбранный по заголовку Accept
+        media_type: Выбранный тип ответа
+        get_data: Корутина без аргументов, возвращающая данные страницы
+
+    Returns:
+        HttpResponse: 304, закэшированное или новое тело с заголовками кэша
+    """
+    version, modified = await sync_to_async(get_data_version)(model)
+    body_key, headers = _cache_entry(request, media_type, scope, version, modified)
+
+    # Решение о 304 принимается только по ETag (см. ResponseCacheMixin)
+    response = get_conditional_response(request, etag=headers["ETag"])
+    if response is not None:
+        response_cache_stats.incr("not_modified")
+    else:
+        cached = await cache.aget(body_key)
+        if cached is not None:
+            response_cache_stats.incr("hits")
+            response = HttpResponse(cached[1], content_type=cached[0])
+        else:
+            response_cache_stats.incr("misses")
+            content_type = _content_type(renderer, media_type)
+            content = renderer.render(await get_data(), media_type)
+            await cache.aset(
+                body_key, (content_type, content), settings.RESPONSE_CACHE_TTL
+            )
+            response = HttpResponse(content, content_type=content_type)
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+class ResponseCacheMixin:
+    """Кэширует ответы list() представления DRF по правам читателя и версии данных.
+
+    Представление должно задать element_id; область права и поле
+    владельца берутся так же, как в AccessRuleFilterBackend.
+    """
+
+    def list(self, request, *args, **kwargs):
+        """Возвращает 304, закэшированное тело или выполняет представление."""
+        renderer = request.accepted_renderer
+        if (
+            not settings.RESPONSE_CACHE_ENABLED
+            or wants_stream(request)
+            or renderer.format == "api"
+        ):
+            return super().list(request, *args, **kwargs)
+
+        role_id = getattr(request.user, "role_id", None)
+        scope = get_matrix().scope(
+            role_id, self.element_id, required_action(self, request.method)
+        ) if role_id else None
+        if scope is None:
+            return super().list(request, *args, **kwargs)
+
+        version, modified = get_data_version(self.get_queryset().model)
+        body_key, headers = _cache_entry(
+            request, request.accepted_media_type, scope, version, modified
+        )
+
+        # Решение о 304 принимается только по ETag: Last-Modified имеет
+        # точность до секунды и не различает изменения внутри нее
+        response = get_conditional_response(request, etag=headers["ETag"])
+        if response is not None:
+            response_cache_stats.incr("not_modified")
+        else:
+            cached = cache.get(body_key)
+            if cached is not None:
+                response_cache_stats.incr("hits")
+                response = HttpResponse(cached[1], content_type=cached[0])
+            else:
+                response_cache_stats.incr("misses")
+                response = super().list(request, *args, **kwargs)
+                if response.status_code == 200:
+                    content_type = _content_type(renderer, request.accepted_media_type)
+                    content = renderer.render(
+                        response.data, request.accepted_media_type,
+                        self.get_renderer_context(),
+                    )
+                    cache.set(
+                        body_key,
+                        (content_type, content),
+                        settings.RESPONSE_CACHE_TTL,
+                    )
+                    response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        return response
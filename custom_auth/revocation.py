@@ -0,0 +1,187 @@
+"""Список отозванных access-токенов (denylist) по claim "jti".
+
+Отозванные jti хранятся в памяти каждого воркера в словаре jti -> exp,
+поэтому проверка на каждом запросе – один поиск в словаре без обращения
+к БД или кэшу. Записи удаляются после истечения срока действия токена.
+
+Синхронизация между воркерами и узлами идет через общий кэш Django
+(settings.CACHES): каждый отзыв получает порядковый номер из счетчика
+SEQUENCE_KEY и записывается отдельным ключом с таймаутом до exp токена.
+Воркеры не чаще раза в JWT_REVOCATION_SYNC_INTERVAL секунд дочитывают
+новые записи одним get_many.
+
+Номер выдается до записи, поэтому воркер может увидеть счетчик раньше
+самой записи. Такие номера запоминаются и перечитываются при следующих
+синхронизациях в течение PENDING_TIMEOUT секунд.
+Запись занимает номер через cache.add, так что два отзыва не затирают
+друг друга, даже если incr в бэкенде неатомарен (файловый кэш). Ключ
+EPOCH_KEY меняется после очистки кэша, и тогда воркеры перечитывают
+записи заново.
+
+Новый воркер (и воркер после очистки кэша) читает не все номера с
+первого, а только с нижней границы живых записей. Первый отзыв в каждом
+интервале MARK_BUCKET секунд записывает в MARK_KEY номер, с которого
+начинаются отзывы этого интервала. Токены живут не дольше
+JWT_ACCESS_TOKEN_LIFETIME, поэтому более ранние номера истекли, и чтение
+начинается с наименьшей отметки за это время.
+"""
+
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+SEQUENCE_KEY = "custom_auth:revocation:seq"
+EPOCH_KEY = "custom_auth:revocation:epoch"
+ENTRY_KEY = "custom_auth:revocation:{}"
+MARK_KEY = "custom_auth:revocation:mark:{}"
+
+# Длина интервала (в секундах), для которого хранится первый номер отзыва
+MARK_BUCKET = 60
+
+# Сколько записей дочитывать из кэша одним запросом
+SYNC_BATCH_SIZE = 1000
+
+# Сколько секунд перечитывать номер, запись которого еще не появилась
+PENDING_TIMEOUT = 30
+
+# Как часто (в секундах) удалять из памяти записи истекших токенов
+PRUNE_INTERVAL = 60
+
+
+class RevocationList:
+    """Denylist отозванных jti, синхронизируемый через общий кэш."""
+
+    def __init__(self, sync_interval):
+        self.sync_interval = sync_interval
+        self._revoked = {}
+        self._sequence = 0
+        # Отличается от любого значения EPOCH_KEY: первая синхронизация
+        # всегда начинает с нижней границы
+        self._epoch = object()
+        self._pending = {}
+        self._synced_at = 0.0
+        self._pruned_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def revoke(self, jti, exp):
+        """Отзывает токен до момента exp во всех воркерах.
+
+        Args:
+            jti: Идентификатор токена
+            exp: Срок действия токена (unix time)
+        """
+        timeout = int(exp - time.time()) + 1
+        if timeout <= 0:
+            return
+
+        with self._lock:
+            self._revoked[jti] = exp
+
+        cache.add(EPOCH_KEY, uuid.uuid4().hex, None)
+        cache.add(SEQUENCE_KEY, 0, None)
+        mark_key = MARK_KEY.format(int(time.time() // MARK_BUCKET))
+        if cache.get(mark_key) is None:
+            # Счетчик читается до incr: все номера этого интервала больше
+            cache.add(
+                mark_key,
+                (cache.get(SEQUENCE_KEY) or 0) + 1,
+                settings.JWT_ACCESS_TOKEN_LIFETIME + 2 * MARK_BUCKET,
+            )
+        while True:
+            try:
+                sequence = cache.incr(SEQUENCE_KEY)
+            except ValueError:
+                # Счетчик вытеснен из кэша между add и incr
+                cache.add(SEQUENCE_KEY, 0, None)
+                continue
+            # Номер уже занят: incr неатомарен или счетчик начат заново
+            if cache.add(ENTRY_KEY.format(sequence), (jti, exp), timeout):
+                return
+
+    def is_revoked(self, jti):
+        """Проверяет, отозван ли токен.
+
+        Args:
+            jti: Идентификатор токена из payload
+
+        Returns:
+            bool: True, если токен отозван и еще не истек
+        """
+        if time.monotonic() - self._synced_at >= self.sync_interval:
+            self.sync()
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def sync(self):
+        """Дочитывает из общего кэша отзывы, сделанные другими воркерами."""
+        with self._lock:
+            self._synced_at = time.monotonic()
+            state = cache.get_many([SEQUENCE_KEY, EPOCH_KEY])
+            sequence = state.get(SEQUENCE_KEY, 0)
+            epoch = state.get(EPOCH_KEY)
+            if epoch != self._epoch or sequence < self._sequence:
+                # Первая синхронизация или кэш был очищен: читаем с нижней
+                # границы номеров еще не истекших токенов
+                self._epoch = epoch
+                self._sequence = self._low_watermark(sequence)
+                self._pending = {}
+
+            # Номер -> когда он впервые встречен без записи
+            pending = dict(self._pending)
+            pending.update(
+                dict.fromkeys(range(self._sequence + 1, sequence + 1), self._synced_at)
+            )
+            numbers = list(pending)
+            for start in range(0, len(numbers), SYNC_BATCH_SIZE):
+                keys = {
+                    ENTRY_KEY.format(number): number
+                    for number in numbers[start:start + SYNC_BATCH_SIZE]
+                }
+                for key, (jti, exp) in cache.get_many(keys).items():
+                    self._revoked[jti] = exp
+                    pending.pop(keys[key], None)
+            # Отсутствующие номера: запись еще не сделана или уже истекла
+            self._pending = {
+                number: seen_at for number, seen_at in pending.items()
+                if self._synced_at - seen_at < PENDING_TIMEOUT
+            }
+            self._sequence = sequence
+            if self._synced_at - self._pruned_at >= PRUNE_INTERVAL:
+                self._prune()
+
+    def _low_watermark(self, sequence):
+        """Возвращает номер, после которого могут быть записи живых токенов.
+
+        Args:
+            sequence: Текущее значение счетчика
+
+        Returns:
+            int: Последний номер, который можно не читать
+        """
+        now = time.time()
+        first = int((now - settings.JWT_ACCESS_TOKEN_LIFETIME) // MARK_BUCKET) - 1
+        last = int(now // MARK_BUCKET) + 1
+        marks = cache.get_many(
+            [MARK_KEY.format(bucket) for bucket in range(first, last + 1)]
+        ).values()
+        if not marks:
+            # За время жизни токена отзывов не было
+            return sequence
+        return min(min(marks) - 1, sequence)
+
+    def _prune(self):
+        """Удаляет записи истекших токенов."""
+        self._pruned_at = time.monotonic()
+        now = time.time()
+        expired = [jti for jti, exp in self._revoked.items() if exp <= now]
+        for jti in expired:
+            del self._revoked[jti]
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+denylist = RevocationList(settings.JWT_REVOCATION_SYNC_INTERVAL)
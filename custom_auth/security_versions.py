@@ -0,0 +1,78 @@
+"""Версии безопасности пользователей в общем кэше.
+
+Версия безопасности (User.security_version) увеличивается при деактивации
+пользователя или смене его роли. Токены несут версию на момент выпуска,
+поэтому сравнение с актуальной версией из кэша позволяет отзывать их без
+запроса к БД на каждом запросе.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+
+CACHE_KEY = "custom_auth:user_sv:{}"
+
+
+def publish(user_id, version, is_active):
+    """Записывает актуальное состояние пользователя в общий кэш.
+
+    Args:
+        user_id: id пользователя
+        version: Текущая версия безопасности
+        is_active: Активен ли пользователь
+    """
+    cache.set(
+        CACHE_KEY.format(user_id),
+        (version, is_active),
+        settings.USER_SECURITY_VERSION_CACHE_TTL,
+    )
+
+
+def bump(user_id):
+    """Увеличивает версию безопасности, отзывая все access-токены пользователя.
+
+    Версия увеличивается одним UPDATE (без гонки с другими изменениями
+    пользователя) и сразу публикуется в общий кэш.
+
+    Args:
+        user_id: id пользователя
+    """
+    from custom_auth.models import User
+
+    User.objects.filter(pk=user_id).update(security_version=F("security_version") + 1)
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list("security_version", "is_active")
+        .first()
+    )
+    if row is not None:
+        publish(user_id, *row)
+
+
+def get_state(user_id):
+    """Возвращает (version, is_active) пользователя.
+
+    При промахе кэша состояние читается из БД одним запросом и
+    публикуется для остальных воркеров.
+
+    Args:
+        user_id: id пользователя
+
+    Returns:
+        tuple | None: (version, is_active) или None, если пользователя нет
+    """
+    state = cache.get(CACHE_KEY.format(user_id))
+    if state is not None:
+        return state
+
+    from custom_auth.models import User
+
+    row = (
+        User.objects.filter(pk=user_id)
+        .values_list("security_version", "is_active")
+        .first()
+    )
+    if row is None:
+        return None
+    publish(user_id, *row)
+    return row
@@ -0,0 +1,63 @@
+"""Загрузка начальных данных из project/fixtures.
+
+Фикстуры хранятся как списки полей модели (без обертки model/pk формата
+loaddata), поэтому загружаются напрямую через ORM. Загрузка идемпотентна:
+уже существующие строки (по первичному или уникальному ключу) пропускаются,
+а правила, измененные через API, не перезаписываются.
+
+Роли и бизнес-элементы вставляются с явными id, поэтому после вставки
+последовательности первичных ключей сдвигаются за максимальный id (как это
+делает loaddata), иначе следующий create() упадет на дубликате ключа.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from . import access_matrix
+from .models import AccessRule, BusinessElement, Role
+
+FIXTURES_DIR = settings.BASE_DIR / "project" / "fixtures"
+
+# Порядок важен: правила ссылаются на роли и бизнес-элементы
+FIXTURES = (
+    ("roles.json", Role, ("id",)),
+    ("business_elements.json", BusinessElement, ("id",)),
+    ("access_rules.json", AccessRule, ("role_id", "element_id")),
+)
+
+
+def load_fixtures():
+    """Загружает фикстуры, пропуская уже примененные строки.
+
+    Returns:
+        dict: Имя файла -> (число строк в файле, число добавленных строк)
+    """
+    result = {}
+    with transaction.atomic():
+        for filename, model, key_fields in FIXTURES:
+            with open(FIXTURES_DIR / filename, encoding="utf-8") as fh:
+                rows = json.load(fh)
+
+            existing = set(model.objects.values_list(*key_fields))
+            missing = [
+                model(**row)
+                for row in rows
+                if tuple(row[field] for field in key_fields) not in existing
+            ]
+            if missing:
+                model.objects.bulk_create(missing, ignore_conflicts=True)
+            result[filename] = (len(rows), len(missing))
+
+        added_models = [
+            model for filename, model, _ in FIXTURES if result[filename][1]
+        ]
+        if added_models:
+            with connection.cursor() as cursor:
+                for sql in connection.ops.sequence_reset_sql(no_style(), added_models):
+                    cursor.execute(sql)
+            # bulk_create не отправляет сигналы, поэтому сбрасываем матрицу сами
+            transaction.on_commit(access_matrix.invalidate)
+    return result
@@ -1,9 +1,18 @@
 """Сериализаторы для приложения custom_auth."""
 
+from django.db import transaction
 from rest_framework import serializers
 
+from . import access_matrix
+from .access_matrix import ACTIONS, PERMISSION_FIELDS
 from .models import User, Role, BusinessElement, AccessRule
 
+# Максимальное число проверок в одном запросе к /api/permissions/
+MAX_PERMISSION_CHECKS = 100
+
+# Максимальное число правил в одном запросе к /api/rules/bulk/
+MAX_BULK_RULES = 1000
+
 
 class LoginSerializer(serializers.Serializer):
     """Сериализатор для аутентификации пользователя."""
@@ -26,6 +35,43 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
+class TokenRefreshSerializer(serializers.Serializer):
+    """Сериализатор для обмена refresh-токена."""
+
+    refresh = serializers.CharField(required=True, write_only=True)
+
+
+class PermissionCheckSerializer(serializers.Serializer):
+    """Одна проверка права: бизнес-элемент (имя или id) и действие."""
+
+    element = serializers.CharField(required=True)
+    action = serializers.ChoiceField(choices=ACTIONS)
+
+
+class PermissionBatchSerializer(serializers.Serializer):
+    """Пакет проверок прав для /api/permissions/."""
+
+    checks = PermissionCheckSerializer(many=True, allow_empty=False)
+
+    def validate_checks(self, value):
+        """Ограничивает размер пакета.
+
+        Args:
+            value: Список проверок
+
+        Returns:
+            list: Неизмененный список проверок
+
+        Raises:
+            ValidationError: если проверок больше MAX_PERMISSION_CHECKS
+        """
+        if len(value) > MAX_PERMISSION_CHECKS:
+            raise serializers.ValidationError(
+                f"Не больше {MAX_PERMISSION_CHECKS} проверок за запрос."
+            )
+        return value
+
+
 class UserSerializer(serializers.ModelSerializer):
     """Сериализатор для регистрации и профиля пользователя."""
 
@@ -42,6 +88,25 @@ class UserSerializer(serializers.ModelSerializer):
             "password",
         ]
 
+    def validate_email(self, value):
+        """Проверяет, что email не занят с точностью до регистра.
+
+        Args:
+            value: Email из запроса
+
+        Returns:
+            str: Тот же email
+
+        Raises:
+            ValidationError: Если email уже занят другим пользователем
+        """
+        users = User.objects.for_email(value)
+        if self.instance is not None:
+            users = users.exclude(pk=self.instance.pk)
+        if users.exists():
+            raise serializers.ValidationError("Пользователь с таким email уже существует.")
+        return value
+
     def create(self, validated_data):
         """Создает пользователя с ролью 'User'.
 
@@ -52,9 +117,13 @@ class UserSerializer(serializers.ModelSerializer):
             User: Созданный пользователь
         """
         password = validated_data.pop("password")
-        user_role, _ = Role.objects.get_or_create(name="User")
+        # id роли берется из матрицы прав в памяти, без запроса на каждую
+        # регистрацию; роль создается, только если ее еще нет
+        role_id = access_matrix.get_matrix().role_id("User")
+        if role_id is None:
+            role_id = Role.objects.get_or_create(name="User")[0].pk
         user = User.objects.create_user(
-            role=user_role,
+            role_id=role_id,
             password=password,
             **validated_data
         )
@@ -102,3 +171,117 @@ class AccessRuleSerializer(serializers.ModelSerializer):
             "delete_all_permission",
         ]
 
+
+
+class AccessRuleBulkItemSerializer(serializers.Serializer):
+    """Одно правило в пакете: роль, элемент и полный набор прав.
+
+    Не указанные права считаются выключенными.
+    """
+
+    role_id = serializers.IntegerField()
+    element_id = serializers.IntegerField()
+    read_permission = serializers.BooleanField(default=False)
+    read_all_permission = serializers.BooleanField(default=False)
+    create_permission = serializers.BooleanField(default=False)
+    update_permission = serializers.BooleanField(default=False)
+    update_all_permission = serializers.BooleanField(default=False)
+    delete_permission = serializers.BooleanField(default=False)
+    delete_all_permission = serializers.BooleanField(default=False)
+
+
+class AccessRuleBulkSerializer(serializers.Serializer):
+    """Пакетная вставка или обновление правил по ключу (role, element).
+
+    Роли и элементы проверяются двумя запросами с IN, а изменения
+    применяются одним bulk_create(update_conflicts=True) в транзакции.
+    Матрица прав сбрасывается один раз после коммита.
+    """
+
+    rules = AccessRuleBulkItemSerializer(many=True, allow_empty=False)
+
+    def validate_rules(self, value):
+        """Проверяет размер пакета, дубликаты и существование ролей и элементов.
+
+        Args:
+            value: Список правил
+
+        Returns:
+            list: Неизмененный список правил
+
+        Raises:
+            ValidationError: при превышении MAX_BULK_RULES, повторе пары
+                (role_id, element_id) или несуществующих id
+        """
+        if len(value) > MAX_BULK_RULES:
+            raise serializers.ValidationError(
+                f"Не больше {MAX_BULK_RULES} правил за запрос."
+            )
+
+        keys = [(rule["role_id"], rule["element_id"]) for rule in value]
+        if len(set(keys)) != len(keys):
+            raise serializers.ValidationError(
+                "Пара (role_id, element_id) повторяется."
+            )
+
+        role_ids = {role_id for role_id, _ in keys}
+        element_ids = {element_id for _, element_id in keys}
+        missing_roles = role_ids - set(
+            Role.objects.filter(id__in=role_ids).values_list("id", flat=True)
+        )
+        missing_elements = element_ids - set(
+            BusinessElement.objects.filter(id__in=element_ids).values_list(
+                "id", flat=True
+            )
+        )
+        errors = []
+        if missing_roles:
+            errors.append(f"Роли не найдены: {sorted(missing_roles)}")
+        if missing_elements:
+            errors.append(f"Элементы не найдены: {sorted(missing_elements)}")
+        if errors:
+            raise serializers.ValidationError(errors)
+        return value
+
+    def create(self, validated_data):
+        """Применяет пакет правил.
+
+        Args:
+            validated_data: Проверенные данные с ключом rules
+
+        Returns:
+            dict: Число созданных, измененных и неизмененных правил
+        """
+        rules = validated_data["rules"]
+        role_ids = {rule["role_id"] for rule in rules}
+        element_ids = {rule["element_id"] for rule in rules}
+
+        with transaction.atomic():
+            existing = {
+                (row[0], row[1]): row[2:]
+                for row in AccessRule.objects.filter(
+                    role_id__in=role_ids, element_id__in=element_ids
+                ).values_list("role_id", "element_id", *PERMISSION_FIELDS)
+            }
+
+            changed = []
+            counts = {"created": 0, "updated": 0, "unchanged": 0}
+            for rule in rules:
+                values = tuple(rule[field] for field in PERMISSION_FIELDS)
+                current = existing.get((rule["role_id"], rule["element_id"]))
+                if current == values:
+                    counts["unchanged"] += 1
+                    continue
+                counts["created" if current is None else "updated"] += 1
+                changed.append(AccessRule(**rule))
+
+            if changed:
+                AccessRule.objects.bulk_create(
+                    changed,
+                    update_conflicts=True,
+                    unique_fields=["role", "element"],
+                    update_fields=list(PERMISSION_FIELDS),
+                )
+                # bulk_create не отправляет post_save: сбрасываем матрицу сами
+                transaction.on_commit(access_matrix.invalidate)
+        return counts
@@ -0,0 +1,46 @@
+"""Обработчики сигналов приложения custom_auth."""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import access_matrix, security_versions
+from .models import AccessRule, BusinessElement, Role, User
+from .response_cache import bump_data_version
+
+
+@receiver(post_save, sender=AccessRule)
+@receiver(post_delete, sender=AccessRule)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=BusinessElement)
+@receiver(post_delete, sender=BusinessElement)
+def invalidate_access_matrix(sender, **kwargs):
+    """Сбрасывает матрицу прав после фиксации изменений правил.
+
+    Срабатывает при создании, изменении и удалении правил через
+    RuleViewSet, админку или ORM. Сброс откладывается до коммита
+    транзакции, чтобы воркеры не собрали матрицу из незафиксированных данных.
+    """
+    transaction.on_commit(access_matrix.invalidate)
+
+
+@receiver(post_save, sender=User)
+def publish_security_version(sender, instance, **kwargs):
+    """Публикует версию безопасности пользователя в общий кэш.
+
+    Благодаря этому деактивация или смена роли сразу делает
+    недействительными токены во всех воркерах.
+    """
+    transaction.on_commit(
+        lambda: security_versions.publish(
+            instance.pk, instance.security_version, instance.is_active
+        )
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_lists(sender, **kwargs):
+    """Сбрасывает закэшированные списки пользователей после коммита."""
+    transaction.on_commit(lambda: bump_data_version(User))
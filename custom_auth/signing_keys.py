@@ -0,0 +1,118 @@
+"""Ключи подписи JWT: HS256 с общим секретом или RS256/EdDSA с ротацией.
+
+Для асимметричных алгоритмов ключи лежат в каталоге JWT_KEYS_DIR:
+
+    <kid>.pem      – закрытый ключ (может подписывать и проверять)
+    <kid>.pub.pem  – только открытый ключ выведенного из ротации ключа
+
+Токены подписываются ключом JWT_ACTIVE_KID, а проверяются любым ключом
+каталога по заголовку kid. Открытые ключи публикуются в
+/.well-known/jwks.json, поэтому другие сервисы проверяют токены локально.
+
+Ротация с перекрытием: новый ключ добавляется в каталог и публикуется в
+JWKS заранее, затем становится активным, а старый переводится в
+<kid>.pub.pem и удаляется не раньше, чем истекут выданные им токены
+(JWT_ACCESS_TOKEN_LIFETIME) и закэшированный у клиентов JWKS
+(JWKS_CACHE_MAX_AGE). См. manage.py generate_jwt_key.
+"""
+
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+PRIVATE_SUFFIX = ".pem"
+PUBLIC_SUFFIX = ".pub.pem"
+
+
+class KeySet:
+    """Набор ключей для подписи и проверки токенов."""
+
+    def __init__(self, algorithm, active_kid, signing_key, verification_keys):
+        self.algorithm = algorithm
+        self.active_kid = active_kid
+        self.signing_key = signing_key
+        self.verification_keys = verification_keys
+
+    def headers(self):
+        """Возвращает заголовки JWT для подписи (kid активного ключа)."""
+        return {"kid": self.active_kid} if self.active_kid else None
+
+    def verification_key(self, kid):
+        """Возвращает ключ проверки для kid из заголовка токена.
+
+        Args:
+            kid: Идентификатор ключа или None для HS256
+
+        Returns:
+            Ключ проверки или None, если kid неизвестен
+        """
+        if self.algorithm not in ASYMMETRIC_ALGORITHMS:
+            return self.signing_key
+        return self.verification_keys.get(kid)
+
+    def jwks(self):
+        """Возвращает открытые ключи в формате JWKS.
+
+        Returns:
+            dict: {"keys": [...]}; для HS256 список пуст
+        """
+        from jwt.algorithms import OKPAlgorithm, RSAAlgorithm
+
+        to_jwk = RSAAlgorithm.to_jwk if self.algorithm == "RS256" else OKPAlgorithm.to_jwk
+        keys = []
+        for kid, public_key in sorted(self.verification_keys.items()):
+            jwk = json.loads(to_jwk(public_key))
+            jwk.update({"kid": kid, "use": "sig", "alg": self.algorithm})
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+def _load_asymmetric(algorithm, keys_dir, active_kid):
+    """Загружает ключи из каталога JWT_KEYS_DIR."""
+    from cryptography.hazmat.primitives.serialization import (
+        load_pem_private_key,
+        load_pem_public_key,
+    )
+
+    directory = Path(keys_dir)
+    private_keys = {}
+    public_keys = {}
+    for path in sorted(directory.glob(f"*{PRIVATE_SUFFIX}")):
+        data = path.read_bytes()
+        if path.name.endswith(PUBLIC_SUFFIX):
+            kid = path.name[: -len(PUBLIC_SUFFIX)]
+            public_keys[kid] = load_pem_public_key(data)
+        else:
+            kid = path.name[: -len(PRIVATE_SUFFIX)]
+            private_keys[kid] = load_pem_private_key(data, password=None)
+            public_keys[kid] = private_keys[kid].public_key()
+
+    if not active_kid and len(private_keys) == 1:
+        active_kid = next(iter(private_keys))
+    if active_kid not in private_keys:
+        raise ImproperlyConfigured(
+            f"В {directory} нет закрытого ключа для JWT_ACTIVE_KID={active_kid!r}."
+        )
+    return KeySet(algorithm, active_kid, private_keys[active_kid], public_keys)
+
+
+@lru_cache(maxsize=None)
+def get_key_set():
+    """Возвращает набор ключей процесса (загружается один раз).
+
+    Returns:
+        KeySet: Ключи для алгоритма settings.JWT_ALGORITHM
+    """
+    algorithm = settings.JWT_ALGORITHM
+    if algorithm == "HS256":
+        return KeySet(algorithm, None, settings.JWT_SECRET, {})
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ImproperlyConfigured(f"Неподдерживаемый JWT_ALGORITHM: {algorithm}")
+    if not settings.JWT_KEYS_DIR:
+        raise ImproperlyConfigured(f"Для {algorithm} нужно указать JWT_KEYS_DIR.")
+    return _load_asymmetric(algorithm, settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
@@ -0,0 +1,50 @@
+"""Общие данные тестов: фикстуры прав, пользователи и чистое состояние процесса."""
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from custom_auth import access_matrix
+from custom_auth.api_keys import api_key_cache
+from custom_auth.models import User
+from custom_auth.seed import load_fixtures
+
+# id ролей из project/fixtures/roles.json
+ADMIN_ROLE_ID = 1
+USER_ROLE_ID = 3
+
+PASSWORD = "password"
+
+
+def create_user(email, role_id=None, **fields):
+    """Создает пользователя с паролем PASSWORD.
+
+    Args:
+        email: Email пользователя
+        role_id: id роли (без роли, если не задан)
+        **fields: Остальные поля модели User
+
+    Returns:
+        User: Сохраненный пользователь
+    """
+    fields.setdefault("first_name", "A")
+    fields.setdefault("last_name", "B")
+    return User.objects.create_user(email, PASSWORD, role_id=role_id, **fields)
+
+
+class AuthTestCase(TestCase):
+    """TestCase с фикстурами ролей и прав, администратором и пользователем.
+
+    Матрица прав, версии безопасности и ключи API живут в общем кэше и
+    памяти процесса, поэтому перед каждым тестом они сбрасываются.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        load_fixtures()
+        cls.admin = create_user("admin@example.com", ADMIN_ROLE_ID)
+        cls.user = create_user("user@example.com", USER_ROLE_ID)
+
+    def setUp(self):
+        cache.clear()
+        api_key_cache._entries.clear()
+        access_matrix.invalidate()
@@ -0,0 +1,58 @@
+"""Ограничения ключей API (scopes) на эндпоинтах вне матрицы прав."""
+
+from custom_auth.api_keys import generate_key
+from custom_auth.models import APIKey, User
+from custom_auth.tests.factories import AuthTestCase
+
+
+class APIKeyScopeTests(AuthTestCase):
+    """Ключ администратора с ограничениями получает только разрешенное."""
+
+    def issue_key(self, scopes):
+        """Создает ключ администратора и возвращает заголовок Authorization."""
+        raw_key, prefix, secret_hash = generate_key()
+        APIKey.objects.create(
+            user=self.admin, name=prefix, prefix=prefix,
+            secret_hash=secret_hash, scopes=scopes,
+        )
+        return {"HTTP_AUTHORIZATION": f"Api-Key {raw_key}"}
+
+    def test_scoped_admin_key_is_denied_rules(self):
+        headers = self.issue_key(["products:read"])
+        self.assertEqual(self.client.get("/api/rules/", **headers).status_code, 403)
+        response = self.client.post(
+            "/api/rules/bulk/", {"rules": []}, content_type="application/json", **headers
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_scoped_key_is_denied_profile(self):
+        headers = self.issue_key(["products:read"])
+        response = self.client.patch(
+            "/api/profile/", {"first_name": "X"}, content_type="application/json",
+            **headers,
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.delete("/api/profile/", **headers).status_code, 403)
+        self.assertTrue(User.objects.get(pk=self.admin.pk).is_active)
+
+    def test_scoped_key_keeps_its_scope(self):
+        headers = self.issue_key(["products:read"])
+        self.assertEqual(self.client.get("/business/products/", **headers).status_code, 200)
+        response = self.client.post(
+            "/business/products/", {"name": "P", "price": "1.00"},
+            content_type="application/json", **headers,
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_explicit_view_scope_allows_rules(self):
+        headers = self.issue_key(["rules:read"])
+        self.assertEqual(self.client.get("/api/rules/", **headers).status_code, 200)
+        response = self.client.post(
+            "/api/rules/bulk/", {"rules": []}, content_type="application/json", **headers
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_unscoped_key_has_owner_rights(self):
+        headers = self.issue_key([])
+        self.assertEqual(self.client.get("/api/rules/", **headers).status_code, 200)
+        self.assertEqual(self.client.get("/api/profile/", **headers).status_code, 200)
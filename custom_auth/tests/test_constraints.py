@@ -0,0 +1,29 @@
+"""Ограничения уникальности правил доступа и email."""
+
+from django.db import IntegrityError, transaction
+
+from custom_auth.models import AccessRule
+from custom_auth.serializers import AccessRuleBulkSerializer
+from custom_auth.tests.factories import USER_ROLE_ID, AuthTestCase, create_user
+
+
+class ConstraintTests(AuthTestCase):
+    """Уникальность обеспечивают user_email_lower_uniq и accessrule_role_element_uniq."""
+
+    def test_bulk_upsert_updates_existing_rule(self):
+        serializer = AccessRuleBulkSerializer(
+            data={"rules": [
+                {"role_id": USER_ROLE_ID, "element_id": 2, "create_permission": True}
+            ]}
+        )
+        serializer.is_valid(raise_exception=True)
+        self.assertEqual(serializer.save()["updated"], 1)
+        self.assertTrue(AccessRule.objects.get(role_id=USER_ROLE_ID, element_id=2).create_permission)
+
+    def test_duplicate_rule_is_rejected(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            AccessRule.objects.create(role_id=USER_ROLE_ID, element_id=2)
+
+    def test_email_is_unique_ignoring_case(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            create_user("User@Example.com")
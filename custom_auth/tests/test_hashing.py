@@ -0,0 +1,45 @@
+"""Перегрузка пула хеширования паролей: доменная ошибка и ответ 503."""
+
+from unittest import mock
+
+from custom_auth.hashing import PasswordHashingUnavailable, PasswordHashPool
+from custom_auth.models import User
+from custom_auth.tests.factories import PASSWORD, AuthTestCase
+
+
+class PasswordHashPoolTests(AuthTestCase):
+    """Пул отклоняет задачи сверх workers + max_pending."""
+
+    def setUp(self):
+        super().setUp()
+        self.full_pool = PasswordHashPool(1, 0)
+        # Единственный слот занят другим запросом
+        self.full_pool._slots.acquire()
+
+    def test_set_password_raises_domain_error(self):
+        with mock.patch("custom_auth.hashing.pool", self.full_pool):
+            with self.assertRaises(PasswordHashingUnavailable):
+                self.user.set_password("new-password")
+        self.assertEqual(self.full_pool.rejected, 1)
+
+    def test_register_returns_503(self):
+        with mock.patch("custom_auth.hashing.pool", self.full_pool):
+            response = self.client.post(
+                "/api/register/",
+                {"email": "new@example.com", "password": PASSWORD,
+                 "first_name": "A", "last_name": "B"},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(User.objects.for_email("new@example.com").exists())
+
+    def test_login_returns_503(self):
+        with mock.patch("custom_auth.hashing.pool", self.full_pool):
+            response = self.client.post(
+                "/api/login/",
+                {"email": self.user.email, "password": PASSWORD},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
@@ -0,0 +1,43 @@
+"""Импорт пользователей: email, занятый между проверкой и вставкой."""
+
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+
+from custom_auth.management.commands.import_users import Command
+from custom_auth.models import User
+from custom_auth.tests.factories import AuthTestCase
+
+
+class ImportRaceTests(AuthTestCase):
+    """Конфликт при вставке не прерывает импорт и попадает в отчет."""
+
+    def test_conflicting_row_is_reported(self):
+        temporary = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary.cleanup)
+        directory = Path(temporary.name)
+        path = directory / "users.jsonl"
+        password_hash = make_password("password")
+        path.write_text("".join(
+            json.dumps({"email": email, "first_name": "C", "last_name": "D",
+                        "password_hash": password_hash}) + "\n"
+            for email in ("new@example.com", "User@example.com")
+        ))
+
+        # Проверка не увидела email: его заняли уже после нее
+        with mock.patch.object(Command, "taken_emails", return_value=set()):
+            call_command("import_users", str(path), workers=1, stdout=StringIO())
+
+        self.assertTrue(User.objects.for_email("new@example.com").exists())
+        errors = [
+            json.loads(line)
+            for line in (directory / "users.jsonl.errors.jsonl").read_text().splitlines()
+        ]
+        self.assertEqual(
+            errors, [{"line": 2, "email": "User@example.com", "errors": ["Email уже занят."]}]
+        )
@@ -0,0 +1,51 @@
+"""Лимит неудачных входов: IP клиента за прокси и истекшие блокировки."""
+
+import time
+
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from custom_auth.login_throttle import LoginThrottle, client_ip
+
+
+class ClientIPTests(SimpleTestCase):
+    """IP берется из X-Forwarded-For только за доверенными прокси."""
+
+    def request(self, forwarded_for):
+        return RequestFactory().post(
+            "/api/login/", REMOTE_ADDR="10.0.0.1",
+            HTTP_X_FORWARDED_FOR=forwarded_for,
+        )
+
+    def test_header_is_ignored_without_proxies(self):
+        request = self.request("203.0.113.7")
+        with override_settings(REST_FRAMEWORK={"NUM_PROXIES": 0}):
+            self.assertEqual(client_ip(request), "10.0.0.1")
+
+    def test_address_added_by_trusted_proxy(self):
+        # Первую запись клиент подставил сам, вторую добавил nginx
+        request = self.request("198.51.100.1, 203.0.113.7")
+        with override_settings(REST_FRAMEWORK={"NUM_PROXIES": 1}):
+            self.assertEqual(client_ip(request), "203.0.113.7")
+
+
+class BlockedPruneTests(SimpleTestCase):
+    """Блокировки ключей, которые больше не проверяются, не копятся."""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_expired_blocks_are_evicted(self):
+        throttle = LoginThrottle(window=60, email_limit=1, ip_limit=100)
+        for number in range(10):
+            email = f"user{number}@example.com"
+            throttle.record_failure(email, None)
+            self.assertIsNotNone(throttle.check(email, None))
+        self.assertEqual(len(throttle._blocked), 10)
+
+        # Окно прошло, а эти email больше не приходили
+        for subject in throttle._blocked:
+            throttle._blocked[subject] = time.time() - 1
+        throttle._blocked_pruned_at -= throttle.window
+        throttle.check("other@example.com", None)
+        self.assertEqual(throttle._blocked, {})
@@ -0,0 +1,32 @@
+"""RequestMetricsMiddleware в синхронной и асинхронной цепочке."""
+
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+
+from custom_auth.middleware import RequestMetricsMiddleware
+from custom_auth.models import User
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    """Middleware считает SQL-запросы без переключения режима цепочки."""
+
+    def test_sync_chain(self):
+        def view(request):
+            User.objects.count()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        self.assertFalse(iscoroutinefunction(middleware))
+        response = middleware(RequestFactory().get("/"))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+    async def test_async_chain(self):
+        async def view(request):
+            await User.objects.acount()
+            return HttpResponse()
+
+        middleware = RequestMetricsMiddleware(view)
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(AsyncRequestFactory().get("/"))
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
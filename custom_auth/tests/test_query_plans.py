@@ -0,0 +1,32 @@
+"""Планы горячих запросов (check_query_plans) на тестовой БД."""
+
+import unittest
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection, transaction
+
+from custom_auth.access_matrix import PERMISSION_FIELDS
+from custom_auth.management.commands.check_query_plans import CHECKS
+from custom_auth.models import AccessRule
+from custom_auth.tests.factories import AuthTestCase
+
+
+class QueryPlanTests(AuthTestCase):
+    """Запросы входа, аутентификации и прав используют ожидаемые индексы."""
+
+    def test_check_query_plans_passes(self):
+        out = StringIO()
+        call_command("check_query_plans", stdout=out)
+        for name in CHECKS:
+            self.assertIn(f"{name}: OK", out.getvalue())
+
+    @unittest.skipUnless(connection.vendor == "postgresql", "INCLUDE есть только в PostgreSQL")
+    def test_access_rule_is_index_only_scan(self):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute("SET LOCAL enable_bitmapscan = off")
+            plan = AccessRule.objects.filter(role_id=1, element_id=1).values(
+                *PERMISSION_FIELDS
+            ).explain()
+        self.assertIn("Index Only Scan using accessrule_role_element_uniq", plan)
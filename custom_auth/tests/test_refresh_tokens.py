@@ -0,0 +1,64 @@
+"""Refresh-токены: повторное использование и удаление истекших."""
+
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from custom_auth.models import RefreshToken
+from custom_auth.tests.factories import AuthTestCase, create_user
+from custom_auth.tokens import issue_access_token, issue_refresh_token
+
+
+class RefreshTokenReuseTests(AuthTestCase):
+    """Повторный обмен refresh-токена отзывает и access-токены."""
+
+    def refresh(self, raw_token):
+        return self.client.post(
+            "/api/token/refresh/", {"refresh": raw_token},
+            content_type="application/json",
+        )
+
+    def assert_reuse_revokes_access_tokens(self):
+        stolen = issue_refresh_token(self.user)
+        response = self.refresh(stolen)
+        self.assertEqual(response.status_code, 200)
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {response.json()['token']}"}
+        self.assertEqual(self.client.get("/api/profile/", **headers).status_code, 200)
+
+        self.assertEqual(self.refresh(stolen).status_code, 401)
+        self.assertEqual(self.client.get("/api/profile/", **headers).status_code, 403)
+        self.assertEqual(self.refresh(response.json()["refresh"]).status_code, 401)
+
+    def test_reuse_revokes_access_tokens(self):
+        self.assert_reuse_revokes_access_tokens()
+
+    @override_settings(JWT_STATELESS_AUTH=True)
+    def test_reuse_revokes_stateless_access_tokens(self):
+        self.assert_reuse_revokes_access_tokens()
+
+    def test_other_users_tokens_stay_valid(self):
+        other = create_user("other@example.com")
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {issue_access_token(other)}"}
+        stolen = issue_refresh_token(self.user)
+        self.refresh(stolen)
+        self.refresh(stolen)
+        self.assertEqual(self.client.get("/api/profile/", **headers).status_code, 200)
+
+
+class PurgeRefreshTokensTests(AuthTestCase):
+    """purge_refresh_tokens удаляет только истекшие токены."""
+
+    def test_purge_deletes_expired_only(self):
+        issue_refresh_token(self.user)
+        issue_refresh_token(self.user)
+        RefreshToken.objects.filter(
+            pk=RefreshToken.objects.first().pk
+        ).update(expires_at=timezone.now() - timedelta(seconds=1))
+
+        out = StringIO()
+        call_command("purge_refresh_tokens", stdout=out)
+        self.assertIn("1", out.getvalue())
+        self.assertEqual(RefreshToken.objects.count(), 1)
@@ -0,0 +1,45 @@
+"""Кэш ответов списков: версия данных при отказе общего кэша."""
+
+from unittest import mock
+
+from rest_framework.test import APIRequestFactory
+
+from custom_auth.models import User
+from custom_auth.response_cache import get_data_version
+from custom_auth.tests.factories import AuthTestCase
+from custom_auth.tokens import issue_access_token
+
+from business.views import ProductListView
+
+
+class DataVersionFailureTests(AuthTestCase):
+    """Кэш не сохраняет версию: список отдается без ошибки и без 304."""
+
+    def setUp(self):
+        super().setUp()
+        # Кэш недоступен: чтение ничего не находит, запись не проходит
+        patcher = mock.patch("custom_auth.response_cache.cache")
+        self.cache = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.cache.get.return_value = None
+        self.cache.add.return_value = False
+
+    def get(self, **headers):
+        request = APIRequestFactory().get(
+            "/business/products/",
+            HTTP_AUTHORIZATION=f"Bearer {issue_access_token(self.admin)}",
+            **headers,
+        )
+        return ProductListView.as_view()(request)
+
+    def test_version_falls_back_to_new_value(self):
+        version, modified = get_data_version(User)
+        self.assertTrue(version)
+        self.assertIsInstance(modified, float)
+
+    def test_list_is_served_and_never_not_modified(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("ETag", response)
+        response = self.get(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 200)
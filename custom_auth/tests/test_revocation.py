@@ -0,0 +1,78 @@
+"""Синхронизация denylist отозванных токенов между воркерами."""
+
+import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from custom_auth.revocation import (
+    ENTRY_KEY,
+    EPOCH_KEY,
+    MARK_BUCKET,
+    MARK_KEY,
+    SEQUENCE_KEY,
+    RevocationList,
+)
+
+
+class RevocationListTests(SimpleTestCase):
+    """Отзывы одного воркера видны другому после sync."""
+
+    def setUp(self):
+        cache.clear()
+        self.exp = time.time() + 600
+
+    def test_revoke_is_visible_to_other_worker(self):
+        RevocationList(0).revoke("a", self.exp)
+        self.assertTrue(RevocationList(0).is_revoked("a"))
+
+    def test_entry_written_after_sync_is_not_skipped(self):
+        other = RevocationList(0)
+        # Номер уже выдан, а запись еще не сделана
+        cache.set(SEQUENCE_KEY, 1, None)
+        cache.set(MARK_KEY.format(int(time.time() // MARK_BUCKET)), 1, 600)
+        other.sync()
+        self.assertFalse(other.is_revoked("late"))
+        cache.set(ENTRY_KEY.format(1), ("late", self.exp), 600)
+        self.assertTrue(other.is_revoked("late"))
+
+    def test_duplicate_sequence_does_not_overwrite_entry(self):
+        RevocationList(0).revoke("first", self.exp)
+        # Неатомарный incr (get + set) вернул тот же номер второму воркеру
+        incr = cache.incr
+        results = iter([1])
+        with mock.patch.object(
+            cache, "incr", side_effect=lambda key: next(results, None) or incr(key)
+        ):
+            RevocationList(0).revoke("second", self.exp)
+        other = RevocationList(0)
+        self.assertTrue(other.is_revoked("first"))
+        self.assertTrue(other.is_revoked("second"))
+
+    def test_sync_after_cache_clear_rereads_entries(self):
+        worker = RevocationList(0)
+        for jti in ("a", "b", "c"):
+            worker.revoke(jti, self.exp)
+        other = RevocationList(0)
+        other.sync()
+        cache.clear()
+        # После очистки счетчик снова дорос до прежнего значения
+        for jti in ("d", "e", "f"):
+            worker.revoke(jti, self.exp)
+        for jti in ("d", "e", "f"):
+            self.assertTrue(other.is_revoked(jti))
+
+    def test_cold_sync_skips_expired_sequence_numbers(self):
+        # Сотни тысяч старых отзывов: записи и отметки интервалов истекли
+        cache.set(EPOCH_KEY, "old", None)
+        cache.set(SEQUENCE_KEY, 200_000, None)
+        RevocationList(0).revoke("live", self.exp)
+
+        worker = RevocationList(0)
+        with mock.patch.object(cache, "get_many", wraps=cache.get_many) as get_many:
+            worker.sync()
+        read = sum(len(call.args[0]) for call in get_many.call_args_list)
+        self.assertLess(read, 100)
+        self.assertTrue(worker.is_revoked("live"))
+        self.assertEqual(worker._pending, {})
@@ -0,0 +1,19 @@
+"""Загрузка фикстур (load_fixtures)."""
+
+from custom_auth.models import BusinessElement, Role
+from custom_auth.seed import load_fixtures
+from custom_auth.tests.factories import AuthTestCase
+
+
+class LoadFixturesTests(AuthTestCase):
+    """Фикстуры с явными id не ломают последующие create()."""
+
+    def test_create_after_load_fixtures(self):
+        role = Role.objects.create(name="Auditor")
+        element = BusinessElement.objects.create(name="reports")
+        self.assertGreater(role.pk, 3)
+        self.assertGreater(element.pk, 3)
+
+    def test_load_fixtures_is_idempotent(self):
+        result = load_fixtures()
+        self.assertTrue(all(added == 0 for _, added in result.values()))
@@ -0,0 +1,276 @@
+"""Выпуск и проверка JWT access-токенов и refresh-токенов."""
+
+import hashlib
+import secrets
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+
+import jwt
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from custom_auth import security_versions
+from custom_auth.signing_keys import get_key_set
+
+
+def issue_access_token(user):
+    """Создает access-токен для пользователя.
+
+    Помимо идентификатора в токен кладутся role_id и версия безопасности
+    пользователя (sv), чтобы JWTAuthentication мог работать без запроса
+    к БД (см. JWT_STATELESS_AUTH), и уникальный jti для отзыва при выходе.
+
+    Args:
+        user: Пользователь, для которого выпускается токен
+
+    Returns:
+        str: Подписанный JWT
+    """
+    # Создаем JWT с правильным форматом временных меток
+    now = timezone.now()
+    exp = int((now + timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME)).timestamp())
+    iat = int(now.timestamp())
+
+    payload = {
+        "user_id": user.id,
+        "role_id": user.role_id,
+        "sv": user.security_version,
+        "jti": uuid.uuid4().hex,
+        "exp": exp,
+        "iat": iat,
+    }
+    key_set = get_key_set()
+    return jwt.encode(
+        payload,
+        key_set.signing_key,
+        algorithm=key_set.algorithm,
+        headers=key_set.headers(),
+    )
+
+
+class DecodedTokenCache:
+    """Ограниченный LRU-кэш уже проверенных токенов в памяти процесса.
+
+    Клиенты используют один и тот же токен в течение всего срока его
+    действия, поэтому повторная проверка HMAC и разбор JSON заменяются
+    поиском в словаре. Запись удаляется по достижении claim "exp" токена.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token):
+        """Возвращает payload токена или None, если его нет в кэше.
+
+        Args:
+            token: Строка JWT
+
+        Returns:
+            dict | None: Ранее проверенная полезная нагрузка
+        """
+        with self._lock:
+            payload = self._entries.get(token)
+            if payload is not None:
+                if payload["exp"] > time.time():
+                    self._entries.move_to_end(token)
+                    self.hits += 1
+                    return payload
+                del self._entries[token]
+            self.misses += 1
+            return None
+
+    def set(self, token, payload):
+        """Сохраняет проверенный payload, вытесняя самую старую запись.
+
+        Args:
+            token: Строка JWT
+            payload: Полезная нагрузка с claim "exp"
+        """
+        if "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[token] = payload
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Очищает кэш и счетчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        """Возвращает счетчики попаданий и размер кэша.
+
+        Returns:
+            dict: hits, misses, size, maxsize
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+decoded_token_cache = DecodedTokenCache(settings.JWT_DECODE_CACHE_SIZE)
+
+
+def decode_access_token(token):
+    """Проверяет подпись и срок действия токена.
+
+    Уже проверенные токены берутся из decoded_token_cache
+    (отключается через JWT_DECODE_CACHE_SIZE=0).
+
+    Args:
+        token: Строка JWT
+
+    Returns:
+        dict: Полезная нагрузка токена
+
+    Raises:
+        jwt.ExpiredSignatureError: если срок действия истек
+        jwt.InvalidTokenError: если токен недействителен
+    """
+    use_cache = decoded_token_cache.maxsize > 0
+    if use_cache:
+        payload = decoded_token_cache.get(token)
+        if payload is not None:
+            return payload
+
+    key_set = get_key_set()
+    key = key_set.verification_key(jwt.get_unverified_header(token).get("kid"))
+    if key is None:
+        raise jwt.InvalidTokenError("Неизвестный ключ подписи (kid).")
+    payload = jwt.decode(
+        token, key, algorithms=[key_set.algorithm], options={"verify_exp": True}
+    )
+    if use_cache:
+        decoded_token_cache.set(token, payload)
+    return payload
+
+
+class InvalidRefreshToken(Exception):
+    """Refresh-токен не найден, истек, отозван или уже использован."""
+
+
+def _hash_refresh_token(raw_token):
+    """Возвращает SHA-256 хеш refresh-токена для хранения и поиска."""
+    return hashlib.sha256(raw_token.encode()).hexdigest()
+
+
+def issue_refresh_token(user, family=None):
+    """Создает одноразовый refresh-токен.
+
+    Токен – случайная строка; в БД сохраняется только его хеш.
+
+    Args:
+        user: Владелец токена
+        family: Семейство токенов (None – новое семейство при логине)
+
+    Returns:
+        str: Refresh-токен для передачи клиенту
+    """
+    from custom_auth.models import RefreshToken
+
+    raw_token = secrets.token_urlsafe(32)
+    RefreshToken.objects.create(
+        user=user,
+        token_hash=_hash_refresh_token(raw_token),
+        family=family or uuid.uuid4(),
+        expires_at=timezone.now()
+        + timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME),
+    )
+    return raw_token
+
+
+def rotate_refresh_token(raw_token):
+    """Обменивает refresh-токен на новую пару токенов.
+
+    Токен помечается использованным условным UPDATE, поэтому два
+    параллельных обмена одного токена не могут оба завершиться успешно.
+    Повторное использование уже обмененного токена считается признаком
+    кражи: отзывается все семейство, а версия безопасности пользователя
+    увеличивается, чтобы выпущенные по украденной цепочке access-токены
+    тоже перестали приниматься.
+
+    Args:
+        raw_token: Refresh-токен от клиента
+
+    Returns:
+        tuple: (access-токен, новый refresh-токен)
+
+    Raises:
+        InvalidRefreshToken: если токен недействителен
+    """
+    from custom_auth.models import RefreshToken
+
+    now = timezone.now()
+    try:
+        token = RefreshToken.objects.select_related("user").get(
+            token_hash=_hash_refresh_token(raw_token)
+        )
+    except RefreshToken.DoesNotExist as e:
+        raise InvalidRefreshToken("Refresh-токен не найден.") from e
+
+    if token.revoked_at is not None:
+        raise InvalidRefreshToken("Refresh-токен отозван.")
+    if token.expires_at <= now:
+        raise InvalidRefreshToken("Срок действия refresh-токена истек.")
+    if not token.user.is_active:
+        raise InvalidRefreshToken("Пользователь не найден или неактивен.")
+
+    with transaction.atomic():
+        claimed = RefreshToken.objects.filter(
+            pk=token.pk, used_at__isnull=True, revoked_at__isnull=True
+        ).update(used_at=now)
+        if claimed:
+            new_refresh = issue_refresh_token(token.user, family=token.family)
+
+    if not claimed:
+        revoke_refresh_family(token.family)
+        security_versions.bump(token.user_id)
+        raise InvalidRefreshToken(
+            "Refresh-токен уже использован; все сессии этого входа отозваны."
+        )
+
+    return issue_access_token(token.user), new_refresh
+
+
+def revoke_refresh_family(family):
+    """Отзывает все действующие refresh-токены семейства.
+
+    Args:
+        family: UUID семейства
+    """
+    from custom_auth.models import RefreshToken
+
+    RefreshToken.objects.filter(family=family, revoked_at__isnull=True).update(
+        revoked_at=timezone.now()
+    )
+
+
+def revoke_refresh_token(raw_token):
+    """Отзывает семейство, к которому относится refresh-токен (при выходе).
+
+    Args:
+        raw_token: Refresh-токен от клиента
+    """
+    from custom_auth.models import RefreshToken
+
+    family = (
+        RefreshToken.objects.filter(token_hash=_hash_refresh_token(raw_token))
+        .values_list("family", flat=True)
+        .first()
+    )
+    if family is not None:
+        revoke_refresh_family(family)
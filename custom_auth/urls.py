@@ -1,7 +1,20 @@
 """URL-маршруты для аутентификации и авторизации."""
 
+from django.conf import settings
 from django.urls import path
-from .views import RegisterView, ProfileView, LoginView, LogoutView, RuleViewSet
+from .metrics import metrics_view
+from .views import (
+    RegisterView,
+    ProfileView,
+    LoginView,
+    LogoutView,
+    PermissionsView,
+    RuleViewSet,
+    TokenRefreshView,
+)
+
+if settings.ASYNC_VIEWS:
+    from .async_views import AsyncLoginView as LoginView
 
 
 urlpatterns = [
@@ -9,12 +22,19 @@ urlpatterns = [
     path("profile/", ProfileView.as_view(), name="profile"),
     path("login/", LoginView.as_view(), name="login"),
     path("logout/", LogoutView.as_view(), name="logout"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
+    path("permissions/", PermissionsView.as_view(), name="permissions"),
     # Правила доступа (admin)
     path(
         "rules/",
         RuleViewSet.as_view({"get": "list", "post": "create"}),
         name="rule-list",
     ),
+    path(
+        "rules/bulk/",
+        RuleViewSet.as_view({"post": "bulk"}),
+        name="rule-bulk",
+    ),
     path(
         "rules/<int:pk>/",
         RuleViewSet.as_view(
@@ -27,3 +47,6 @@ urlpatterns = [
         name="rule-detail",
     ),
 ]
+
+if settings.REQUEST_METRICS_ENABLED:
+    urlpatterns.append(path("metrics/", metrics_view, name="metrics"))
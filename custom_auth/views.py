@@ -1,26 +1,51 @@
 """Представления приложения custom_auth."""
 
-from datetime import timedelta
-
-from django.utils import timezone
+from django.conf import settings
+from django.utils.http import parse_etags
 from rest_framework import generics, status, viewsets, permissions
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
-
+from rest_framework.views import APIView
+
+from .access_matrix import get_matrix
+from .authentication import get_user_instance
+from .hashing import (
+    PasswordHashingUnavailable,
+    make_password,
+    needs_rehash,
+    verify_password,
+)
+from .login_throttle import client_ip, login_throttle
 from .models import User, AccessRule
-from .serializers import UserSerializer, AccessRuleSerializer, LoginSerializer
-
-import jwt
-from django.conf import settings
+from .pagination import StreamingListMixin
+from .permissions import APIKeyScopePermission
+from .revocation import denylist
+from .signing_keys import get_key_set
+from .serializers import (
+    UserSerializer,
+    AccessRuleSerializer,
+    AccessRuleBulkSerializer,
+    LoginSerializer,
+    PermissionBatchSerializer,
+    TokenRefreshSerializer,
+)
+from .tokens import (
+    InvalidRefreshToken,
+    issue_access_token,
+    issue_refresh_token,
+    revoke_refresh_token,
+    rotate_refresh_token,
+)
 
 class IsAdminRole(permissions.BasePermission):
     """Проверяет, является ли пользователь администратором."""
 
     def has_permission(self, request, view):
-        return (
+        return bool(
             request.user
             and request.user.is_authenticated
-            and request.user.role
-            and request.user.role.name == "Admin"
+            and request.user.role_id
+            and get_matrix().is_admin(request.user.role_id)
         )
 
 class RegisterView(generics.CreateAPIView):
@@ -42,10 +67,12 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
 
     serializer_class = UserSerializer
     queryset = User.objects.all()
+    # Ключ API с ограничениями должен явно иметь profile:<действие>
+    api_key_scope = "profile"
 
     def get_object(self):
         """Возвращает текущего аутентифицированного пользователя."""
-        return self.request.user
+        return get_user_instance(self.request.user)
 
     def destroy(self, request, *args, **kwargs):
         """Мягкое удаление аккаунта.
@@ -65,7 +92,8 @@ class ProfileView(generics.RetrieveUpdateDestroyAPIView):
 class LoginView(generics.GenericAPIView):
     """Вход по email и паролю.
 
-    Возвращает JWT-токен для последующих запросов.
+    Возвращает JWT-токен для последующих запросов и refresh-токен
+    для его обновления через TokenRefreshView.
     """
 
     serializer_class = LoginSerializer
@@ -78,12 +106,14 @@ class LoginView(generics.GenericAPIView):
             request: HTTP-запрос с данными email и password
 
         Returns:
-            Response: Токен в случае успеха
+            Response: Access- и refresh-токен в случае успеха
 
         Status Codes:
             200: Успешная аутентификация
             400: Некорректные данные
             401: Неправильные учетные данные
+            429: Слишком много неудачных попыток (заголовок Retry-After)
+            503: Пул хеширования паролей перегружен
         """
         serializer = self.get_serializer(data=request.data)
         if not serializer.is_valid():
@@ -92,42 +122,216 @@ class LoginView(generics.GenericAPIView):
             )
 
         data = serializer.validated_data
+        ip = client_ip(request)
+        if settings.LOGIN_THROTTLE_ENABLED:
+            retry_after = login_throttle.check(data["email"], ip)
+            if retry_after is not None:
+                raise Throttled(wait=retry_after)
+
         try:
-            user = User.objects.get(email=data["email"])
+            user = User.objects.for_email(data["email"]).get()
             if not user.is_active:
                 return Response(
                     {"detail": "Account is inactive."},
                     status=status.HTTP_401_UNAUTHORIZED,
                 )
         except User.DoesNotExist:
+            self.record_failure(data["email"], ip)
             return Response(
                 {"detail": "User not found."},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        if not user.check_password(data["password"]):
+        if not verify_password(data["password"], user.password):
+            self.record_failure(data["email"], ip)
             return Response(
                 {"detail": "Incorrect password."},
                 status=status.HTTP_401_UNAUTHORIZED,
             )
 
-        # Создаем JWT с правильным форматом временных меток
-        now = timezone.now()
-        exp = int((now + timedelta(hours=1)).timestamp())
-        iat = int(now.timestamp())
+        if needs_rehash(user.password):
+            self.upgrade_password_hash(user, data["password"])
 
-        token = jwt.encode(
-            {"user_id": user.id, "exp": exp, "iat": iat},
-            settings.JWT_SECRET,
-            algorithm="HS256",
-        )
-        return Response({"token": token})
+        return Response({
+            "token": issue_access_token(user),
+            "refresh": issue_refresh_token(user),
+        })
+
+    def record_failure(self, email, ip):
+        """Учитывает неудачную попытку входа в лимите LOGIN_THROTTLE_*."""
+        if settings.LOGIN_THROTTLE_ENABLED:
+            login_throttle.record_failure(email, ip)
+
+    def upgrade_password_hash(self, user, raw_password):
+        """Пересчитывает хеш пароля по текущему профилю PASSWORD_HASH_PROFILE.
+
+        Выполняется одним UPDATE без вызова save(), чтобы не трогать
+        остальные поля. При перегрузке пула хеширования обновление
+        откладывается до следующего входа.
+
+        Args:
+            user: Пользователь, успешно прошедший проверку пароля
+            raw_password: Пароль в открытом виде
+        """
+        try:
+            user.password = make_password(raw_password)
+        except PasswordHashingUnavailable:
+            return
+        User.objects.filter(pk=user.pk).update(password=user.password)
+
+
+class TokenRefreshView(generics.GenericAPIView):
+    """Обмен refresh-токена на новую пару токенов без проверки пароля.
+
+    Refresh-токен одноразовый: при обмене выдается новый, а повторное
+    использование старого отзывает все токены, полученные с того же входа.
+    """
+
+    serializer_class = TokenRefreshSerializer
+    permission_classes = [permissions.AllowAny]
+    # Истекший access-токен в заголовке не должен мешать обновлению
+    authentication_classes = []
+
+    def post(self, request):
+        """Возвращает новый access-токен и новый refresh-токен.
+
+        Args:
+            request: HTTP-запрос с полем refresh
+
+        Returns:
+            Response: Новая пара токенов
+
+        Status Codes:
+            200: Токены обновлены
+            400: Некорректные данные
+            401: Refresh-токен недействителен, истек или уже использован
+        """
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            token, refresh = rotate_refresh_token(
+                serializer.validated_data["refresh"]
+            )
+        except InvalidRefreshToken as e:
+            return Response(
+                {"detail": str(e)}, status=status.HTTP_401_UNAUTHORIZED
+            )
+        return Response({"token": token, "refresh": refresh})
+
+
+class JWKSView(APIView):
+    """Открытые ключи проверки токенов в формате JWKS.
+
+    Позволяет другим сервисам и шлюзам проверять токены локально, не
+    обращаясь к этому приложению. Ответ кэшируется клиентами на
+    JWKS_CACHE_MAX_AGE секунд.
+    """
+
+    permission_classes = [permissions.AllowAny]
+    authentication_classes = []
+
+    def get(self, request):
+        """Возвращает набор открытых ключей.
+
+        Args:
+            request: HTTP-запрос
+
+        Returns:
+            Response: JWKS ({"keys": [...]})
+        """
+        response = Response(get_key_set().jwks())
+        response["Cache-Control"] = f"public, max-age={settings.JWKS_CACHE_MAX_AGE}"
+        return response
+
+
+class PermissionsView(generics.GenericAPIView):
+    """Эффективные права текущего пользователя для отрисовки интерфейса.
+
+    GET возвращает все права роли пользователя с сильным ETag, который
+    меняется только при изменении правил этой роли; клиент перепроверяет
+    кэш через If-None-Match и получает 304. POST проверяет пакет пар
+    (элемент, действие) за один запрос. Права берутся из матрицы в памяти.
+    """
+
+    serializer_class = PermissionBatchSerializer
+    api_key_scope = "permissions"
+    # POST только проверяет права, поэтому это чтение, а не create
+    required_permission = "read"
+
+    def get(self, request):
+        """Возвращает карту прав роли пользователя.
+
+        Args:
+            request: HTTP-запрос
+
+        Returns:
+            Response: {"role": ..., "permissions": {элемент: {действие: bool}}}
+
+        Status Codes:
+            200: Карта прав
+            304: Права не изменились с If-None-Match
+        """
+        matrix = get_matrix()
+        role_id = request.user.role_id
+        permissions, digest = matrix.role_permissions(role_id)
+        etag = f'"{digest}"'
+
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match and (
+            if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+        ):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response({
+                "role": matrix.role_names.get(role_id),
+                "permissions": permissions,
+            })
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+    def post(self, request):
+        """Проверяет пакет прав.
+
+        Args:
+            request: HTTP-запрос с полем checks: [{"element", "action"}, ...]
+
+        Returns:
+            Response: {"results": [{"element", "action", "allowed"}, ...]}
+
+        Status Codes:
+            200: Результаты в порядке запроса
+            400: Некорректные данные
+        """
+        serializer = self.get_serializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        matrix = get_matrix()
+        role_id = request.user.role_id
+        is_admin = bool(role_id) and matrix.is_admin(role_id)
+        results = []
+        for check in serializer.validated_data["checks"]:
+            element_id = matrix.element_id(check["element"])
+            allowed = bool(role_id) and element_id is not None and (
+                is_admin or matrix.allows(role_id, element_id, check["action"])
+            )
+            results.append({**check, "allowed": allowed})
+        return Response({"results": results})
 
 
 class LogoutView(generics.GenericAPIView):
     """Выход из системы.
 
-    Технически, клиент должен удалить токен на своей стороне.
+    Отзывает текущий access-токен по его jti: до истечения срока действия
+    токен отклоняется JWTAuthentication во всех воркерах. Если в теле
+    передан refresh, отзываются и все refresh-токены этого входа.
     """
 
     def post(self, request):
@@ -139,17 +343,50 @@ class LogoutView(generics.GenericAPIView):
         Returns:
             Response: Пустой ответ с кодом 200
         """
+        # Для запросов с ключом API request.auth – не payload токена
+        payload = request.auth if isinstance(request.auth, dict) else {}
+        if payload.get("jti") and payload.get("exp"):
+            denylist.revoke(payload["jti"], payload["exp"])
+        refresh = request.data.get("refresh")
+        if isinstance(refresh, str) and refresh:
+            revoke_refresh_token(refresh)
         return Response(status=status.HTTP_200_OK)
 
 
-class RuleViewSet(viewsets.ModelViewSet):
+class RuleViewSet(StreamingListMixin, viewsets.ModelViewSet):
     """CRUD для правил доступа.
 
-    Доступно только администраторам.
+    Доступно только администраторам. Список отдается постранично
+    или потоком (?stream=true).
     """
 
     queryset = AccessRule.objects.all()
     serializer_class = AccessRuleSerializer
-    permission_classes = [permissions.IsAuthenticated, IsAdminRole]
+    permission_classes = [
+        permissions.IsAuthenticated, IsAdminRole, APIKeyScopePermission,
+    ]
+    api_key_scope = "rules"
+
+    def bulk(self, request):
+        """Создает или обновляет пакет правил одной транзакцией.
+
+        Args:
+            request: HTTP-запрос с полем rules: [{role_id, element_id, ...}, ...]
+
+        Returns:
+            Response: {"created": n, "updated": n, "unchanged": n}
+
+        Status Codes:
+            200: Правила применены
+            400: Некорректные данные или несуществующие роли/элементы
+        """
+        serializer = AccessRuleBulkSerializer(
+            data=request.data, context=self.get_serializer_context()
+        )
+        if not serializer.is_valid():
+            return Response(
+                serializer.errors, status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(serializer.save())
 
 
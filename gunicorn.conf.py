@@ -0,0 +1,70 @@
+"""Конфигурация gunicorn для production-запуска.
+
+Запуск: gunicorn -c gunicorn.conf.py
+Все параметры переопределяются переменными окружения GUNICORN_*.
+"""
+
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Число воркеров по умолчанию – классическая формула 2 * CPU + 1
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+# gthread по умолчанию: пока одни потоки ждут пул хеширования паролей,
+# остальные обслуживают дешевые запросы (см. custom_auth/hashing.py)
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# При ASYNC_VIEWS=True приложение обслуживается как ASGI через uvicorn-воркеры,
+# иначе – как WSGI (gthread, если задано больше одного потока)
+if os.getenv('ASYNC_VIEWS', 'False') == 'True':
+    wsgi_app = 'project.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'project.wsgi:application'
+    worker_class = 'gthread' if threads > 1 else 'sync'
+
+# Django загружается один раз в master-процессе и копируется в воркеры
+# через fork: быстрый старт воркеров и экономия памяти (copy-on-write)
+preload_app = True
+
+# Плавный перезапуск воркеров для защиты от утечек памяти; jitter не дает
+# всем воркерам перезапуститься одновременно
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '10000'))
+max_requests_jitter = int(os.getenv('GUNICORN_MAX_REQUESTS_JITTER', '1000'))
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', '30'))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', '5'))
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+
+def on_starting(server):
+    """Не запускаемся с кэшем в памяти процесса и несколькими воркерами.
+
+    Через общий кэш воркеры согласуют матрицу прав, версии безопасности,
+    отозванные токены, счетчики неудачных входов и версии данных кэша
+    ответов. С LocMemCache у каждого воркера свой кэш, и, например,
+    токен, отозванный в одном воркере, принимается другим.
+    """
+    from django.conf import settings
+
+    backend = settings.CACHES['default']['BACKEND']
+    if server.cfg.workers > 1 and backend.endswith('LocMemCache'):
+        server.log.error(
+            'CACHE_BACKEND=locmem не общий для %s воркеров: задайте '
+            'CACHE_BACKEND=redis (или file на одном узле) либо GUNICORN_WORKERS=1',
+            server.cfg.workers,
+        )
+        raise SystemExit(1)
+
+
+def post_fork(server, worker):
+    """Не даем воркерам унаследовать соединения с БД из master-процесса."""
+    from django.db import connections
+
+    connections.close_all()
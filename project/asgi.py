@@ -10,3 +10,12 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 
 application = get_asgi_application()
+
+# Эндпоинт решений авторизации для auth_request обслуживается до Django
+from custom_auth.authz import AuthzASGIMiddleware  # noqa: E402
+from project.warmup import warm_up  # noqa: E402
+
+application = AuthzASGIMiddleware(application)
+
+# Маршруты, сериализаторы и права загружаются до первого запроса
+warm_up()
@@ -11,11 +11,116 @@ SECRET_KEY = os.getenv('SECRET_KEY', 'fallback-secret')
 DEBUG = os.getenv('DEBUG', 'False') == 'True'
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', '').split(',')
 
+# Профиль запуска: full – полный набор приложений (админка, сессии,
+# шаблоны); api – только то, что нужно /api/ и /business/ (см. ниже)
+DJANGO_PROFILE = os.getenv('DJANGO_PROFILE', 'full')
+# Прогрев маршрутов, сериализаторов и прав при загрузке воркера
+# (см. project/warmup.py)
+WARMUP_ENABLED = os.getenv('WARMUP_ENABLED', 'True') == 'True'
+
 # --------------------------------------------------------------------
 # Добавляем JWT_SECRET (критически важно!)
 # --------------------------------------------------------------------
 JWT_SECRET = os.getenv('JWT_SECRET', 'fallback_jwt_secret')
 
+# Алгоритм подписи токенов: HS256 (общий секрет JWT_SECRET) или
+# RS256/EdDSA с ключами из JWT_KEYS_DIR (см. custom_auth/signing_keys.py);
+# открытые ключи публикуются в /.well-known/jwks.json
+JWT_ALGORITHM = os.getenv('JWT_ALGORITHM', 'HS256')
+JWT_KEYS_DIR = os.getenv('JWT_KEYS_DIR', '')
+JWT_ACTIVE_KID = os.getenv('JWT_ACTIVE_KID', '')
+JWKS_CACHE_MAX_AGE = int(os.getenv('JWKS_CACHE_MAX_AGE', '300'))
+
+# Время жизни токенов, секунды: короткий access-токен обновляется через
+# /api/token/refresh/ без повторной проверки пароля
+JWT_ACCESS_TOKEN_LIFETIME = int(os.getenv('JWT_ACCESS_TOKEN_LIFETIME', '900'))
+JWT_REFRESH_TOKEN_LIFETIME = int(
+    os.getenv('JWT_REFRESH_TOKEN_LIFETIME', str(14 * 24 * 3600))
+)
+
+# Быстрый режим аутентификации: пользователь собирается из claims токена
+# (role_id, sv) без запроса к БД. Деактивация и смена роли отзывают токены
+# через версию безопасности в общем кэше (см. CACHES ниже)
+JWT_STATELESS_AUTH = os.getenv('JWT_STATELESS_AUTH', 'False') == 'True'
+# Размер LRU-кэша уже проверенных токенов в каждом воркере (0 – отключить)
+JWT_DECODE_CACHE_SIZE = int(os.getenv('JWT_DECODE_CACHE_SIZE', '1024'))
+# Как часто (в секундах) воркер подтягивает из общего кэша токены,
+# отозванные при выходе в других воркерах
+JWT_REVOCATION_SYNC_INTERVAL = float(
+    os.getenv('JWT_REVOCATION_SYNC_INTERVAL', '1.0')
+)
+# Сколько секунд версия безопасности пользователя хранится в кэше
+USER_SECURITY_VERSION_CACHE_TTL = int(
+    os.getenv('USER_SECURITY_VERSION_CACHE_TTL', '300')
+)
+
+# Ключи API сервисных аккаунтов: секрет HMAC для хеша ключей и сколько
+# секунд проверенный ключ хранится в памяти воркера (задержка отзыва)
+API_KEY_SECRET = os.getenv('API_KEY_SECRET', SECRET_KEY)
+API_KEY_CACHE_TTL = int(os.getenv('API_KEY_CACHE_TTL', '60'))
+
+# Префикс эндпоинта решений авторизации для auth_request nginx/envoy
+# (см. custom_auth/authz.py); пустое значение отключает эндпоинт
+AUTHZ_PATH = os.getenv('AUTHZ_PATH', '/authz/')
+
+# --------------------------------------------------------------------
+# Пул хеширования паролей: число потоков и максимальная очередь,
+# сверх которой логин/регистрация сразу получают 503. Пул считается на
+# процесс: под ASGI размер зависит от CPU, а под gthread – от числа потоков
+# воркера (GUNICORN_THREADS), чтобы хеширование занимало не больше трех
+# четвертей потоков и отказ 503 был достижим. Sync-воркер (один поток)
+# не изолирует хеширование от остальных запросов
+# --------------------------------------------------------------------
+if os.getenv('ASYNC_VIEWS', 'False') == 'True':
+    _HASH_WORKERS_DEFAULT = os.cpu_count() or 1
+    _HASH_QUEUE_DEFAULT = _HASH_WORKERS_DEFAULT * 4
+else:
+    _REQUEST_THREADS = int(os.getenv('GUNICORN_THREADS', '4'))
+    _HASH_WORKERS_DEFAULT = max(1, _REQUEST_THREADS // 2)
+    _HASH_QUEUE_DEFAULT = _REQUEST_THREADS // 4
+PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', _HASH_WORKERS_DEFAULT))
+PASSWORD_HASH_QUEUE_SIZE = int(
+    os.getenv('PASSWORD_HASH_QUEUE_SIZE', _HASH_QUEUE_DEFAULT)
+)
+
+# --------------------------------------------------------------------
+# Ограничение неудачных входов (скользящее окно, секунды) на email и на
+# IP; проверяется до поиска пользователя и хеширования пароля, при
+# превышении – 429 с Retry-After (см. custom_auth/login_throttle.py)
+# --------------------------------------------------------------------
+LOGIN_THROTTLE_ENABLED = os.getenv('LOGIN_THROTTLE_ENABLED', 'True') == 'True'
+LOGIN_THROTTLE_WINDOW = int(os.getenv('LOGIN_THROTTLE_WINDOW', '300'))
+LOGIN_THROTTLE_EMAIL_LIMIT = int(os.getenv('LOGIN_THROTTLE_EMAIL_LIMIT', '5'))
+LOGIN_THROTTLE_IP_LIMIT = int(os.getenv('LOGIN_THROTTLE_IP_LIMIT', '50'))
+# Максимум локальных счетчиков, если общий кэш недоступен
+LOGIN_THROTTLE_LOCAL_SIZE = int(os.getenv('LOGIN_THROTTLE_LOCAL_SIZE', '100000'))
+
+# --------------------------------------------------------------------
+# Профиль хеширования паролей: алгоритм (pbkdf2_sha256 | bcrypt_sha256)
+# и его стоимость. Пароли, хешированные по другому профилю, пересчитываются
+# при следующем успешном входе (см. manage.py hash_profiles)
+# --------------------------------------------------------------------
+PASSWORD_HASH_PROFILE = {
+    'ALGORITHM': os.getenv('PASSWORD_HASH_ALGORITHM', 'pbkdf2_sha256'),
+    'ITERATIONS': int(os.getenv('PASSWORD_HASH_ITERATIONS', '600000')),
+    'BCRYPT_ROUNDS': int(os.getenv('PASSWORD_HASH_BCRYPT_ROUNDS', '12')),
+}
+
+_PROFILE_HASHERS = {
+    'pbkdf2_sha256': 'custom_auth.hashers.ProfilePBKDF2PasswordHasher',
+    'bcrypt_sha256': 'custom_auth.hashers.ProfileBCryptSHA256PasswordHasher',
+}
+
+# Первый хешер используется для новых паролей, остальные – для проверки старых
+PASSWORD_HASHERS = [_PROFILE_HASHERS[PASSWORD_HASH_PROFILE['ALGORITHM']]] + [
+    hasher
+    for algorithm, hasher in _PROFILE_HASHERS.items()
+    if algorithm != PASSWORD_HASH_PROFILE['ALGORITHM']
+] + [
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # --------------------------------------------------------------------
 # База данных PostgreSQL (параметры берутся из переменных окружения)
 # --------------------------------------------------------------------
@@ -27,9 +132,75 @@ DATABASES = {
         'PASSWORD': os.getenv('DB_PASSWORD', 'password'),
         'HOST': os.getenv('DB_HOST', 'localhost'),
         'PORT': os.getenv('DB_PORT', '5432'),
+        # Постоянные соединения: одно соединение на поток воркера живет
+        # DB_CONN_MAX_AGE секунд вместо открытия нового на каждый запрос
+        # (0 – закрывать после каждого запроса, None – без ограничения)
+        'CONN_MAX_AGE': (
+            None if os.getenv('DB_CONN_MAX_AGE') == 'None'
+            else int(os.getenv('DB_CONN_MAX_AGE', '60'))
+        ),
+        # Проверка переиспользуемого соединения перед первым запросом
+        # (защита от обрывов при перезапуске Postgres/pgbouncer)
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
     }
 }
 
+# Работа через пулер соединений (DB_POOLER=pgbouncer, режим transaction):
+# серверные курсоры несовместимы с transaction pooling и отключаются
+DB_POOLER = os.getenv('DB_POOLER', '')
+if DB_POOLER == 'pgbouncer':
+    DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+
+# Локальная замена Postgres для разработки и бенчмарков (DB_ENGINE=sqlite)
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+    }
+
+# --------------------------------------------------------------------
+# Кэш (общее хранилище для согласования воркеров)
+# CACHE_BACKEND: locmem – только текущий процесс (разработка),
+# file – общий для всех воркеров одного узла, redis – общий для всех узлов
+# --------------------------------------------------------------------
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', 'redis://localhost:6379/0'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_LOCATION', '/tmp/django_cache'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# --------------------------------------------------------------------
+# Кэш ответов списков /business/* с ETag и 304 (см.
+# custom_auth/response_cache.py): сколько секунд хранится тело ответа
+# --------------------------------------------------------------------
+RESPONSE_CACHE_ENABLED = os.getenv('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', '300'))
+
+# --------------------------------------------------------------------
+# Матрица прав доступа: как часто (в секундах) воркер сверяет свою копию
+# с общей версией правил в кэше
+# --------------------------------------------------------------------
+PERMISSION_MATRIX_CHECK_INTERVAL = float(
+    os.getenv('PERMISSION_MATRIX_CHECK_INTERVAL', '1.0')
+)
+
 # --------------------------------------------------------------------
 # Список установленных приложений
 # --------------------------------------------------------------------
@@ -65,6 +236,14 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Метрики запросов (число SQL-запросов, время БД, аутентификации, проверки
+# прав): заголовок Server-Timing и эндпоинт /api/metrics/ в формате Prometheus
+REQUEST_METRICS_ENABLED = os.getenv('REQUEST_METRICS_ENABLED', 'False') == 'True'
+METRICS_ALLOWED_IPS = os.getenv('METRICS_ALLOWED_IPS', '127.0.0.1').split(',')
+
+if REQUEST_METRICS_ENABLED:
+    MIDDLEWARE.insert(0, 'custom_auth.middleware.RequestMetricsMiddleware')
+
 # --------------------------------------------------------------------
 # Основной URL конфиг
 # --------------------------------------------------------------------
@@ -95,6 +274,10 @@ TEMPLATES = [
 WSGI_APPLICATION = 'project.wsgi.application'
 ASGI_APPLICATION = 'project.asgi.application'
 
+# Асинхронные представления логина и /business/* (для запуска под ASGI,
+# например uvicorn); под WSGI оставляйте False
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
 # --------------------------------------------------------------------
 # Настройки DRF
 # --------------------------------------------------------------------
@@ -102,12 +285,83 @@ REST_FRAMEWORK = {
     # По умолчанию используем наш JWT‑auth класс
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'custom_auth.authentication.JWTAuthentication',
+        # Сервисные аккаунты: Authorization: Api-Key <key>
+        'custom_auth.authentication.APIKeyAuthentication',
     ),
     # По умолчанию требуем аутентификацию (но не авторизацию)
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
+        # Ключи API с ограничениями: запрет там, где область не разрешена
+        'custom_auth.permissions.APIKeyScopePermission',
     ),
+    # Списки отдаются страницами по курсору (keyset по id), а с
+    # ?stream=true – потоком (см. custom_auth/pagination.py)
+    'DEFAULT_PAGINATION_CLASS': 'custom_auth.pagination.KeysetPagination',
+    # Доменные ошибки (перегрузка пула хеширования) -> 503
+    'EXCEPTION_HANDLER': 'custom_auth.exceptions.exception_handler',
+    'PAGE_SIZE': int(os.getenv('API_PAGE_SIZE', '100')),
+    # Сколько доверенных прокси (nginx, балансировщик) стоит перед
+    # приложением: IP клиента для лимита входов берется из X-Forwarded-For.
+    # При 0 используется REMOTE_ADDR, и заголовок клиента игнорируется
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
+# Максимальный размер страницы, который клиент может запросить ?page_size=
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', '1000'))
+
+# Быстрые рендереры (см. custom_auth/renderers.py): JSON через orjson
+# вместо стандартного json и тип application/msgpack для внутренних
+# сервисов (выбирается заголовком Accept). Нужны пакеты orjson / msgpack
+API_ORJSON_ENABLED = os.getenv('API_ORJSON_ENABLED', 'False') == 'True'
+API_MSGPACK_ENABLED = os.getenv('API_MSGPACK_ENABLED', 'False') == 'True'
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+    'custom_auth.renderers.ORJSONRenderer' if API_ORJSON_ENABLED
+    else 'rest_framework.renderers.JSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+    'custom_auth.renderers.ORJSONParser' if API_ORJSON_ENABLED
+    else 'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+if API_MSGPACK_ENABLED:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].insert(
+        1, 'custom_auth.renderers.MessagePackRenderer'
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].insert(
+        1, 'custom_auth.renderers.MessagePackParser'
+    )
+
+# --------------------------------------------------------------------
+# Профиль api: без админки, сессий, сообщений, статики и шаблонов.
+# Аутентификация API целиком на JWTAuthentication/APIKeyAuthentication,
+# а APIView DRF освобождены от CSRF, поэтому middleware сессий, CSRF,
+# auth, messages и clickjacking в этом профиле не подключаются
+# --------------------------------------------------------------------
+if DJANGO_PROFILE == 'api':
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in (
+            'django.contrib.admin',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'django.contrib.staticfiles',
+        )
+    ]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in (
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware',
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+            'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        )
+    ]
+    TEMPLATES = []
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].remove(
+        'rest_framework.renderers.BrowsableAPIRenderer'
+    )
 
 # --------------------------------------------------------------------
 # CORS (если нужен, открываем все источники)
@@ -124,3 +378,12 @@ STATIC_URL = '/static/'
 # --------------------------------------------------------------------
 AUTH_USER_MODEL = 'custom_auth.User'
 
+# Email уникален без учета регистра ограничением user_email_lower_uniq
+# (Lower(email)), а не unique=True на поле: вход ищет пользователя через
+# UserManager.get_by_natural_key тоже без учета регистра
+SILENCED_SYSTEM_CHECKS = ['auth.E003']
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    # SQLite не поддерживает INCLUDE: уникальность правил доступа создается
+    # без неключевых столбцов (см. custom_auth/constraints.py)
+    SILENCED_SYSTEM_CHECKS.append('models.W039')
+
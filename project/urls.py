@@ -1,8 +1,16 @@
-from django.contrib import admin
+from django.apps import apps
 from django.urls import path, include
 
+from custom_auth.views import JWKSView
+
 urlpatterns = [
-    path('admin/', admin.site.urls),                     # Django админка
     path('api/', include('custom_auth.urls')),           # API аутентификации и авторизации
     path('business/', include('business.urls')),         # мок‑объекты бизнес‑приложения
+    path('.well-known/jwks.json', JWKSView.as_view(), name='jwks'),  # открытые ключи JWT
 ]
+
+# Админка есть только в полном профиле (см. DJANGO_PROFILE в settings)
+if apps.is_installed('django.contrib.admin'):
+    from django.contrib import admin
+
+    urlpatterns.insert(0, path('admin/', admin.site.urls))  # Django админка
@@ -0,0 +1,86 @@
+"""Прогрев воркера при загрузке WSGI/ASGI-приложения.
+
+Без прогрева первый запрос каждого воркера платит за импорт представлений
+через URLconf, компиляцию регулярных выражений маршрутов, построение полей
+сериализаторов, загрузку матрицы прав из БД и ключей подписи JWT. Функция
+warm_up выполняет все это заранее, а затем закрывает соединения с БД,
+чтобы они не наследовались воркерами при запуске gunicorn с --preload.
+
+ASGI-серверы (uvicorn) импортируют приложение внутри работающего цикла
+событий, где Django запрещает синхронные обращения к БД
+(SynchronousOnlyOperation). В этом случае матрица прав загружается в
+отдельном потоке.
+"""
+
+import asyncio
+import logging
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.db import DatabaseError, connections
+from django.urls import URLResolver, get_resolver
+
+from custom_auth.access_matrix import get_matrix
+from custom_auth.signing_keys import get_key_set
+
+logger = logging.getLogger(__name__)
+
+
+def _walk(patterns):
+    """Обходит маршруты URLconf рекурсивно.
+
+    Args:
+        patterns: Список URLPattern и URLResolver
+
+    Yields:
+        URLPattern | URLResolver: Каждый маршрут, включая вложенные
+    """
+    for pattern in patterns:
+        yield pattern
+        if isinstance(pattern, URLResolver):
+            yield from _walk(pattern.url_patterns)
+
+
+def warm_up():
+    """Прогревает маршруты, сериализаторы и данные прав текущего процесса.
+
+    Ошибки БД (например, еще не примененные миграции) не мешают запуску:
+    матрица прав будет загружена при первом запросе.
+    """
+    if not settings.WARMUP_ENABLED:
+        return
+
+    resolver = get_resolver()
+    # Обратный индекс маршрутов строится один раз на процесс
+    resolver.reverse_dict
+    serializer_classes = set()
+    for pattern in _walk(resolver.url_patterns):
+        pattern.pattern.regex
+        view_class = getattr(getattr(pattern, "callback", None), "cls", None)
+        serializer_class = getattr(view_class, "serializer_class", None)
+        if serializer_class is not None:
+            serializer_classes.add(serializer_class)
+    for serializer_class in serializer_classes:
+        serializer_class(context={}).fields
+
+    get_hashers()
+    get_key_set()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        _load_matrix()
+    else:
+        thread = threading.Thread(target=_load_matrix, name="warm-up")
+        thread.start()
+        thread.join()
+
+
+def _load_matrix():
+    """Загружает матрицу прав и закрывает соединения с БД текущего потока."""
+    try:
+        get_matrix()
+    except DatabaseError as e:
+        logger.warning("Матрица прав не загружена при прогреве: %s", e)
+    finally:
+        connections.close_all()
@@ -3,3 +3,12 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
 application = get_wsgi_application()
+
+# Эндпоинт решений авторизации для auth_request обслуживается до Django
+from custom_auth.authz import AuthzWSGIMiddleware  # noqa: E402
+from project.warmup import warm_up  # noqa: E402
+
+application = AuthzWSGIMiddleware(application)
+
+# Маршруты, сериализаторы и права загружаются до первого запроса
+warm_up()